@@ -1,14 +1,19 @@
 """
 FastAPI application for Citation Graph Visualizer backend
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+import hashlib
+import orjson
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import io
 import sys
 import os
-import time
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -17,8 +22,8 @@ from graph.models import ResearchGraph
 from graph.builder import GraphBuilder
 from graph.clustering import get_clusterer
 from parsers.pdf_parser import PaperParser
-from extractors.architecture_extractor import ArchitectureExtractor
-from extractors.contribution_extractor import ContributionExtractor
+from extractors.architecture_extractor import get_architecture_extractor
+from extractors.contribution_extractor import get_contribution_extractor
 from extractors.survey_extractor import get_survey_extractor
 from extractors.schema_generator import (
     get_schema_generator,
@@ -28,12 +33,20 @@ from extractors.schema_generator import (
 )
 from api.semantic_scholar import get_semantic_scholar_api
 from api.arxiv_client import get_arxiv_client
+from api import cache
+from api.store import GraphStore, SchemaStore
+from logging_setup import setup_logging, get_logger
+from scheduler import get_scheduler
+
+setup_logging()
+logger = get_logger("api")
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Citation Graph Visualizer API",
     description="API for building and analyzing citation graphs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -45,14 +58,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (graph responses can be MBs)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Global state (in production, use proper database)
-graphs_store: Dict[str, ResearchGraph] = {}
-schemas_store: Dict[str, GeneratedSchema] = {}  # graph_id -> generated schema
+graphs_store = GraphStore()  # LRU-bounded, spill-backed; see api/store.py
+schemas_store = SchemaStore()  # graph_id -> generated schema, spill-backed
 
 # Initialize services
 graph_builder = GraphBuilder()
 pdf_parser = PaperParser()
 
+# Shared pool for parsing uploaded PDFs in parallel. Threads (not processes)
+# because PyMuPDF does its heavy lifting in C with the GIL released, and
+# ParsedPaper objects would otherwise need pickling across processes.
+_parse_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PARSE_WORKERS", min(32, (os.cpu_count() or 4) * 2)))
+)
+
 
 # Request/Response Models
 class PaperIdentifier(BaseModel):
@@ -70,6 +93,8 @@ class BuildGraphRequest(BaseModel):
 class ExtractRequest(BaseModel):
     graph_id: str
     extractors: List[Dict[str, Any]]
+    max_parallel: Optional[int] = None  # default: SmartScheduler picks by graph size
+    batch_size: Optional[int] = None  # papers per LLM call
 
 
 class FilterRequest(BaseModel):
@@ -100,7 +125,7 @@ class ClusterRequest(BaseModel):
 
 class ExtractEdgesRequest(BaseModel):
     graph_id: str
-    max_parallel: int = 5
+    max_parallel: Optional[int] = None  # default: SmartScheduler picks by edge count
 
 
 class ExtractSingleEdgeRequest(BaseModel):
@@ -117,6 +142,407 @@ class ExtractDynamicRequest(BaseModel):
     attribute_keys: List[str] = []  # empty = extract all schema attributes
 
 
+def _graph_parsed_papers(graph: ResearchGraph):
+    """
+    ParsedPaper views of the graph's nodes, shared by the extraction and
+    schema endpoints. Cached on the graph keyed by its version, so the N
+    objects are rebuilt only after the graph actually changes.
+    """
+    from parsers.pdf_parser import ParsedPaper
+
+    cached = getattr(graph, "_parsed_papers_cache", None)
+    if cached is not None and cached[0] == graph.version:
+        return cached[1]
+
+    papers = [
+        ParsedPaper(
+            paper_id=node.id,
+            title=node.title,
+            authors=node.authors,
+            abstract=node.abstract,
+            full_text=node.full_text or "",
+        )
+        for node in graph.nodes
+    ]
+    graph._parsed_papers_cache = (graph.version, papers)
+    return papers
+
+
+class EdgeBatcher:
+    """
+    Coalesces single-edge extraction requests arriving close together
+    (e.g. the UI firing one per visible edge) into shared batched calls.
+    Requests wait up to `window` seconds for company, then the batch runs
+    once and each caller's future gets its own slice of the results.
+    """
+
+    def __init__(self, window: float = 0.025, max_batch: int = 16):
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(self, graph: ResearchGraph, edge_id: str):
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((graph, edge_id, fut))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._drain())
+        return await fut
+
+    async def _drain(self):
+        from extractors.edge_extractor import get_edge_extractor
+        extractor = get_edge_extractor()
+        loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                batch = [await asyncio.wait_for(self._queue.get(), timeout=1.0)]
+            except asyncio.TimeoutError:
+                # A submit can enqueue between the get() timing out and this
+                # task finishing; its liveness check still sees a running
+                # task, so exiting now would strand that future. Re-check the
+                # queue before going idle: the emptiness test and the return
+                # share one step on the loop, and any later put sees the task
+                # as done and restarts it.
+                if not self._queue.empty():
+                    continue
+                return  # go idle; the next submit restarts the task
+
+            # Gather whatever else arrives within the batching window
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # One extractor call per graph in the batch
+            by_graph: Dict[int, tuple] = {}
+            for graph, edge_id, fut in batch:
+                by_graph.setdefault(id(graph), (graph, []))[1].append((edge_id, fut))
+
+            for graph, items in by_graph.values():
+                edge_ids = [edge_id for edge_id, _ in items]
+                try:
+                    batch_results = await asyncio.to_thread(
+                        extractor.extract_batch_by_ids, graph, edge_ids
+                    )
+                except Exception as e:
+                    for _, fut in items:
+                        if not fut.done():
+                            fut.set_exception(e)
+                    continue
+                for edge_id, fut in items:
+                    if not fut.done():
+                        fut.set_result(batch_results.get(edge_id))
+
+
+_edge_batcher = EdgeBatcher()
+
+
+# Uploads larger than this are spooled to disk rather than held in memory
+_IN_MEMORY_UPLOAD_LIMIT = 32 << 20  # 32 MB
+
+
+async def _read_upload(file: UploadFile, chunk_size: int = 1 << 20) -> bytes:
+    """
+    Read an upload in bounded chunks so no single blocking read (or one
+    giant allocation) stalls the event loop on multi-MB PDFs.
+    """
+    buf = bytearray()
+    while chunk := await file.read(chunk_size):
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+async def _detach_upload(file: UploadFile) -> UploadFile:
+    """
+    Copy an upload into a spooled file we own. FastAPI closes request
+    UploadFiles as soon as the handler returns, which on the streaming
+    build endpoint is before the response generator runs the pipeline.
+    Small files stay in memory; large ones spill to disk, matching the
+    regular upload path.
+    """
+    import tempfile
+    spool = tempfile.SpooledTemporaryFile(max_size=_IN_MEMORY_UPLOAD_LIMIT)
+    size = 0
+    while chunk := await file.read(1 << 20):
+        spool.write(chunk)
+        size += len(chunk)
+    spool.seek(0)
+    return UploadFile(spool, size=size, filename=file.filename)
+
+
+async def _run_build_pipeline(
+    files: List[UploadFile],
+    paper_identifiers: Optional[str],
+    include_intermediate: bool,
+    max_depth: int,
+    rebuild: bool,
+    report=None,
+) -> Dict[str, Any]:
+    """
+    Shared graph-build pipeline for the blocking and streaming endpoints.
+    `report` is an optional callback receiving {"stage": ..., ...} progress events.
+    """
+    def _report(stage: str, **fields):
+        if report:
+            report({"stage": stage, **fields})
+
+    logger.info("📚 Starting graph build...")
+    papers = []
+    paper_titles = []
+
+    # Handle paper identifiers (ArXiv/DOI)
+    arxiv_id_map = {}  # Map title to ArXiv ID
+    if paper_identifiers:
+        identifiers = orjson.loads(paper_identifiers)
+
+        # Drop duplicate identifiers up front
+        seen = set()
+        identifiers = [
+            i for i in identifiers
+            if (key := (i.get('type'), i.get('value'))) not in seen and not seen.add(key)
+        ]
+        logger.info("📋 Processing %s paper identifiers", len(identifiers))
+        _report("identifiers", total=len(identifiers))
+
+        arxiv_client = get_arxiv_client()
+        s2_api = get_semantic_scholar_api()
+        from parsers.pdf_parser import ParsedPaper
+
+        def _paper_cache_key(id_type: str, value: str) -> str:
+            if id_type == 'arxiv':
+                return f"paper:arxiv:{arxiv_client.clean_id(value)}"
+            return f"paper:doi:{value}"
+
+        # Repeat builds hit the paper cache instead of the network
+        cached_papers = {}
+        for identifier in identifiers:
+            data = cache.get_json(_paper_cache_key(identifier.get('type'), identifier.get('value')))
+            if data:
+                cached_papers[(identifier.get('type'), identifier.get('value'))] = \
+                    ParsedPaper.from_dict(data)
+        if cached_papers:
+            logger.info("✅ %s papers served from cache", len(cached_papers))
+
+        # Group the remaining identifiers by type so each service gets one
+        # batched request instead of a fetch + sleep per identifier
+        misses = [i for i in identifiers if (i.get('type'), i.get('value')) not in cached_papers]
+        arxiv_values = [i.get('value') for i in misses if i.get('type') == 'arxiv']
+        doi_values = [i.get('value') for i in misses if i.get('type') == 'doi']
+
+        arxiv_papers = {}
+        if arxiv_values:
+            logger.info("📄 Fetching %s ArXiv papers in one request", len(arxiv_values))
+            arxiv_papers = await asyncio.to_thread(arxiv_client.get_papers_by_ids, arxiv_values)
+
+        # ArXiv misses and all DOIs resolve through one S2 batch call
+        missing_arxiv = [v for v in arxiv_values if arxiv_client.clean_id(v) not in arxiv_papers]
+        s2_ids = [f"ARXIV:{arxiv_client.clean_id(v)}" for v in missing_arxiv]
+        s2_ids += [f"DOI:{v}" for v in doi_values]
+
+        s2_papers = {}
+        if s2_ids:
+            logger.info("📄 Fetching %s papers from Semantic Scholar batch API", len(s2_ids))
+            batch = await asyncio.to_thread(s2_api.get_papers_batch, s2_ids)
+            s2_papers = {sid: paper for sid, paper in zip(s2_ids, batch) if paper}
+
+        for identifier in identifiers:
+            id_type = identifier.get('type')
+            value = identifier.get('value')
+
+            cached_paper = cached_papers.get((id_type, value))
+            if cached_paper:
+                papers.append(cached_paper)
+                paper_titles.append(cached_paper.title)
+                if id_type == 'arxiv':
+                    arxiv_id_map[cached_paper.title] = value
+                continue
+
+            if id_type == 'arxiv':
+                arxiv_data = arxiv_papers.get(arxiv_client.clean_id(value))
+
+                if arxiv_data:
+                    # Create ParsedPaper from ArXiv data
+                    paper = ParsedPaper(
+                        paper_id=arxiv_data['arxiv_id'],
+                        title=arxiv_data['title'],
+                        authors=arxiv_data['authors'],
+                        abstract=arxiv_data['abstract'],
+                        full_text=arxiv_data['abstract'],  # Use abstract as text
+                        metadata={
+                            'year': arxiv_data.get('year'),
+                            'arxiv_url': arxiv_data.get('arxiv_url'),
+                            'pdf_url': arxiv_data.get('pdf_url'),
+                            'categories': arxiv_data.get('categories', []),
+                            'arxiv_id': value  # Store ArXiv ID
+                        }
+                    )
+                    papers.append(paper)
+                    paper_titles.append(arxiv_data['title'])
+                    arxiv_id_map[arxiv_data['title']] = value
+                    cache.set_json(_paper_cache_key(id_type, value), paper.to_dict())
+                else:
+                    # Fallback: Semantic Scholar batch result for this ArXiv ID
+                    s2_paper = s2_papers.get(f"ARXIV:{arxiv_client.clean_id(value)}")
+
+                    if s2_paper:
+                        paper = ParsedPaper(
+                            paper_id=value,
+                            title=s2_paper['title'],
+                            authors=[a.get('name', '') for a in s2_paper.get('authors', [])],
+                            abstract=s2_paper.get('abstract', '') or '',
+                            full_text=s2_paper.get('abstract', '') or '',
+                            metadata={
+                                'year': s2_paper.get('year'),
+                                'arxiv_id': value,
+                                'paper_id': s2_paper.get('paperId')
+                            }
+                        )
+                        papers.append(paper)
+                        paper_titles.append(s2_paper['title'])
+                        arxiv_id_map[s2_paper['title']] = value
+                        cache.set_json(_paper_cache_key(id_type, value), paper.to_dict())
+                        logger.info("✅ Got paper from S2: %s...", s2_paper['title'][:60])
+                    else:
+                        logger.error("❌ Could not find paper %s on ArXiv or Semantic Scholar", value)
+
+            elif id_type == 'doi':
+                s2_paper = s2_papers.get(f"DOI:{value}")
+
+                if s2_paper:
+                    paper = ParsedPaper(
+                        paper_id=s2_paper.get('paperId', value.replace('/', '_')),
+                        title=s2_paper['title'],
+                        authors=[a.get('name', '') for a in s2_paper.get('authors', [])],
+                        abstract=s2_paper.get('abstract', ''),
+                        full_text=s2_paper.get('abstract', ''),
+                        metadata={
+                            'year': s2_paper.get('year'),
+                            'doi': value,
+                            'paper_id': s2_paper.get('paperId')
+                        }
+                    )
+                    papers.append(paper)
+                    paper_titles.append(s2_paper['title'])
+                    cache.set_json(_paper_cache_key(id_type, value), paper.to_dict())
+
+    # Handle PDF files
+    if files:
+        logger.info("📚 Processing %s PDF files", len(files))
+        _report("parse", done=0, total=len(files))
+
+        loop = asyncio.get_running_loop()
+
+        def _cached_or_parse(cache_key: str, parse):
+            # Identical PDF bytes parse identically, so cache by content hash
+            cached = cache.get_json(cache_key)
+            if cached:
+                from parsers.pdf_parser import ParsedPaper
+                return ParsedPaper.from_dict(cached)
+            paper = parse()
+            cache.set_json(cache_key, paper.to_dict())
+            return paper
+
+        def _parse_one(content: bytes, paper_id: str):
+            # Small upload: parse directly from memory — no temp-file round-trip
+            cache_key = "paper:pdf:" + hashlib.sha256(content).hexdigest()
+            return _cached_or_parse(cache_key, lambda: pdf_parser.parse_bytes(content, paper_id))
+
+        def _spill_and_parse(file: UploadFile, paper_id: str):
+            # Large upload: stream to a temp file (hashing along the way) and
+            # parse from disk instead of holding the whole PDF in memory
+            import tempfile
+            hasher = hashlib.sha256()
+            file.file.seek(0)
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp:
+                while chunk := file.file.read(1 << 20):
+                    hasher.update(chunk)
+                    tmp.write(chunk)
+                tmp_path = tmp.name
+            try:
+                cache_key = "paper:pdf:" + hasher.hexdigest()
+                return _cached_or_parse(cache_key, lambda: pdf_parser.parse_pdf(tmp_path, paper_id))
+            finally:
+                os.unlink(tmp_path)
+
+        async def _parse_upload(file: UploadFile):
+            paper_id = file.filename.replace('.pdf', '').replace(' ', '_')
+            size = getattr(file, "size", None)
+            if size and size > _IN_MEMORY_UPLOAD_LIMIT:
+                return await loop.run_in_executor(_parse_executor, _spill_and_parse, file, paper_id)
+            content = await _read_upload(file)
+            return await loop.run_in_executor(_parse_executor, _parse_one, content, paper_id)
+
+        # Parse all PDFs in parallel on the shared thread pool
+        parsed = await asyncio.gather(*(_parse_upload(file) for file in files))
+
+        for i, paper in enumerate(parsed):
+            logger.info("📄 Parsed: %s...", paper.title[:60])
+            papers.append(paper)
+            paper_titles.append(paper.title)
+            _report("parse", done=i + 1, total=len(files))
+
+    if not papers:
+        raise HTTPException(status_code=400, detail="No papers provided")
+
+    logger.info("✅ Parsed %s papers", len(papers))
+    # Build citation network using Semantic Scholar (cache-aside keyed by title set)
+    cache_key = "s2:network:" + hashlib.sha1(
+        f"{'|'.join(sorted(paper_titles))}|{include_intermediate}".encode()
+    ).hexdigest()
+
+    if rebuild:
+        cache.delete(cache_key)
+
+    _report("citations", total=len(paper_titles))
+    citation_network = cache.get_json(cache_key)
+    if citation_network:
+        logger.info("✅ Citation network loaded from cache")
+    else:
+        logger.info("🔍 Fetching citation data from Semantic Scholar...")
+        s2_api = get_semantic_scholar_api()
+        citation_network = await s2_api.abuild_citation_network(
+            paper_titles,
+            max_intermediate_papers=100 if include_intermediate else 0,
+            arxiv_ids=arxiv_id_map
+        )
+        cache.set_json(cache_key, citation_network)
+
+    # Build graph
+    logger.info("🔨 Building citation graph...")
+    _report("build")
+    graph = await asyncio.to_thread(
+        graph_builder.build_from_papers_with_citations,
+        papers,
+        citation_network,
+        include_intermediate=include_intermediate,
+        max_depth=max_depth
+    )
+
+    # Store graph
+    graphs_store[graph.id] = graph
+
+    logger.info("✅ Graph built: %s", graph.id)
+    logger.info("   - Nodes: %s", len(graph.nodes))
+    logger.info("   - Edges: %s", len(graph.edges))
+    return {
+        "graph_id": graph.id,
+        "graph": graph.to_dict(),
+        "stats": {
+            "total_papers": len(graph.nodes),
+            "input_papers": graph.metadata.get("input_papers", len(papers)),
+            "intermediate_papers_added": graph.metadata.get("intermediate_papers", 0),
+            "total_citations": len(graph.edges),
+            "date_range": graph.metadata.get("date_range", {})
+        }
+    }
+
+
 # Endpoints
 @app.get("/")
 async def root():
@@ -139,182 +565,75 @@ async def build_graph(
     files: List[UploadFile] = File(default=[]),
     paper_identifiers: Optional[str] = Form(default=None),
     include_intermediate: bool = False,
-    max_depth: int = 1
+    max_depth: int = 1,
+    rebuild: bool = False
 ):
     """
     Build citation graph from paper identifiers (ArXiv IDs, DOIs) or uploaded PDF files
     """
     try:
-        print(f"📚 Starting graph build...")
-        
-        papers = []
-        paper_titles = []
-        
-        # Handle paper identifiers (ArXiv/DOI)
-        arxiv_id_map = {}  # Map title to ArXiv ID
-        if paper_identifiers:
-            import json
-            identifiers = json.loads(paper_identifiers)
-            print(f"📋 Processing {len(identifiers)} paper identifiers")
-            
-            arxiv_client = get_arxiv_client()
-            s2_api = get_semantic_scholar_api()
-            
-            for identifier in identifiers:
-                id_type = identifier.get('type')
-                value = identifier.get('value')
-                
-                if id_type == 'arxiv':
-                    print(f"📄 Fetching ArXiv paper: {value}")
-                    arxiv_data = arxiv_client.get_paper_by_id(value)
-                    
-                    if arxiv_data:
-                        # Create ParsedPaper from ArXiv data
-                        from parsers.pdf_parser import ParsedPaper
-                        paper = ParsedPaper(
-                            paper_id=arxiv_data['arxiv_id'],
-                            title=arxiv_data['title'],
-                            authors=arxiv_data['authors'],
-                            abstract=arxiv_data['abstract'],
-                            full_text=arxiv_data['abstract'],  # Use abstract as text
-                            metadata={
-                                'year': arxiv_data.get('year'),
-                                'arxiv_url': arxiv_data.get('arxiv_url'),
-                                'pdf_url': arxiv_data.get('pdf_url'),
-                                'categories': arxiv_data.get('categories', []),
-                                'arxiv_id': value  # Store ArXiv ID
-                            }
-                        )
-                        papers.append(paper)
-                        paper_titles.append(arxiv_data['title'])
-                        arxiv_id_map[arxiv_data['title']] = value
-                    else:
-                        # Fallback: use Semantic Scholar to get paper by ArXiv ID
-                        print(f"⚠️  ArXiv failed for {value}, falling back to Semantic Scholar...")
-                        s2_paper = s2_api.search_paper(value, arxiv_id=value)
-                        
-                        if s2_paper:
-                            from parsers.pdf_parser import ParsedPaper
-                            paper = ParsedPaper(
-                                paper_id=value,
-                                title=s2_paper['title'],
-                                authors=[a.get('name', '') for a in s2_paper.get('authors', [])],
-                                abstract=s2_paper.get('abstract', '') or '',
-                                full_text=s2_paper.get('abstract', '') or '',
-                                metadata={
-                                    'year': s2_paper.get('year'),
-                                    'arxiv_id': value,
-                                    'paper_id': s2_paper.get('paperId')
-                                }
-                            )
-                            papers.append(paper)
-                            paper_titles.append(s2_paper['title'])
-                            arxiv_id_map[s2_paper['title']] = value
-                            print(f"✅ Got paper from S2: {s2_paper['title'][:60]}...")
-                        else:
-                            print(f"❌ Could not find paper {value} on ArXiv or Semantic Scholar")
-                    
-                    time.sleep(0.3)  # Rate limiting
-                
-                elif id_type == 'doi':
-                    print(f"📄 Searching for DOI paper: {value}")
-                    # Use Semantic Scholar to search by DOI
-                    s2_paper = s2_api.search_paper(f"DOI:{value}")
-                    
-                    if s2_paper:
-                        from parsers.pdf_parser import ParsedPaper
-                        paper = ParsedPaper(
-                            paper_id=s2_paper.get('paperId', value.replace('/', '_')),
-                            title=s2_paper['title'],
-                            authors=[a.get('name', '') for a in s2_paper.get('authors', [])],
-                            abstract=s2_paper.get('abstract', ''),
-                            full_text=s2_paper.get('abstract', ''),
-                            metadata={
-                                'year': s2_paper.get('year'),
-                                'doi': value,
-                                'paper_id': s2_paper.get('paperId')
-                            }
-                        )
-                        papers.append(paper)
-                        paper_titles.append(s2_paper['title'])
-                    
-                    time.sleep(0.3)
-        
-        # Handle PDF files
-        if files:
-            print(f"📚 Processing {len(files)} PDF files")
-            for file in files:
-                print(f"📄 Parsing: {file.filename}")
-                content = await file.read()
-                
-                # Save temporarily to parse
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-                    tmp.write(content)
-                    tmp_path = tmp.name
-                
-                try:
-                    # Generate paper ID from filename
-                    paper_id = file.filename.replace('.pdf', '').replace(' ', '_')
-                    
-                    # Parse PDF
-                    paper = pdf_parser.parse_pdf(tmp_path, paper_id)
-                    papers.append(paper)
-                    paper_titles.append(paper.title)
-                finally:
-                    # Clean up temp file
-                    import os
-                    os.unlink(tmp_path)
-        
-        if not papers:
-            raise HTTPException(status_code=400, detail="No papers provided")
-        
-        print(f"✅ Parsed {len(papers)} papers")
-        
-        # Build citation network using Semantic Scholar
-        print("🔍 Fetching citation data from Semantic Scholar...")
-        s2_api = get_semantic_scholar_api()
-        citation_network = s2_api.build_citation_network(
-            paper_titles,
-            max_intermediate_papers=100 if include_intermediate else 0,
-            arxiv_ids=arxiv_id_map
-        )
-        
-        # Build graph
-        print("🔨 Building citation graph...")
-        graph = graph_builder.build_from_papers_with_citations(
-            papers,
-            citation_network,
-            include_intermediate=include_intermediate,
-            max_depth=max_depth
+        return await _run_build_pipeline(
+            files, paper_identifiers, include_intermediate, max_depth, rebuild
         )
-        
-        # Store graph
-        graphs_store[graph.id] = graph
-        
-        print(f"✅ Graph built: {graph.id}")
-        print(f"   - Nodes: {len(graph.nodes)}")
-        print(f"   - Edges: {len(graph.edges)}")
-        
-        return {
-            "graph_id": graph.id,
-            "graph": graph.to_dict(),
-            "stats": {
-                "total_papers": len(graph.nodes),
-                "input_papers": graph.metadata.get("input_papers", len(papers)),
-                "intermediate_papers_added": graph.metadata.get("intermediate_papers", 0),
-                "total_citations": len(graph.edges),
-                "date_range": graph.metadata.get("date_range", {})
-            }
-        }
-    
+
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Error building graph: {e}")
+        logger.error("❌ Error building graph: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/graph/build-stream")
+async def build_graph_stream(
+    files: List[UploadFile] = File(default=[]),
+    paper_identifiers: Optional[str] = Form(default=None),
+    include_intermediate: bool = False,
+    max_depth: int = 1,
+    rebuild: bool = False
+):
+    """
+    Build a citation graph while streaming NDJSON progress events,
+    one JSON object per line: {"stage": "parse"|"citations"|"build"|"done"|"error", ...}.
+    The final "done" event carries the graph_id and stats.
+    """
+    # Detach the uploads now — the originals are closed the moment this
+    # handler returns the StreamingResponse, before the pipeline reads them
+    files = [await _detach_upload(file) for file in files]
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _runner():
+        try:
+            result = await _run_build_pipeline(
+                files, paper_identifiers, include_intermediate, max_depth, rebuild,
+                report=queue.put_nowait,
+            )
+            queue.put_nowait({
+                "stage": "done",
+                "graph_id": result["graph_id"],
+                "stats": result["stats"],
+            })
+        except HTTPException as e:
+            queue.put_nowait({"stage": "error", "detail": e.detail})
+        except Exception as e:
+            logger.error("❌ Error building graph: %s", e)
+            queue.put_nowait({"stage": "error", "detail": str(e)})
+        finally:
+            queue.put_nowait(None)  # sentinel: stream finished
+
+    async def _gen():
+        task = asyncio.create_task(_runner())
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            yield orjson.dumps(event) + b"\n"
+        await task
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson")
+
+
 @app.post("/api/graph/extract")
 async def extract_features(request: ExtractRequest):
     """
@@ -325,76 +644,126 @@ async def extract_features(request: ExtractRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
         
-        print(f"🔍 Extracting features for graph: {request.graph_id}")
-        
+        logger.info("🔍 Extracting features for graph: %s", request.graph_id)
         results = {}
-        
-        # Initialize extractors
-        architecture_extractor = ArchitectureExtractor()
-        contribution_extractor = ContributionExtractor()
-        
-        for node in graph.nodes:
-            print(f"📄 Processing: {node.title[:60]}...")
-            
-            # Create ParsedPaper-like object
-            from parsers.pdf_parser import ParsedPaper
-            paper = ParsedPaper(
-                paper_id=node.id,
-                title=node.title,
-                authors=node.authors,
-                abstract=node.abstract,
-                full_text=node.full_text or ""
-            )
-            
-            node_results = {}
-            
-            # Run requested extractors
-            for extractor_config in request.extractors:
-                extractor_type = extractor_config.get("type")
-                extractor_name = extractor_config.get("name")
-                
-                if extractor_type == "standard":
-                    if extractor_name == "architecture":
-                        archs = architecture_extractor.extract(paper)
-                        node_results["architecture"] = [a.to_dict() for a in archs]
-                        
-                        # Add to node attributes
-                        if archs:
-                            node.attributes["architecture_type"] = archs[0].architecture_type
-                            node.attributes["architecture_name"] = archs[0].name
-                    
-                    elif extractor_name == "contributions":
-                        contribs = contribution_extractor.extract(paper)
-                        node_results["contributions"] = [c.to_dict() for c in contribs]
-                        
-                        # Add to node attributes
-                        if contribs:
-                            node.attributes["contribution_types"] = [
-                                c.contribution_type for c in contribs
-                            ]
-            
-            results[node.id] = node_results
+
+        # Size-aware dispatch: explicit request values win, otherwise the
+        # scheduler picks by graph size (tiny graphs skip pool fan-out)
+        plan = get_scheduler().choose(len(graph.nodes))
+        max_parallel = request.max_parallel or plan["parallel"]
+        batch_size = request.batch_size or plan["batch_size"]
+
+        # Shared extractor singletons (LLM clients are reused across requests)
+        architecture_extractor = get_architecture_extractor()
+        contribution_extractor = get_contribution_extractor()
+
+        extractor_names = [
+            c.get("name") for c in request.extractors if c.get("type") == "standard"
+        ]
+
+        def _apply(extractor_name, node, dicts):
+            """Record one extractor's output for a node and mirror it into attributes"""
+            node_results = results.setdefault(node.id, {})
+            if extractor_name == "architecture":
+                node_results["architecture"] = dicts
+                if dicts:
+                    node.attributes["architecture_type"] = dicts[0]["architecture_type"]
+                    node.attributes["architecture_name"] = dicts[0]["name"]
+            elif extractor_name == "contributions":
+                node_results["contributions"] = dicts
+                if dicts:
+                    node.attributes["contribution_types"] = [
+                        c["contribution_type"] for c in dicts
+                    ]
+
+        def _extract_all() -> Tuple[int, int]:
+            """
+            Resolve cache hits, then micro-batch the misses into shared LLM
+            calls. Returns (cache hits, attempted extractions) — attempts
+            only count extractors that actually have a handler, since
+            unrecognized names are skipped outright.
+            """
+            hits_total = 0
+            attempts_total = 0
+
+            # Extractors are deterministic in the paper content, so cache by its hash
+            hashes = {
+                node.id: hashlib.sha1(
+                    (node.full_text or node.abstract or node.title).encode()
+                ).hexdigest()
+                for node in graph.nodes
+            }
+            papers = {p.paper_id: p for p in _graph_parsed_papers(graph)}
+
+            for extractor_name in extractor_names:
+                if extractor_name == "architecture":
+                    extractor = architecture_extractor
+                elif extractor_name == "contributions":
+                    extractor = contribution_extractor
+                else:
+                    continue
+                attempts_total += len(graph.nodes)
+
+                misses = []
+                for node in graph.nodes:
+                    cached = cache.get_json(f"extract:{extractor_name}:{hashes[node.id]}")
+                    if cached is not None:
+                        hits_total += 1
+                        _apply(extractor_name, node, cached)
+                    else:
+                        misses.append(node)
+
+                if not misses:
+                    continue
+
+                # One LLM call covers batch_size papers; batches run in parallel
+                batches = [
+                    misses[i:i + batch_size]
+                    for i in range(0, len(misses), batch_size)
+                ]
+                logger.info(
+                    "📄 %s: %s papers in %s batched calls",
+                    extractor_name, len(misses), len(batches)
+                )
+                max_workers = min(max(1, max_parallel), len(batches))
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    batch_outputs = pool.map(
+                        lambda batch: extractor.extract_batch(
+                            [papers[n.id] for n in batch], batch_size=batch_size
+                        ),
+                        batches,
+                    )
+                    for batch, outputs in zip(batches, batch_outputs):
+                        for node, items in zip(batch, outputs):
+                            dicts = [item.to_dict() for item in items]
+                            cache.set_json(f"extract:{extractor_name}:{hashes[node.id]}", dicts)
+                            _apply(extractor_name, node, dicts)
+
+            return hits_total, attempts_total
+
+        cache_hits, attempts = await asyncio.to_thread(_extract_all)
         
         # Update graph
         graph.extractors_applied.extend([
             e.get("name") for e in request.extractors if e.get("type") == "standard"
         ])
-        
-        print(f"✅ Extraction complete!")
-        
+        graph.touch()
+        graphs_store[request.graph_id] = graph  # refresh the spilled copy
+
+        logger.info("✅ Extraction complete!")
         return {
             "extraction_id": graph.id,
             "status": "completed",
             "results": results,
             "stats": {
                 "papers_processed": len(graph.nodes),
-                "cache_hits": 0,
-                "new_extractions": len(results)
+                "cache_hits": cache_hits,
+                "new_extractions": attempts - cache_hits
             }
         }
     
     except Exception as e:
-        print(f"❌ Error extracting features: {e}")
+        logger.error("❌ Error extracting features: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -410,9 +779,10 @@ async def filter_graph(request: FilterRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
         
-        print(f"🔍 Filtering graph: {request.graph_id}")
-        
-        filtered_graph = graph_builder.filter_graph(graph, request.filters)
+        logger.info("🔍 Filtering graph: %s", request.graph_id)
+        filtered_graph = await asyncio.to_thread(
+            graph_builder.filter_graph, graph, request.filters
+        )
         
         return {
             "filtered_graph": filtered_graph.to_dict(),
@@ -420,7 +790,7 @@ async def filter_graph(request: FilterRequest):
         }
     
     except Exception as e:
-        print(f"❌ Error filtering graph: {e}")
+        logger.error("❌ Error filtering graph: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -434,24 +804,26 @@ async def visualize_graph(request: VisualizeRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
         
-        print(f"🎨 Applying visual encodings to graph: {request.graph_id}")
-        
+        logger.info("🎨 Applying visual encodings to graph: %s", request.graph_id)
         encoding = request.encoding
         
         # Apply visual encodings
-        graph = graph_builder.apply_visual_encoding(
+        graph = await asyncio.to_thread(
+            graph_builder.apply_visual_encoding,
             graph,
             color_by=encoding.get("color", {}).get("attribute"),
             size_by=encoding.get("size", {}).get("attribute"),
             shape_by=encoding.get("shape", {}).get("attribute")
         )
-        
+        graph.touch()
+        graphs_store[request.graph_id] = graph  # refresh the spilled copy
+
         return {
             "styled_graph": graph.to_dict()
         }
     
     except Exception as e:
-        print(f"❌ Error visualizing graph: {e}")
+        logger.error("❌ Error visualizing graph: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -465,9 +837,9 @@ async def find_path(request: PathRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
         
-        print(f"🔍 Finding path in graph: {request.graph_id}")
-        
-        path = graph_builder.compute_shortest_path(
+        logger.info("🔍 Finding path in graph: %s", request.graph_id)
+        path = await asyncio.to_thread(
+            graph_builder.compute_shortest_path,
             graph,
             request.source_paper_id,
             request.target_paper_id
@@ -482,13 +854,9 @@ async def find_path(request: PathRequest):
             from_id = path[i]
             to_id = path[i + 1]
             
-            # Find edge
-            edge = None
-            for e in graph.edges:
-                if e.from_paper == from_id and e.to_paper == to_id:
-                    edge = e
-                    break
-            
+            # Find edge (O(1) lookup on the graph's edge index)
+            edge = graph.get_edge(from_id, to_id)
+
             if edge:
                 path_edges.append({
                     "from": from_id,
@@ -508,35 +876,103 @@ async def find_path(request: PathRequest):
         }
     
     except Exception as e:
-        print(f"❌ Error finding path: {e}")
+        logger.error("❌ Error finding path: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _graph_etag(graph: ResearchGraph) -> str:
+    """
+    ETag from the graph's version counter, which every mutation bumps via
+    touch(). No serialization or hashing of the full graph per request —
+    re-serializing also broke on the int-keyed cluster metadata, since
+    orjson's default= hook never applies to dict keys.
+    """
+    return f'"{graph.id}-{graph.version}"'
+
+
+def _stream_graph_json(graph: ResearchGraph):
+    """
+    Serialize a graph to the same JSON shape as graph.to_dict(), one node/edge
+    at a time, so large graphs never materialize as a single dict + string.
+    """
+    # metadata can hold int-keyed dicts (cluster_sizes), hence OPT_NON_STR_KEYS
+    scalars = orjson.dumps({
+        "id": graph.id,
+        "name": graph.name,
+        "created_at": graph.created_at,
+        "updated_at": graph.updated_at,
+        "version": graph.version,
+        "metadata": graph.metadata,
+        "extractors_applied": graph.extractors_applied,
+        "layout": graph.layout,
+        "clusters": graph.clusters,
+    }, option=orjson.OPT_NON_STR_KEYS)
+    # Open the object with the scalar fields, then stream the big arrays
+    yield scalars[:-1] + b',"nodes":['
+    for i, node in enumerate(graph.nodes):
+        yield (b"," if i else b"") + orjson.dumps(node.to_dict())
+    yield b'],"edges":['
+    for i, edge in enumerate(graph.edges):
+        yield (b"," if i else b"") + orjson.dumps(edge.to_dict())
+    yield b"]}"
+
+
 @app.get("/api/graph/{graph_id}")
-async def get_graph(graph_id: str):
+async def get_graph(graph_id: str, request: Request):
     """Get graph by ID"""
     graph = graphs_store.get(graph_id)
     if not graph:
         raise HTTPException(status_code=404, detail="Graph not found")
-    
-    return graph.to_dict()
+
+    # Let unchanged clients skip the transfer entirely
+    etag = _graph_etag(graph)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return StreamingResponse(
+        _stream_graph_json(graph),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+@app.get("/api/graph/{graph_id}/stream")
+async def stream_graph(graph_id: str):
+    """
+    Stream a graph as NDJSON: one metadata line, then one line per node
+    and per edge. Keeps server memory at O(one record) for huge graphs
+    and lets clients render progressively.
+    """
+    graph = graphs_store.get(graph_id)
+    if not graph:
+        raise HTTPException(status_code=404, detail="Graph not found")
+
+    def _gen():
+        # metadata can hold int-keyed dicts (cluster_sizes), hence OPT_NON_STR_KEYS
+        yield orjson.dumps({
+            "id": graph.id,
+            "name": graph.name,
+            "created_at": graph.created_at,
+            "updated_at": graph.updated_at,
+            "metadata": graph.metadata,
+            "extractors_applied": graph.extractors_applied,
+            "layout": graph.layout,
+            "clusters": graph.clusters,
+            "node_count": len(graph.nodes),
+            "edge_count": len(graph.edges),
+        }, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+        for node in graph.nodes:
+            yield orjson.dumps({"node": node.to_dict()}) + b"\n"
+        for edge in graph.edges:
+            yield orjson.dumps({"edge": edge.to_dict()}) + b"\n"
+
+    return StreamingResponse(_gen(), media_type="application/x-ndjson")
 
 
 @app.get("/api/graphs")
 async def list_graphs():
-    """List all graphs"""
-    return {
-        "graphs": [
-            {
-                "id": g.id,
-                "name": g.name,
-                "created_at": g.created_at,
-                "node_count": len(g.nodes),
-                "edge_count": len(g.edges)
-            }
-            for g in graphs_store.values()
-        ]
-    }
+    """List all graphs, including ones only present in the spill directory"""
+    return {"graphs": graphs_store.summaries()}
 
 
 @app.post("/api/graph/cluster")
@@ -549,16 +985,20 @@ async def cluster_graph(request: ClusterRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
         
-        print(f"🔍 Clustering graph: {request.graph_id} (method: {request.method})")
-        
+        logger.info("🔍 Clustering graph: %s (method: %s)", request.graph_id, request.method)
         clusterer = get_clusterer()
         
         if request.method == "content":
-            graph = clusterer.cluster_by_content(graph, n_clusters=request.n_clusters)
+            graph = await asyncio.to_thread(
+                clusterer.cluster_by_content, graph, n_clusters=request.n_clusters
+            )
         elif request.method == "citations":
-            graph = clusterer.cluster_by_citations(graph, n_clusters=request.n_clusters)
+            graph = await asyncio.to_thread(
+                clusterer.cluster_by_citations, graph, n_clusters=request.n_clusters
+            )
         elif request.method == "hybrid":
-            graph = clusterer.cluster_hybrid(
+            graph = await asyncio.to_thread(
+                clusterer.cluster_hybrid,
                 graph,
                 n_clusters=request.n_clusters,
                 content_weight=request.content_weight,
@@ -568,9 +1008,10 @@ async def cluster_graph(request: ClusterRequest):
             raise HTTPException(status_code=400, detail=f"Unknown clustering method: {request.method}")
         
         # Get cluster summaries
-        summaries = clusterer.get_cluster_summaries(graph, top_terms=10)
-        
+        summaries = await asyncio.to_thread(clusterer.get_cluster_summaries, graph, top_terms=10)
+
         # Update stored graph
+        graph.touch()
         graphs_store[request.graph_id] = graph
         
         return {
@@ -583,7 +1024,7 @@ async def cluster_graph(request: ClusterRequest):
         }
     
     except Exception as e:
-        print(f"❌ Error clustering graph: {e}")
+        logger.error("❌ Error clustering graph: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -601,23 +1042,24 @@ async def extract_edge_innovations(request: ExtractEdgesRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
 
-        print(f"🔍 Extracting edge innovations for graph: {request.graph_id}")
-        print(f"   Edges to process: {len(graph.edges)}")
-
+        logger.info("🔍 Extracting edge innovations for graph: %s", request.graph_id)
+        logger.info("   Edges to process: %s", len(graph.edges))
         from extractors.edge_extractor import get_edge_extractor
         extractor = get_edge_extractor()
 
-        processed = extractor.extract_for_graph(
+        max_parallel = request.max_parallel or get_scheduler().choose(len(graph.edges))["parallel"]
+        processed = await extractor.aextract_for_graph(
             graph,
-            max_parallel=request.max_parallel,
+            max_parallel=max_parallel,
         )
 
         # Mark extractor as applied
         if "edge_innovations" not in graph.extractors_applied:
             graph.extractors_applied.append("edge_innovations")
+        graph.touch()
+        graphs_store[request.graph_id] = graph  # refresh the spilled copy
 
-        print(f"✅ Edge innovations extracted: {processed} edges processed")
-
+        logger.info("✅ Edge innovations extracted: %s edges processed", processed)
         return {
             "graph": graph.to_dict(),
             "stats": {
@@ -627,7 +1069,7 @@ async def extract_edge_innovations(request: ExtractEdgesRequest):
         }
 
     except Exception as e:
-        print(f"❌ Error extracting edge innovations: {e}")
+        logger.error("❌ Error extracting edge innovations: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -644,14 +1086,13 @@ async def extract_single_edge_innovation(request: ExtractSingleEdgeRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
 
-        print(f"🔍 Extracting single edge: {request.edge_id}")
-
-        from extractors.edge_extractor import get_edge_extractor
-        extractor = get_edge_extractor()
-
-        result = extractor.extract_single_by_id(graph, request.edge_id)
+        logger.info("🔍 Extracting single edge: %s", request.edge_id)
+        # Coalesced with other concurrent single-edge requests (see EdgeBatcher)
+        result = await _edge_batcher.submit(graph, request.edge_id)
         if result is None:
             raise HTTPException(status_code=404, detail="Edge not found or missing paper data")
+        graph.touch()
+        graphs_store[request.graph_id] = graph  # refresh the spilled copy
 
         # Find the updated edge to return
         updated_edge = None
@@ -660,8 +1101,7 @@ async def extract_single_edge_innovation(request: ExtractSingleEdgeRequest):
                 updated_edge = edge.to_dict()
                 break
 
-        print(f"✅ Single edge extracted: {result['short_label']}")
-
+        logger.info("✅ Single edge extracted: %s", result['short_label'])
         return {
             "edge": updated_edge,
             "result": result,
@@ -670,7 +1110,7 @@ async def extract_single_edge_innovation(request: ExtractSingleEdgeRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Error extracting single edge: {e}")
+        logger.error("❌ Error extracting single edge: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -682,51 +1122,40 @@ async def extract_survey(file: UploadFile = File(...)):
     Extract ground truth data from a survey/review paper PDF
     """
     try:
-        print(f"📚 Extracting ground truth from survey: {file.filename}")
-        
-        # Read and parse PDF
-        content = await file.read()
-        
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        try:
-            # Parse PDF
-            parsed_paper = pdf_parser.parse_pdf(tmp_path, file.filename.replace('.pdf', ''))
-            
-            # Extract ground truth
-            survey_extractor = get_survey_extractor()
-            ground_truth = survey_extractor.extract_from_survey(
-                parsed_paper.full_text,
-                parsed_paper.title
-            )
-            
-            # Convert to evaluation format
-            eval_data = survey_extractor.convert_to_evaluation_format(ground_truth)
-            
-            print(f"✅ Extracted ground truth:")
-            print(f"   - Categories: {len(ground_truth.categories)}")
-            print(f"   - Papers: {len(ground_truth.papers)}")
-            print(f"   - Relationships: {len(ground_truth.relationships)}")
-            
-            return {
-                "survey_title": ground_truth.survey_title,
-                "ground_truth": eval_data,
-                "stats": {
-                    "n_categories": len(ground_truth.categories),
-                    "n_papers": len(ground_truth.papers),
-                    "n_relationships": len(ground_truth.relationships)
-                }
+        logger.info("📚 Extracting ground truth from survey: %s", file.filename)
+        # Read and parse PDF directly from memory
+        content = await _read_upload(file)
+        parsed_paper = await asyncio.get_running_loop().run_in_executor(
+            _parse_executor, pdf_parser.parse_bytes, content, file.filename.replace('.pdf', '')
+        )
+
+        # Extract ground truth
+        survey_extractor = get_survey_extractor()
+        ground_truth = await asyncio.to_thread(
+            survey_extractor.extract_from_survey,
+            parsed_paper.full_text,
+            parsed_paper.title
+        )
+
+        # Convert to evaluation format
+        eval_data = survey_extractor.convert_to_evaluation_format(ground_truth)
+
+        logger.info("✅ Extracted ground truth:")
+        logger.info("   - Categories: %s", len(ground_truth.categories))
+        logger.info("   - Papers: %s", len(ground_truth.papers))
+        logger.info("   - Relationships: %s", len(ground_truth.relationships))
+        return {
+            "survey_title": ground_truth.survey_title,
+            "ground_truth": eval_data,
+            "stats": {
+                "n_categories": len(ground_truth.categories),
+                "n_papers": len(ground_truth.papers),
+                "n_relationships": len(ground_truth.relationships)
             }
-            
-        finally:
-            import os
-            os.unlink(tmp_path)
-    
+        }
+
     except Exception as e:
-        print(f"❌ Error extracting survey: {e}")
+        logger.error("❌ Error extracting survey: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -743,36 +1172,24 @@ async def generate_schema(request: GenerateSchemaRequest):
         if not graph:
             raise HTTPException(status_code=404, detail="Graph not found")
 
-        print(f"Generating custom schema for graph: {request.graph_id}")
-
-        # Build ParsedPaper list from graph nodes
-        from parsers.pdf_parser import ParsedPaper
-        papers = [
-            ParsedPaper(
-                paper_id=node.id,
-                title=node.title,
-                authors=node.authors,
-                abstract=node.abstract,
-                full_text=node.full_text or "",
-            )
-            for node in graph.nodes
-        ]
+        logger.info("Generating custom schema for graph: %s", request.graph_id)
+        # ParsedPaper views are cached per graph version
+        papers = _graph_parsed_papers(graph)
 
         generator = get_schema_generator()
-        schema = generator.generate(papers)
+        schema = await asyncio.to_thread(generator.generate, papers)
 
         # Store schema for later extraction
         schemas_store[request.graph_id] = schema
 
-        print(f"Schema generated: {schema.topic} ({len(schema.attributes)} attributes)")
-
+        logger.info("Schema generated: %s (%s attributes)", schema.topic, len(schema.attributes))
         return {
             "graph_id": request.graph_id,
             "schema": schema.to_dict(),
         }
 
     except Exception as e:
-        print(f"Error generating schema: {e}")
+        logger.error("Error generating schema: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -810,17 +1227,17 @@ async def extract_dynamic(request: ExtractDynamicRequest):
         else:
             work_schema = schema
 
-        print(f"Extracting {len(work_schema.attributes)} attributes for {len(graph.nodes)} papers...")
-
+        logger.info("Extracting %s attributes for %s papers...", len(work_schema.attributes), len(graph.nodes))
         extractor = get_dynamic_extractor()
-        results = extractor.extract_for_graph(graph, work_schema)
+        results = await asyncio.to_thread(extractor.extract_for_graph, graph, work_schema)
 
         # Mark schema extraction as applied
         if "dynamic_schema" not in graph.extractors_applied:
             graph.extractors_applied.append("dynamic_schema")
+        graph.touch()
+        graphs_store[request.graph_id] = graph  # refresh the spilled copy
 
-        print(f"Dynamic extraction complete!")
-
+        logger.info("Dynamic extraction complete!")
         return {
             "graph_id": request.graph_id,
             "schema": schema.to_dict(),
@@ -835,7 +1252,7 @@ async def extract_dynamic(request: ExtractDynamicRequest):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error extracting dynamic attributes: {e}")
+        logger.error("Error extracting dynamic attributes: %s", e)
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
@@ -852,7 +1269,16 @@ async def get_schema(graph_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    print("Starting Citation Graph Visualizer API...")
-    print("API will be available at: http://localhost:8000")
-    print("API docs at: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    logger.info("Starting Citation Graph Visualizer API...")
+    logger.info("API will be available at: http://localhost:8000")
+    logger.info("API docs at: http://localhost:8000/docs")
+    # uvloop + httptools ship with uvicorn[standard]; API_WORKERS defaults to 1
+    # because graphs_store/schemas_store are per-process (see api/store.py)
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("API_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+    )
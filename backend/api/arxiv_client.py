@@ -2,122 +2,188 @@
 ArXiv API Client for fetching paper metadata and PDFs
 """
 import requests
-import xml.etree.ElementTree as ET
-from typing import Dict, Optional, Any
+import re
+import logging
+from typing import Dict, List, Optional, Any
 import time
 
+try:
+    from lxml import etree as ET  # C/libxml2 parser — much faster on large Atom feeds
+except ImportError:  # lxml is optional — stdlib ElementTree handles the same calls
+    import xml.etree.ElementTree as ET
+
+from api.ratelimit import arxiv_limiter
+from logging_setup import get_logger
+
+logger = get_logger("arxiv")
+
+# Pre-qualified Atom tag names: passing these to find/findall skips the
+# per-call 'atom:x' prefix resolution against a namespace map
+_ATOM = 'http://www.w3.org/2005/Atom'
+_TAG_ENTRY = f'{{{_ATOM}}}entry'
+_TAG_NAME = f'{{{_ATOM}}}name'
+
+_VERSION_SUFFIX = re.compile(r'v\d+$')
+_ID_PREFIX = re.compile(r'^arxiv:', re.IGNORECASE)
+
 
 class ArXivClient:
     """Client for ArXiv API"""
-    
+
     def __init__(self):
         self.base_url = "http://export.arxiv.org/api/query"
-    
+        # Shared session: keep-alive avoids a fresh TCP handshake per request
+        # when fetching many papers (mirrors SemanticScholarAPI.__init__)
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "citation-graph-visualizer/1.0",
+            "Accept": "application/atom+xml",
+        })
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @staticmethod
+    def clean_id(arxiv_id: str) -> str:
+        """Normalize an ArXiv ID - strip prefixes and version suffix like v1, v2"""
+        arxiv_id = _ID_PREFIX.sub('', arxiv_id.strip())
+        return _VERSION_SUFFIX.sub('', arxiv_id)
+
     def get_paper_by_id(self, arxiv_id: str, retry_count: int = 0) -> Optional[Dict[str, Any]]:
         """
         Get paper metadata from ArXiv
-        
+
         Args:
             arxiv_id: ArXiv ID (e.g., "2301.12345")
             retry_count: Internal retry counter
-            
+
         Returns:
             Paper metadata or None if not found
         """
+        papers = self.get_papers_by_ids([arxiv_id], retry_count=retry_count)
+        paper_data = papers.get(self.clean_id(arxiv_id))
+        if paper_data:
+            # Slicing the title costs per-call string work — skip it unless
+            # the debug line is actually emitted
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("✅ Found ArXiv paper: %s...", paper_data['title'][:60])
+        else:
+            logger.info("⚠️  ArXiv paper not found: %s", arxiv_id)
+        return paper_data
+
+    def get_papers_by_ids(self, arxiv_ids: List[str], retry_count: int = 0) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metadata for several papers in one ArXiv request.
+        The API accepts a comma-separated id_list, so N papers cost one RTT.
+
+        Args:
+            arxiv_ids: ArXiv IDs (e.g., ["2301.12345", "1706.03762"])
+            retry_count: Internal retry counter
+
+        Returns:
+            Dict mapping cleaned ArXiv ID -> paper metadata (missing IDs omitted)
+        """
         max_retries = 3
+        clean_ids = [self.clean_id(arxiv_id) for arxiv_id in arxiv_ids]
+        if not clean_ids:
+            return {}
+
         try:
-            # Clean ArXiv ID - strip version suffix like v1, v2 but keep the digits in the ID
-            import re
-            arxiv_id = arxiv_id.strip().replace('arxiv:', '').replace('arXiv:', '')
-            arxiv_id = re.sub(r'v\d+$', '', arxiv_id)
-            
-            url = f"{self.base_url}?id_list={arxiv_id}"
-            response = requests.get(url, timeout=30)
-            
+            url = f"{self.base_url}?id_list={','.join(clean_ids)}&max_results={len(clean_ids)}"
+            arxiv_limiter.acquire()
+            response = self.session.get(url, timeout=30)
+
             if response.status_code == 429:
                 if retry_count < max_retries:
                     wait_time = 3 * (retry_count + 1)
-                    print(f"⚠️  ArXiv rate limited, waiting {wait_time}s (attempt {retry_count + 1}/{max_retries})")
+                    logger.warning("⚠️  ArXiv rate limited, waiting %ds (attempt %d/%d)", wait_time, retry_count + 1, max_retries)
                     time.sleep(wait_time)
-                    return self.get_paper_by_id(arxiv_id, retry_count + 1)
+                    return self.get_papers_by_ids(arxiv_ids, retry_count + 1)
                 else:
-                    print(f"❌ ArXiv rate limited after {max_retries} retries for {arxiv_id}")
-                    return None
-            
+                    logger.error("❌ ArXiv rate limited after %d retries for %s", max_retries, clean_ids)
+                    return {}
+
             response.raise_for_status()
-            
+
             # Parse XML response
             root = ET.fromstring(response.content)
-            
-            # ArXiv namespace
-            ns = {'atom': 'http://www.w3.org/2005/Atom', 
-                  'arxiv': 'http://arxiv.org/schemas/atom'}
-            
-            entries = root.findall('atom:entry', ns)
-            if not entries:
-                print(f"⚠️  ArXiv paper not found: {arxiv_id}")
-                return None
-            
-            entry = entries[0]
-            
-            # Extract data
-            title = entry.find('atom:title', ns)
-            summary = entry.find('atom:summary', ns)
-            published = entry.find('atom:published', ns)
-            updated = entry.find('atom:updated', ns)
-            
-            # Authors
-            authors = []
-            for author in entry.findall('atom:author', ns):
-                name = author.find('atom:name', ns)
-                if name is not None:
-                    authors.append(name.text.strip())
-            
-            # Categories
-            categories = []
-            for category in entry.findall('atom:category', ns):
-                term = category.get('term')
-                if term:
-                    categories.append(term)
-            
-            # PDF URL
-            pdf_url = None
-            for link in entry.findall('atom:link', ns):
-                if link.get('title') == 'pdf':
-                    pdf_url = link.get('href')
-            
-            # ArXiv URL
-            arxiv_url = entry.find('atom:id', ns)
-            
-            paper_data = {
-                'arxiv_id': arxiv_id,
-                'title': title.text.strip() if title is not None else None,
-                'abstract': summary.text.strip() if summary is not None else None,
-                'authors': authors,
-                'published': published.text if published is not None else None,
-                'updated': updated.text if updated is not None else None,
-                'categories': categories,
-                'pdf_url': pdf_url,
-                'arxiv_url': arxiv_url.text if arxiv_url is not None else f"https://arxiv.org/abs/{arxiv_id}",
-                'year': int(published.text[:4]) if published is not None else None
-            }
-            
-            print(f"✅ Found ArXiv paper: {paper_data['title'][:60]}...")
-            return paper_data
-            
+
+            papers = {}
+            for entry in root.findall(_TAG_ENTRY):
+                paper_data = self._parse_entry(entry)
+                if paper_data:
+                    papers[paper_data['arxiv_id']] = paper_data
+            return papers
+
         except requests.exceptions.Timeout as e:
             if retry_count < max_retries:
                 wait_time = 3 * (retry_count + 1)
-                print(f"⚠️  ArXiv timeout for {arxiv_id}, retrying in {wait_time}s (attempt {retry_count + 1}/{max_retries})")
+                logger.warning("⚠️  ArXiv timeout, retrying in %ds (attempt %d/%d)", wait_time, retry_count + 1, max_retries)
                 time.sleep(wait_time)
-                return self.get_paper_by_id(arxiv_id, retry_count + 1)
+                return self.get_papers_by_ids(arxiv_ids, retry_count + 1)
             else:
-                print(f"❌ ArXiv timeout after {max_retries} retries for {arxiv_id}: {e}")
-                return None
+                logger.error("❌ ArXiv timeout after %d retries for %s: %s", max_retries, clean_ids, e)
+                return {}
         except Exception as e:
-            print(f"❌ Error fetching ArXiv paper {arxiv_id}: {e}")
+            logger.error("❌ Error fetching ArXiv papers %s: %s", clean_ids, e)
+            return {}
+
+    def _parse_entry(self, entry) -> Optional[Dict[str, Any]]:
+        """Convert one Atom entry into a paper metadata dict"""
+        # Group children by local name in one pass instead of running a
+        # namespace-qualified scan of the entry per field
+        fields: Dict[str, list] = {}
+        for child in entry:
+            tag = child.tag
+            if isinstance(tag, str):  # skip comments/PIs under lxml
+                fields.setdefault(tag.rpartition('}')[2], []).append(child)
+
+        def first_text(name: str) -> Optional[str]:
+            elems = fields.get(name)
+            return elems[0].text if elems else None
+
+        # ArXiv URL (entry id is e.g. http://arxiv.org/abs/2301.12345v1)
+        arxiv_url = first_text('id')
+        if not arxiv_url:
             return None
-    
+        arxiv_id = self.clean_id(arxiv_url.split('/abs/')[-1])
+
+        title = first_text('title')
+        summary = first_text('summary')
+        published = first_text('published')
+
+        # Authors
+        authors = []
+        for author in fields.get('author', []):
+            name = author.find(_TAG_NAME)
+            if name is not None:
+                authors.append(name.text.strip())
+
+        # Categories
+        categories = [term for category in fields.get('category', [])
+                      if (term := category.get('term'))]
+
+        # PDF URL
+        pdf_url = None
+        for link in fields.get('link', []):
+            if link.get('title') == 'pdf':
+                pdf_url = link.get('href')
+
+        return {
+            'arxiv_id': arxiv_id,
+            'title': title.strip() if title else None,
+            'abstract': summary.strip() if summary else None,
+            'authors': authors,
+            'published': published,
+            'updated': first_text('updated'),
+            'categories': categories,
+            'pdf_url': pdf_url,
+            'arxiv_url': arxiv_url,
+            'year': int(published[:4]) if published else None
+        }
+
     def search_papers(self, query: str, max_results: int = 10) -> list[Dict[str, Any]]:
         """
         Search ArXiv papers by query
@@ -136,27 +202,28 @@ class ArXivClient:
                 'sortBy': 'relevance'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            arxiv_limiter.acquire()
+            response = self.session.get(self.base_url, params=params, timeout=10, stream=True)
             response.raise_for_status()
-            
-            root = ET.fromstring(response.content)
-            ns = {'atom': 'http://www.w3.org/2005/Atom'}
-            
+            response.raw.decode_content = True
+
+            # Stream entries instead of materializing the whole feed: peak
+            # memory stays at one <entry> regardless of max_results. Each
+            # entry already carries the full metadata, so parse it in place
+            # rather than re-fetching the same record through get_paper_by_id
             papers = []
-            for entry in root.findall('atom:entry', ns):
-                # Extract ArXiv ID from URL
-                arxiv_url = entry.find('atom:id', ns)
-                if arxiv_url is not None:
-                    arxiv_id = arxiv_url.text.split('/')[-1]
-                    paper = self.get_paper_by_id(arxiv_id)
-                    if paper:
-                        papers.append(paper)
-                        time.sleep(0.2)  # Rate limiting
-            
+            for _, elem in ET.iterparse(response.raw, events=('end',)):
+                if elem.tag != _TAG_ENTRY:
+                    continue
+                paper = self._parse_entry(elem)
+                if paper:
+                    papers.append(paper)
+                elem.clear()
+
             return papers
             
         except Exception as e:
-            print(f"❌ Error searching ArXiv: {e}")
+            logger.error("❌ Error searching ArXiv: %s", e)
             return []
 
 
@@ -0,0 +1,93 @@
+"""
+Cache-aside helpers for expensive external API results.
+
+Backed by Redis when REDIS_URL is set and the redis package is available,
+otherwise falls back to a simple in-process TTL dict so the cache still
+works in development without extra infrastructure.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import orjson
+
+from config import settings
+from logging_setup import get_logger
+
+logger = get_logger("cache")
+
+try:
+    import redis
+    _redis_client = redis.Redis.from_url(os.environ["REDIS_URL"]) if os.environ.get("REDIS_URL") else None
+except ImportError:
+    _redis_client = None
+
+# In-process fallback: key -> (expires_at, serialized value). LRU-bounded,
+# because the keys are mostly unique content hashes (parsed PDFs, citation
+# networks, per-node extractor results) that would otherwise accumulate for
+# the life of the process; expired entries are also swept on write.
+_LOCAL_CACHE_MAXSIZE = int(os.getenv("LOCAL_CACHE_MAXSIZE", 1024))
+_local_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def get_json(key: str) -> Optional[Any]:
+    """Get a cached JSON value, or None on miss/expiry."""
+    if not settings.cache_enabled:
+        return None
+
+    if _redis_client is not None:
+        try:
+            raw = _redis_client.get(key)
+            return orjson.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning("⚠️  Redis get failed for %s: %s", key, e)
+            return None
+
+    entry = _local_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, raw = entry
+    if time.time() > expires_at:
+        _local_cache.pop(key, None)
+        return None
+    _local_cache.move_to_end(key)
+    return orjson.loads(raw)
+
+
+def set_json(key: str, value: Any, ttl: Optional[int] = None) -> None:
+    """Cache a JSON-serializable value with a TTL (defaults to settings.cache_ttl_seconds)."""
+    if not settings.cache_enabled:
+        return
+
+    ttl = ttl or settings.cache_ttl_seconds
+    raw = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+    if _redis_client is not None:
+        try:
+            _redis_client.setex(key, ttl, raw)
+            return
+        except Exception as e:
+            logger.warning("⚠️  Redis set failed for %s: %s", key, e)
+            return
+
+    now = time.time()
+    if len(_local_cache) >= _LOCAL_CACHE_MAXSIZE:
+        # Sweep expired entries first; the LRU bound below handles the rest
+        for stale_key in [k for k, (exp, _) in _local_cache.items() if exp <= now]:
+            _local_cache.pop(stale_key, None)
+    _local_cache[key] = (now + ttl, raw)
+    _local_cache.move_to_end(key)
+    while len(_local_cache) > _LOCAL_CACHE_MAXSIZE:
+        _local_cache.popitem(last=False)
+
+
+def delete(key: str) -> None:
+    """Drop a cached entry (used for explicit rebuilds)."""
+    if _redis_client is not None:
+        try:
+            _redis_client.delete(key)
+        except Exception as e:
+            logger.warning("⚠️  Redis delete failed for %s: %s", key, e)
+        return
+    _local_cache.pop(key, None)
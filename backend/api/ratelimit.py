@@ -0,0 +1,72 @@
+"""
+Shared token-bucket rate limiters for outbound API calls
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. acquire() blocks until a token is available,
+    so all callers — across threads and across concurrent requests — draw
+    from one quota instead of each pacing itself with fixed sleeps.
+    """
+
+    def __init__(self, rate: float, capacity: float = None,
+                 min_rate: float = 0.5, recovery_after: int = 20):
+        self.rate = float(rate)  # tokens refilled per second
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        # AIMD state: the configured rate is the ceiling we climb back to
+        self._base_rate = self.rate
+        self._min_rate = float(min_rate)
+        self._recovery_after = int(recovery_after)
+        self._successes = 0
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until `tokens` tokens are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self) -> None:
+        """
+        Halve the refill rate after a server-side throttle (429).
+        Multiplicative decrease converts reactive retry storms into
+        proactive pacing: every thread drawing from this bucket slows
+        down, not just the one that got throttled.
+        """
+        with self._lock:
+            self.rate = max(self._min_rate, self.rate / 2.0)
+            self._successes = 0
+
+    def reward(self) -> None:
+        """
+        Record a successful call; after `recovery_after` consecutive
+        successes the rate doubles back toward the configured ceiling
+        (additive-ish increase, AIMD style).
+        """
+        with self._lock:
+            if self.rate >= self._base_rate:
+                return
+            self._successes += 1
+            if self._successes >= self._recovery_after:
+                self._successes = 0
+                self.rate = min(self._base_rate, self.rate * 2.0)
+
+
+# Shared buckets — every caller in the process shares these quotas
+s2_limiter = TokenBucket(rate=10)     # Semantic Scholar: ~10 req/s
+arxiv_limiter = TokenBucket(rate=3)   # ArXiv asks for gentle polling
+llm_limiter = TokenBucket(rate=2, capacity=5)  # LLM provider RPM, shared by all extractors
@@ -1,10 +1,31 @@
 """
 Semantic Scholar API Client for fetching citation data
 """
-import requests
+import heapq
+import httpx
+import orjson
+import random
 import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from config import settings
+from api import cache
+from api.ratelimit import s2_limiter
+from logging_setup import get_logger
+
+logger = get_logger("s2")
+
+# In-process memo for GET lookups: the same paper routinely appears as a
+# reference of several inputs, and pipeline re-runs re-query the same
+# titles — each repeat would otherwise cost a full HTTP round-trip.
+_JSON_CACHE_MAX = 4096
+_json_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_json_cache_lock = threading.Lock()
 
 
 class SemanticScholarAPI:
@@ -13,27 +34,108 @@ class SemanticScholarAPI:
     def __init__(self, api_key: Optional[str] = None):
         self.base_url = "https://api.semanticscholar.org/graph/v1"
         self.api_key = api_key or settings.semantic_scholar_api_key
-        self.session = requests.Session()
-        
+        # HTTP/2 multiplexes the thread-pool fan-out over one TLS
+        # connection instead of queueing behind per-socket keep-alive
+        self.session = httpx.Client(
+            http2=True,
+            headers={"x-api-key": self.api_key} if self.api_key else {},
+            timeout=30,
+            # Sized for the thread-pool fan-out: without explicit limits,
+            # workers beyond the default pool block waiting for a connection
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        )
+
         if self.api_key:
-            self.session.headers.update({"x-api-key": self.api_key})
-            print(f"✅ Semantic Scholar API initialized with key")
+            logger.info("✅ Semantic Scholar API initialized with key")
         else:
-            print(f"⚠️  Semantic Scholar API initialized without key (rate limited)")
+            logger.warning("⚠️  Semantic Scholar API initialized without key (rate limited)")
     
-    def search_paper(self, title: str, retry_count: int = 0, arxiv_id: str = None) -> Optional[Dict[str, Any]]:
+    def _request(self, method: str, url: str, max_retries: int = 3, **kwargs) -> httpx.Response:
+        """
+        Issue a rate-limited request, retrying 429s and timeouts iteratively.
+
+        Backoff is capped exponential with jitter so concurrent workers
+        desynchronize instead of hammering the API in lockstep. An
+        iterative loop (rather than each method recursing into itself)
+        costs no stack frames under sustained throttling.
+        """
+        last_timeout = None
+        response = None
+        retry_after = None
+        for attempt in range(max_retries + 1):
+            if attempt:
+                # Honor the server's Retry-After when it sent one; otherwise
+                # fall back to the jittered exponential schedule
+                if retry_after is not None:
+                    wait_time = min(60.0, retry_after)
+                else:
+                    wait_time = min(30.0, 2.0 * 2 ** attempt) + random.uniform(0, 1)
+                logger.warning("⚠️  Semantic Scholar retry %d/%d, waiting %.1fs...", attempt, max_retries, wait_time)
+                time.sleep(wait_time)
+            s2_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except httpx.TimeoutException as e:
+                last_timeout = e
+                retry_after = None
+                continue
+            if response.status_code != 429:
+                if response.is_success:
+                    s2_limiter.reward()
+                return response
+            # Slow every worker down, not just this one: the shared bucket
+            # halves its refill rate and climbs back after sustained 200s
+            s2_limiter.penalize()
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = None
+        if response is None:
+            raise last_timeout
+        return response  # still 429 — caller's raise_for_status surfaces it
+
+    def _get_json(self, url: str, params: Dict[str, Any], timeout: int = 30) -> Any:
+        """
+        GET + parse with an LRU memo keyed on the url and params.
+        Raises for non-2xx statuses; only successful payloads are cached.
+        """
+        key = (url, tuple(sorted(params.items())))
+        with _json_cache_lock:
+            if key in _json_cache:
+                _json_cache.move_to_end(key)
+                return _json_cache[key]
+
+        # Second level: the shared cache-aside store, so overlapping paper
+        # sets survive process restarts and are shared across workers
+        cache_key = "s2:resp:" + hashlib.sha1(orjson.dumps(key)).hexdigest()
+        data = cache.get_json(cache_key)
+        if data is None:
+            response = self._request("GET", url, params=params, timeout=timeout)
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            cache.set_json(cache_key, data)
+
+        with _json_cache_lock:
+            _json_cache[key] = data
+            if len(_json_cache) > _JSON_CACHE_MAX:
+                _json_cache.popitem(last=False)
+        return data
+
+    def search_paper(self, title: str, arxiv_id: str = None,
+                     fields: str = "paperId,title,authors,year,citationCount,abstract,venue") -> Optional[Dict[str, Any]]:
         """
         Search for a paper by title or ArXiv ID
-        
+
         Args:
             title: Paper title to search for
-            retry_count: Number of retries attempted
             arxiv_id: Optional ArXiv ID to search by
-            
+            fields: Comma-separated S2 fields to request. The default covers
+                what the graph builder reads; pass "citations"/"references"
+                explicitly if you need the (large) nested lists.
+
         Returns:
             Paper data or None if not found
         """
-        max_retries = 3
         try:
             # If ArXiv ID is provided, try to get paper directly by ArXiv ID
             if arxiv_id:
@@ -41,18 +143,12 @@ class SemanticScholarAPI:
                     # Try using ARXIV: prefix (no "arXiv:" in the ID itself)
                     clean_arxiv_id = arxiv_id.replace('arXiv:', '').replace('arxiv:', '').strip()
                     url = f"{self.base_url}/paper/ARXIV:{clean_arxiv_id}"
-                    params = {
-                        "fields": "paperId,title,authors,year,citationCount,citations,references,abstract,venue"
-                    }
-                    response = self.session.get(url, params=params, timeout=30)
-                    if response.status_code == 200:
-                        paper = response.json()
-                        print(f"✅ Found paper by ArXiv ID: {paper.get('title', 'Unknown')[:60]}...")
-                        return paper
-                    else:
-                        print(f"⚠️  Failed to fetch by ArXiv ID (status {response.status_code}), trying search")
+                    paper = self._get_json(url, {"fields": fields})
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("✅ Found paper by ArXiv ID: %s...", paper.get('title', 'Unknown')[:60])
+                    return paper
                 except Exception as e:
-                    print(f"⚠️  Could not fetch by ArXiv ID, trying search: {e}")
+                    logger.warning("⚠️  Could not fetch by ArXiv ID, trying search: %s", e)
             
             # Clean title for search
             query = title.strip().replace('\n', ' ')
@@ -61,38 +157,22 @@ class SemanticScholarAPI:
             params = {
                 "query": query,
                 "limit": 1,
-                "fields": "paperId,title,authors,year,citationCount,citations,references,abstract,venue"
+                "fields": fields
             }
-            
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 429:
-                print(f"⚠️  Rate limited by Semantic Scholar, waiting...")
-                time.sleep(10)
-                return self.search_paper(title, retry_count, arxiv_id)
-            
-            response.raise_for_status()
-            data = response.json()
-            
+
+            data = self._get_json(url, params)
+
             if data.get("data") and len(data["data"]) > 0:
                 paper = data["data"][0]
-                print(f"✅ Found paper: {paper.get('title', 'Unknown')[:60]}...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("✅ Found paper: %s...", paper.get('title', 'Unknown')[:60])
                 return paper
-            
-            print(f"⚠️  Paper not found: {title[:60]}...")
+
+            logger.info("⚠️  Paper not found: %s...", title[:60])
             return None
-            
-        except requests.exceptions.Timeout as e:
-            if retry_count < max_retries:
-                wait_time = 2 ** retry_count  # Exponential backoff: 1s, 2s, 4s
-                print(f"⚠️  Timeout searching '{title[:60]}...', retrying in {wait_time}s (attempt {retry_count + 1}/{max_retries})")
-                time.sleep(wait_time)
-                return self.search_paper(title, retry_count + 1, arxiv_id)
-            else:
-                print(f"❌ Failed after {max_retries} retries: {e}")
-                return None
+
         except Exception as e:
-            print(f"❌ Error searching paper '{title[:60]}...': {e}")
+            logger.error("❌ Error searching paper '%s...': %s", title[:60], e)
             return None
     
     def get_paper_by_id(self, paper_id: str) -> Optional[Dict[str, Any]]:
@@ -111,94 +191,106 @@ class SemanticScholarAPI:
                 "fields": "paperId,title,authors,year,citationCount,citations,references,abstract,venue"
             }
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 429:
-                print(f"⚠️  Rate limited, waiting...")
-                time.sleep(10)
-                return self.get_paper_by_id(paper_id)
-            
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, params)
             
         except Exception as e:
-            print(f"❌ Error fetching paper {paper_id}: {e}")
+            logger.error("❌ Error fetching paper %s: %s", paper_id, e)
             return None
-    
-    def get_citations(self, paper_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+
+    def get_papers_batch(self, paper_ids: List[str],
+                         fields: str = "paperId,title,authors,year,citationCount,abstract,venue") -> List[Optional[Dict[str, Any]]]:
+        """
+        Get details for multiple papers in one request via the batch API.
+        IDs may use any S2-supported scheme (e.g. "ARXIV:2301.12345", "DOI:10.1/x").
+
+        Args:
+            paper_ids: Paper IDs (up to 500 per request)
+            fields: Comma-separated S2 fields; nested "references.x" fields
+                are accepted too
+
+        Returns:
+            List aligned with paper_ids; None entries for papers not found
+        """
+        if not paper_ids:
+            return []
+
+        results: List[Optional[Dict[str, Any]]] = []
+        batch_size = 500  # S2 batch limit
+        for i in range(0, len(paper_ids), batch_size):
+            batch = paper_ids[i:i + batch_size]
+            try:
+                url = f"{self.base_url}/paper/batch"
+                params = {"fields": fields}
+                response = self._request(
+                    "POST", url, params=params,
+                    content=orjson.dumps({"ids": batch}),
+                    headers={"Content-Type": "application/json"},
+                    timeout=60,
+                )
+                response.raise_for_status()
+                results.extend(orjson.loads(response.content))
+            except Exception as e:
+                logger.error("❌ Error fetching paper batch: %s", e)
+                results.extend([None] * len(batch))
+
+        return results
+
+    def get_citations(self, paper_id: str, limit: int = 1000,
+                      fields: str = "paperId,title,authors,year") -> List[Dict[str, Any]]:
         """
         Get papers that cite this paper
-        
+
         Args:
             paper_id: Semantic Scholar paper ID
             limit: Maximum number of citations to fetch
-            
+            fields: Comma-separated S2 fields to request per citing paper
+
         Returns:
             List of citing papers
         """
         try:
             url = f"{self.base_url}/paper/{paper_id}/citations"
             params = {
-                "fields": "paperId,title,authors,year",
+                "fields": fields,
                 "limit": limit
             }
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 429:
-                time.sleep(10)
-                return self.get_citations(paper_id, limit)
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            citations = []
-            for item in data.get("data", []):
-                if item.get("citingPaper"):
-                    citations.append(item["citingPaper"])
+            data = self._get_json(url, params)
             
-            return citations
+            return [item["citingPaper"] for item in data.get("data", [])
+                    if item.get("citingPaper")]
             
         except Exception as e:
-            print(f"❌ Error fetching citations for {paper_id}: {e}")
+            logger.error("❌ Error fetching citations for %s: %s", paper_id, e)
             return []
     
-    def get_references(self, paper_id: str, limit: int = 1000) -> List[Dict[str, Any]]:
+    def get_references(self, paper_id: str, limit: int = 1000,
+                       fields: str = "paperId,title,authors,year") -> List[Dict[str, Any]]:
         """
         Get papers that this paper cites (references)
-        
+
         Args:
             paper_id: Semantic Scholar paper ID
             limit: Maximum number of references to fetch
-            
+            fields: Comma-separated S2 fields to request per referenced paper
+
         Returns:
             List of referenced papers
         """
         try:
             url = f"{self.base_url}/paper/{paper_id}/references"
             params = {
-                "fields": "paperId,title,authors,year",
+                "fields": fields,
                 "limit": limit
             }
             
-            response = self.session.get(url, params=params, timeout=30)
+            data = self._get_json(url, params)
             
-            if response.status_code == 429:
-                time.sleep(10)
-                return self.get_references(paper_id, limit)
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            references = []
-            for item in data.get("data", []):
-                if item.get("citedPaper"):
-                    references.append(item["citedPaper"])
-            
-            return references
+            return [item["citedPaper"] for item in data.get("data", [])
+                    if item.get("citedPaper")]
             
         except Exception as e:
-            print(f"❌ Error fetching references for {paper_id}: {e}")
+            logger.error("❌ Error fetching references for %s: %s", paper_id, e)
             return []
     
     def get_references_batch(self, paper_ids: List[str]) -> Dict[str, List[str]]:
@@ -207,31 +299,34 @@ class SemanticScholarAPI:
         Returns dict mapping paper_id -> list of referenced paper IDs.
         """
         result = {}
-        batch_size = 100  # S2 batch limit is 500, but keep it safe
-        
-        for i in range(0, len(paper_ids), batch_size):
+        batch_size = 500  # the S2 batch limit; halved adaptively on 400/413
+
+        def fetch_individually(pids: List[str]) -> Dict[str, List[str]]:
+            # Fallback path: per-paper GETs, fanned out over threads since
+            # each one is a full round-trip
+            with ThreadPoolExecutor(max_workers=min(8, len(pids))) as pool:
+                return dict(pool.map(
+                    lambda pid: (pid, [r.get("paperId")
+                                       for r in self.get_references(pid, limit=500)
+                                       if r.get("paperId")]),
+                    pids,
+                ))
+
+        i = 0
+        while i < len(paper_ids):
             batch = paper_ids[i:i + batch_size]
             try:
                 url = f"{self.base_url}/paper/batch"
                 params = {"fields": "references.paperId"}
-                response = self.session.post(
-                    url, params=params,
-                    json={"ids": batch},
+                response = self._request(
+                    "POST", url, params=params,
+                    content=orjson.dumps({"ids": batch}),
+                    headers={"Content-Type": "application/json"},
                     timeout=60,
                 )
-                
-                if response.status_code == 429:
-                    print(f"⚠️  Rate limited on batch, waiting 10s...")
-                    time.sleep(10)
-                    # Retry this batch
-                    response = self.session.post(
-                        url, params=params,
-                        json={"ids": batch},
-                        timeout=60,
-                    )
-                
+
                 if response.status_code == 200:
-                    data = response.json()
+                    data = orjson.loads(response.content)
                     for paper_data in data:
                         if paper_data is None:
                             continue
@@ -239,20 +334,19 @@ class SemanticScholarAPI:
                         refs = paper_data.get("references") or []
                         ref_ids = [r["paperId"] for r in refs if r and r.get("paperId")]
                         result[pid] = ref_ids
+                elif response.status_code in (400, 413) and batch_size > 50:
+                    # Payload too large for the server — shrink and retry the
+                    # same window rather than giving up on it
+                    batch_size //= 2
+                    logger.warning("⚠️  Batch API returned %d, halving batch size to %d", response.status_code, batch_size)
+                    continue
                 else:
-                    print(f"⚠️  Batch API returned {response.status_code}, falling back to individual calls")
-                    for pid in batch:
-                        refs = self.get_references(pid, limit=500)
-                        result[pid] = [r.get("paperId") for r in refs if r.get("paperId")]
-                        time.sleep(0.2)
-                
-                time.sleep(0.3)
+                    logger.warning("⚠️  Batch API returned %d, falling back to individual calls", response.status_code)
+                    result.update(fetch_individually(batch))
             except Exception as e:
-                print(f"❌ Batch references error: {e}, falling back to individual calls")
-                for pid in batch:
-                    refs = self.get_references(pid, limit=500)
-                    result[pid] = [r.get("paperId") for r in refs if r.get("paperId")]
-                    time.sleep(0.2)
+                logger.error("❌ Batch references error: %s, falling back to individual calls", e)
+                result.update(fetch_individually(batch))
+            i += len(batch)
         
         return result
 
@@ -267,129 +361,166 @@ class SemanticScholarAPI:
         4. Create edges wherever one referenced paper cites another
         5. This creates a rich interconnected network between the papers
         """
-        print(f"🔍 Building citation network for {len(paper_titles)} papers...")
+        logger.info("🔍 Building citation network for %d papers...", len(paper_titles))
         
         if arxiv_ids is None:
             arxiv_ids = {}
         
         # ===== Step 1: Find input papers on Semantic Scholar =====
+        # Resolve all titles concurrently (bounded to respect rate limits)
         input_papers = {}
+        input_ids = set()  # membership-test companion for the hot loops below
         paper_id_to_title = {}
-        
-        for title in paper_titles:
-            arxiv_id = arxiv_ids.get(title)
-            paper = self.search_paper(title, arxiv_id=arxiv_id)
-            if paper:
-                paper_id = paper["paperId"]
-                input_papers[paper_id] = paper
-                paper_id_to_title[paper_id] = title
-                print(f"✅ Found: {paper['title'][:60]}... (citations: {paper.get('citationCount', 0)})")
-                time.sleep(0.2)
-        
-        print(f"✅ Found {len(input_papers)} input papers on Semantic Scholar")
+
+        with ThreadPoolExecutor(max_workers=min(10, max(1, len(paper_titles)))) as pool:
+            found = pool.map(
+                lambda title: (title, self.search_paper(title, arxiv_id=arxiv_ids.get(title))),
+                paper_titles,
+            )
+            for title, paper in found:
+                if paper:
+                    paper_id = paper["paperId"]
+                    input_papers[paper_id] = paper
+                    input_ids.add(paper_id)
+                    paper_id_to_title[paper_id] = title
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("✅ Found: %s... (citations: %s)", paper['title'][:60], paper.get('citationCount', 0))
+
+        logger.info("✅ Found %d input papers on Semantic Scholar", len(input_papers))
         
         # ===== Step 2: Get all references for input papers =====
         # These are the "reviewed" papers — the ones actually discussed in the review
         reference_papers = {}  # s2_id -> paper data
         
-        print(f"\n🔗 Fetching references (papers cited by input papers)...")
-        for paper_id, paper_data in input_papers.items():
-            references = self.get_references(paper_id, limit=500)
-            print(f"   {paper_data['title'][:50]}... → {len(references)} references")
-            
+        logger.info("🔗 Fetching references (papers cited by input papers)...")
+        # One /paper/batch POST covers every input paper's reference list,
+        # so N input papers cost ceil(N/500) round-trips instead of N
+        input_references = {}
+        if input_papers:
+            for detail in self.get_papers_batch(
+                list(input_papers),
+                fields="paperId,references.paperId,references.title,references.citationCount",
+            ):
+                if detail and detail.get("paperId"):
+                    input_references[detail["paperId"]] = detail.get("references") or []
+
+        for paper_id, references in input_references.items():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("   %s... → %d references", input_papers[paper_id]['title'][:50], len(references))
+
             for ref in references:
                 ref_id = ref.get("paperId")
-                if ref_id and ref_id not in input_papers:
+                if ref_id and ref_id not in input_ids:
                     reference_papers[ref_id] = ref
-            
-            time.sleep(0.2)
         
-        print(f"📚 Found {len(reference_papers)} unique referenced papers")
+        logger.info("📚 Found %d unique referenced papers", len(reference_papers))
         
         # ===== Step 3: Select which referenced papers to include =====
-        # Sort by citation count, take top N
-        reviewed_list = sorted(
+        # Top N by citation count — nlargest is O(n log k) vs a full sort
+        reviewed_list = heapq.nlargest(
+            max_intermediate_papers,
             reference_papers.items(),
             key=lambda x: x[1].get("citationCount", 0),
-            reverse=True
-        )[:max_intermediate_papers]
+        )
         
         reviewed_papers = {pid: data for pid, data in reviewed_list}
         reviewed_ids = set(reviewed_papers.keys())
-        
-        print(f"📊 Selected top {len(reviewed_papers)} reviewed papers for visualization")
+
+        # The slim per-reference payloads don't carry authors/abstract/venue;
+        # one batch call fills those in for just the selected papers
+        for detail in self.get_papers_batch(list(reviewed_ids)):
+            if detail and detail.get("paperId") in reviewed_ids:
+                pid = detail["paperId"]
+                reviewed_papers[pid] = {**reviewed_papers[pid], **detail}
+
+        logger.info("📊 Selected top %d reviewed papers for visualization", len(reviewed_papers))
         
         # ===== Step 4: Fetch inter-references between reviewed papers =====
         # This is the KEY step — find how reviewed papers cite EACH OTHER
-        print(f"\n🔗 Fetching inter-references between {len(reviewed_ids)} reviewed papers...")
-        print(f"   (Using batch API to find who cites whom)")
+        logger.info("🔗 Fetching inter-references between %d reviewed papers...", len(reviewed_ids))
+        logger.debug("   (Using batch API to find who cites whom)")
         
         reviewed_id_list = list(reviewed_ids)
         inter_references = self.get_references_batch(reviewed_id_list)
         
-        print(f"   Got references for {len(inter_references)} papers")
+        logger.info("   Got references for %d papers", len(inter_references))
         
         # ===== Step 5: Build edges between reviewed papers =====
+        # Edges are collected as bare (from_id, to_id) pairs; the dict form
+        # with titles is materialized once at the end from all_papers
         edges = []
-        edge_set = set()  # for dedup: (from_id, to_id)
-        
+        adj = defaultdict(set)  # from_id -> {to_ids already emitted}
+
         # 5a. Edges from input papers to reviewed papers (review → paper)
-        for input_id, input_data in input_papers.items():
-            input_refs = self.get_references(input_id, limit=500)
-            for ref in input_refs:
-                ref_id = ref.get("paperId")
-                if ref_id and ref_id in reviewed_ids:
-                    key = (input_id, ref_id)
-                    if key not in edge_set:
-                        edge_set.add(key)
-                        edges.append({
-                            "from": input_id,
-                            "to": ref_id,
-                            "from_title": input_data["title"],
-                            "to_title": reviewed_papers[ref_id].get("title", "Unknown")
-                        })
-            time.sleep(0.2)
+        # Reuse the references fetched in Step 2 — same papers, same endpoint
+        for input_id in input_papers:
+            # Intersect once in C instead of testing each reference in Python;
+            # the non-reviewed bulk of the list never enters the loop
+            ref_ids = {r["paperId"] for r in input_references.get(input_id, [])
+                       if r.get("paperId")}
+            seen = adj[input_id]
+            for ref_id in ref_ids & reviewed_ids:
+                if ref_id not in seen:
+                    seen.add(ref_id)
+                    edges.append((input_id, ref_id))
         
-        print(f"   Edges from review → papers: {len(edges)}")
+        logger.info("   Edges from review → papers: %d", len(edges))
         
         # 5b. Edges between reviewed papers (paper ↔ paper) — THE IMPORTANT ONES
         inter_edge_count = 0
         for from_id, ref_ids in inter_references.items():
             if from_id not in reviewed_ids:
                 continue
+            seen = adj[from_id]
             for to_id in ref_ids:
                 if to_id in reviewed_ids and to_id != from_id:
-                    key = (from_id, to_id)
-                    if key not in edge_set:
-                        edge_set.add(key)
-                        edges.append({
-                            "from": from_id,
-                            "to": to_id,
-                            "from_title": reviewed_papers[from_id].get("title", "Unknown"),
-                            "to_title": reviewed_papers[to_id].get("title", "Unknown")
-                        })
+                    if to_id not in seen:
+                        seen.add(to_id)
+                        edges.append((from_id, to_id))
                         inter_edge_count += 1
         
-        print(f"   Edges between reviewed papers: {inter_edge_count}")
-        print(f"   Total edges: {len(edges)}")
+        logger.info("   Edges between reviewed papers: %d", inter_edge_count)
+        logger.info("   Total edges: %d", len(edges))
         
         # ===== Step 6: Combine everything =====
         all_papers = {**input_papers, **reviewed_papers}
         
-        print(f"\n✅ Citation network built:")
-        print(f"   - Input/review papers: {len(input_papers)}")
-        print(f"   - Reviewed papers: {len(reviewed_papers)}")
-        print(f"   - Total papers: {len(all_papers)}")
-        print(f"   - Total edges: {len(edges)}")
-        print(f"   - Inter-paper edges: {inter_edge_count}")
+        logger.info(
+            "✅ Citation network built: %d input, %d reviewed, %d total papers, "
+            "%d edges (%d inter-paper)",
+            len(input_papers), len(reviewed_papers), len(all_papers),
+            len(edges), inter_edge_count,
+        )
         
         return {
             "papers": all_papers,
-            "citations": edges,
+            "citations": [
+                {
+                    "from": from_id,
+                    "to": to_id,
+                    "from_title": all_papers[from_id].get("title", "Unknown"),
+                    "to_title": all_papers[to_id].get("title", "Unknown"),
+                }
+                for from_id, to_id in edges
+            ],
             "input_paper_ids": list(input_papers.keys()),
             "intermediate_paper_ids": list(reviewed_papers.keys())
         }
 
+    async def abuild_citation_network(
+        self,
+        paper_titles: List[str],
+        max_intermediate_papers: int = 50,
+        arxiv_ids: Dict[str, str] = None,
+    ) -> Dict[str, Any]:
+        """Async wrapper so endpoints can await the network build without blocking the event loop."""
+        return await asyncio.to_thread(
+            self.build_citation_network,
+            paper_titles,
+            max_intermediate_papers=max_intermediate_papers,
+            arxiv_ids=arxiv_ids,
+        )
+
 
 # Global instance
 _semantic_scholar_api = None
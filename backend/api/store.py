@@ -0,0 +1,200 @@
+"""
+Bounded in-memory store for built graphs, backed by a shared spill directory
+"""
+import os
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from graph.models import ResearchGraph
+from config import settings
+from logging_setup import get_logger
+
+logger = get_logger("store")
+
+
+# Spills run on a single background worker: assignments happen inline in
+# async endpoints, and serializing + writing a large graph would otherwise
+# block the event loop. One worker keeps writes for the same graph ordered.
+_spill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spill")
+
+
+def _default_spill_dir() -> Path:
+    """Pick a directory shared by all workers (tmpfs when available)"""
+    base = os.getenv("GRAPH_STORE_DIR")
+    if base:
+        return Path(base)
+    if os.path.isdir("/dev/shm"):
+        return Path("/dev/shm/citegraph-store")
+    return Path(tempfile.gettempdir()) / "citegraph-store"
+
+
+class GraphStore:
+    """
+    LRU-bounded mapping of graph_id -> ResearchGraph.
+
+    Each graph can hold full text for every node, so an unbounded dict
+    grows without limit across builds. The store keeps at most `maxsize`
+    graphs resident and evicts the least recently used one when full.
+
+    Every graph is also written to a spill directory (tmpfs when available,
+    overridable via GRAPH_STORE_DIR). Because the directory is shared, a
+    graph built in one uvicorn worker can be served by another: a miss in
+    the in-process LRU falls back to rehydrating from disk.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.maxsize = maxsize or settings.max_graphs_in_store
+        self.spill_dir = Path(spill_dir) if spill_dir else _default_spill_dir()
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._graphs: "OrderedDict[str, ResearchGraph]" = OrderedDict()
+
+    def get(self, graph_id: str) -> Optional[ResearchGraph]:
+        """Get a graph by ID, marking it most recently used"""
+        graph = self._graphs.get(graph_id)
+        if graph is not None:
+            self._graphs.move_to_end(graph_id)
+            return graph
+        return self._load(graph_id)
+
+    def __setitem__(self, graph_id: str, graph: ResearchGraph) -> None:
+        self._graphs[graph_id] = graph
+        self._graphs.move_to_end(graph_id)
+        # In-memory insert is synchronous; the spill (full-graph serialize +
+        # file write) runs on the background worker so callers on the event
+        # loop aren't blocked for the duration
+        _spill_executor.submit(self._spill, graph_id, graph)
+        while len(self._graphs) > self.maxsize:
+            evicted_id, _ = self._graphs.popitem(last=False)
+            self._evicted(evicted_id)
+
+    def _spill_path(self, graph_id: str) -> Path:
+        return self.spill_dir / f"{graph_id}.json"
+
+    def _spill(self, graph_id: str, graph: ResearchGraph) -> None:
+        """Write the graph to the shared directory (atomic rename)"""
+        path = self._spill_path(graph_id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            # Clustered graphs carry int-keyed dicts (cluster_sizes), which
+            # orjson rejects without OPT_NON_STR_KEYS
+            tmp_path.write_bytes(orjson.dumps(graph.to_dict(), option=orjson.OPT_NON_STR_KEYS))
+            tmp_path.replace(path)
+        except (OSError, TypeError) as e:
+            logger.warning("⚠️  Failed to spill graph %s: %s", graph_id, e)
+
+    def _load(self, graph_id: str) -> Optional[ResearchGraph]:
+        """Rehydrate a graph spilled by this or another worker"""
+        path = self._spill_path(graph_id)
+        if not path.exists():
+            return None
+        try:
+            graph = ResearchGraph.from_dict(orjson.loads(path.read_bytes()))
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("⚠️  Failed to load spilled graph %s: %s", graph_id, e)
+            return None
+        self._graphs[graph_id] = graph
+        self._graphs.move_to_end(graph_id)
+        while len(self._graphs) > self.maxsize:
+            evicted_id, _ = self._graphs.popitem(last=False)
+            self._evicted(evicted_id)
+        return graph
+
+    def _evicted(self, graph_id: str) -> None:
+        """Hook called when a graph is evicted (LRU overflow)"""
+        logger.info("⚠️  Evicted graph %s from store (spilled to %s)", graph_id, self.spill_dir)
+
+    def __contains__(self, graph_id: str) -> bool:
+        return graph_id in self._graphs or self._spill_path(graph_id).exists()
+
+    def __len__(self) -> int:
+        return len(self._graphs)
+
+    def values(self) -> List[ResearchGraph]:
+        return list(self._graphs.values())
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """
+        Lightweight listing of every known graph. Resident graphs report
+        full details; graphs that only exist in the spill directory
+        (evicted here, or built by another worker) are listed by id and
+        spill mtime without rehydrating them into the LRU.
+        """
+        entries = []
+        resident = set()
+        for graph in self._graphs.values():
+            resident.add(graph.id)
+            entries.append({
+                "id": graph.id,
+                "name": graph.name,
+                "created_at": graph.created_at,
+                "node_count": len(graph.nodes),
+                "edge_count": len(graph.edges),
+            })
+        for path in self.spill_dir.glob("*.json"):
+            graph_id = path.stem
+            if graph_id in resident or graph_id.startswith("schema-"):
+                continue
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue  # racing eviction/cleanup in another worker
+            entries.append({
+                "id": graph_id,
+                "name": None,
+                "created_at": datetime.fromtimestamp(mtime).isoformat(),
+                "node_count": None,
+                "edge_count": None,
+            })
+        return entries
+
+
+class SchemaStore:
+    """
+    Mapping of graph_id -> GeneratedSchema with the same spill-directory
+    backing as GraphStore, so schemas generated in one worker are visible
+    to the others. Schemas are tiny, so there is no LRU bound.
+    """
+
+    def __init__(self, spill_dir: Optional[str] = None):
+        self.spill_dir = Path(spill_dir) if spill_dir else _default_spill_dir()
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._schemas: dict = {}
+
+    def _spill_path(self, graph_id: str) -> Path:
+        return self.spill_dir / f"schema-{graph_id}.json"
+
+    def get(self, graph_id: str):
+        schema = self._schemas.get(graph_id)
+        if schema is not None:
+            return schema
+
+        path = self._spill_path(graph_id)
+        if not path.exists():
+            return None
+        try:
+            from extractors.schema_generator import GeneratedSchema
+            schema = GeneratedSchema.from_dict(orjson.loads(path.read_bytes()))
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("⚠️  Failed to load spilled schema for %s: %s", graph_id, e)
+            return None
+        self._schemas[graph_id] = schema
+        return schema
+
+    def __setitem__(self, graph_id: str, schema) -> None:
+        self._schemas[graph_id] = schema
+        path = self._spill_path(graph_id)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            tmp_path.write_bytes(orjson.dumps(schema.to_dict(), option=orjson.OPT_NON_STR_KEYS))
+            tmp_path.replace(path)
+        except (OSError, TypeError) as e:
+            logger.warning("⚠️  Failed to spill schema for %s: %s", graph_id, e)
+
+    def __contains__(self, graph_id: str) -> bool:
+        return graph_id in self._schemas or self._spill_path(graph_id).exists()
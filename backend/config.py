@@ -31,6 +31,8 @@ class Settings(BaseSettings):
     
     # Application Settings
     max_papers_in_graph: int = 200
+    max_parse_pages: int = 50  # 0 = parse every page
+    max_graphs_in_store: int = 32
     cache_enabled: bool = True
     cache_ttl_seconds: int = 86400  # 24 hours
     
@@ -64,7 +64,48 @@ Paper Title: {title}
 Paper Content (first 15000 chars):
 {content}
 """
-    
+
+    BATCH_PROMPT_TEMPLATE = """Extract complete architecture details of all models in EACH of the following papers.
+
+For each model/architecture, provide:
+- Name and variant
+- High-level architecture type (Transformer, CNN, RNN, GNN, Hybrid, etc.)
+- Layer structure and depth (e.g., "12 transformer layers", "ResNet-50 backbone")
+- Hidden dimensions / channel sizes (e.g., "768 hidden dim", "256 channels")
+- Number of parameters (if mentioned, e.g., "110M parameters")
+- Any novel architectural components (e.g., "multi-head attention", "skip connections")
+- Evidence location (section/figure where described)
+
+Distinguish between:
+- Proposed architectures (new in this paper)
+- Baseline architectures (existing models used for comparison)
+
+Return in JSON format, one entry per paper keyed by its index:
+{{
+  "papers": [
+    {{
+      "paper_index": 1,
+      "architectures": [
+        {{
+          "name": "string",
+          "architecture_type": "string",
+          "layer_structure": "string",
+          "hidden_dimensions": ["string"],
+          "num_parameters": "string",
+          "novel_components": ["string"],
+          "evidence_location": "string",
+          "notes": "string (proposed or baseline)"
+        }}
+      ]
+    }}
+  ]
+}}
+
+Output only the JSON.
+
+{papers_block}
+"""
+
     def __init__(self, llm_client: BedrockLLMClient = None):
         self.llm = llm_client or get_llm_client()
     
@@ -100,7 +141,61 @@ Paper Content (first 15000 chars):
                 item["novel_components"] = []
                 
             architectures.append(Architecture(**item))
-        
+
         return architectures
 
+    def extract_batch(self, papers: List[ParsedPaper], batch_size: int = 8) -> List[List[Architecture]]:
+        """
+        Extract architectures for several papers in one LLM call per batch.
+        Amortizes the per-request overhead and shared prompt tokens across
+        papers instead of paying them once per paper.
+
+        Args:
+            papers: ParsedPaper objects
+            batch_size: Papers per LLM call
+
+        Returns:
+            List of Architecture lists, aligned with the input papers
+        """
+        results: List[List[Architecture]] = []
+        for start in range(0, len(papers), batch_size):
+            batch = papers[start:start + batch_size]
+            # Split the solo-call content budget across the batch
+            per_paper_chars = max(2000, 15000 // len(batch))
+            papers_block = "\n".join(
+                f"--- Paper {i + 1} ---\nTitle: {p.title}\nContent:\n{p.full_text[:per_paper_chars]}\n"
+                for i, p in enumerate(batch)
+            )
+            prompt = self.BATCH_PROMPT_TEMPLATE.format(papers_block=papers_block)
+
+            print(f"Extracting architectures for {len(batch)} papers in one call...")
+            response = self.llm.complete_json(prompt)
+
+            by_index = {}
+            for entry in response.get("papers", []):
+                if isinstance(entry, dict) and entry.get("paper_index"):
+                    by_index[entry["paper_index"]] = entry.get("architectures", [])
+
+            for i in range(len(batch)):
+                architectures = []
+                for item in by_index.get(i + 1, []):
+                    if "hidden_dimensions" not in item:
+                        item["hidden_dimensions"] = []
+                    if "novel_components" not in item:
+                        item["novel_components"] = []
+                    architectures.append(Architecture(**item))
+                results.append(architectures)
+
+        return results
+
+
+# Global instance
+_architecture_extractor = None
+
 
+def get_architecture_extractor() -> ArchitectureExtractor:
+    """Get or create global architecture extractor instance"""
+    global _architecture_extractor
+    if _architecture_extractor is None:
+        _architecture_extractor = ArchitectureExtractor()
+    return _architecture_extractor
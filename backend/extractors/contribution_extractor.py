@@ -75,7 +75,37 @@ Output format:
   }}
 ]
 """
-    
+
+    BATCH_PROMPT_TEMPLATE = """Analyze EACH of the provided papers and extract its primary technical contributions.
+
+Categorize each contribution using a simple phrase (e.g. Novel Architecture,
+Novel Loss Function, Training/Optimization Procedure, New Dataset, Theoretical
+Proof/Framework, Novel Algorithm, Attention Mechanism, Regularization Method).
+You can define new categories as needed.
+
+Return a structured JSON object with one entry per paper keyed by its index:
+{{
+  "papers": [
+    {{
+      "paper_index": 1,
+      "contributions": [
+        {{
+          "contribution_type": "...",
+          "specific_innovation": "...",
+          "problem_addressed": "...",
+          "evidence_location": "...",
+          "comment": ""
+        }}
+      ]
+    }}
+  ]
+}}
+
+Output ONLY the JSON. No explanations.
+
+{papers_block}
+"""
+
     def __init__(self):
         """Initialize with LLM client (DeepSeek or Bedrock)"""
         from .llm_client import get_llm_client
@@ -140,3 +170,66 @@ Output format:
         print(f"✅ Found {len(contributions)} contributions")
         return contributions
 
+    def extract_batch(self, papers: List[ParsedPaper], batch_size: int = 8) -> List[List[Contribution]]:
+        """
+        Extract contributions for several papers in one LLM call per batch,
+        amortizing request overhead and the shared system prompt.
+
+        Args:
+            papers: ParsedPaper objects
+            batch_size: Papers per LLM call
+
+        Returns:
+            List of Contribution lists, aligned with the input papers
+        """
+        results: List[List[Contribution]] = []
+        for start in range(0, len(papers), batch_size):
+            batch = papers[start:start + batch_size]
+            # Split the solo-call content budget across the batch
+            per_paper_chars = max(2000, 15000 // len(batch))
+            papers_block = "\n".join(
+                f"--- Paper {i + 1} ---\nTitle: {p.title}\nAbstract:\n{p.abstract}\n"
+                f"Content:\n{p.full_text[:per_paper_chars]}\n"
+                for i, p in enumerate(batch)
+            )
+            prompt = self.BATCH_PROMPT_TEMPLATE.format(papers_block=papers_block)
+
+            print(f"🔍 Extracting contributions for {len(batch)} papers in one call...")
+            response = self.llm.complete_json(prompt, self.SYSTEM_PROMPT)
+
+            by_index = {}
+            if isinstance(response, dict):
+                for entry in response.get("papers", []):
+                    if isinstance(entry, dict) and entry.get("paper_index"):
+                        by_index[entry["paper_index"]] = entry.get("contributions", [])
+
+            for i in range(len(batch)):
+                contributions = []
+                for item in by_index.get(i + 1, []):
+                    try:
+                        contributions.append(Contribution(
+                            contribution_type=item.get("contribution_type", "Unknown"),
+                            specific_innovation=item.get("specific_innovation", ""),
+                            problem_addressed=item.get("problem_addressed", ""),
+                            evidence_location=item.get("evidence_location", ""),
+                            comment=item.get("comment", "")
+                        ))
+                    except Exception as e:
+                        print(f"⚠️  Failed to parse contribution: {e}")
+                        continue
+                results.append(contributions)
+
+        return results
+
+
+# Global instance
+_contribution_extractor = None
+
+
+def get_contribution_extractor() -> ContributionExtractor:
+    """Get or create global contribution extractor instance"""
+    global _contribution_extractor
+    if _contribution_extractor is None:
+        _contribution_extractor = ContributionExtractor()
+    return _contribution_extractor
+
@@ -2,6 +2,7 @@
 DeepSeek LLM Client - Works with payment issues!
 """
 import json
+import orjson
 import requests
 from typing import Dict, Any, Optional, Iterator
 
@@ -52,7 +53,7 @@ class DeepSeekClient:
             )
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             return data['choices'][0]['message']['content']
             
@@ -88,7 +89,7 @@ class DeepSeekClient:
             )
             
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             return data['choices'][0]['message']['content']
             
@@ -142,12 +143,12 @@ class DeepSeekClient:
                         if data_str == '[DONE]':
                             break
                         try:
-                            data = json.loads(data_str)
+                            data = orjson.loads(data_str)
                             if 'choices' in data and len(data['choices']) > 0:
                                 delta = data['choices'][0].get('delta', {})
                                 if 'content' in delta:
                                     yield delta['content']
-                        except json.JSONDecodeError:
+                        except ValueError:
                             continue
             
         except Exception as e:
@@ -186,8 +187,8 @@ Start directly with { or [ and end with } or ]."""
         response_text = self._clean_json_response(response_text)
         
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as e:
+            return orjson.loads(response_text)
+        except ValueError as e:
             print(f"❌ JSON decode error: {e}")
             print(f"Response was: {response_text[:500]}")
             return self._extract_json(response_text)
@@ -209,25 +210,15 @@ Start directly with { or [ and end with } or ]."""
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
         """Try to extract JSON from text that might contain other content"""
-        import re
-        
-        # Try to find JSON object or array
-        json_pattern = r'(\{(?:[^{}]|(?:\{[^{}]*\}))*\}|\[(?:[^\[\]]|(?:\[[^\[\]]*\]))*\])'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        if matches:
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except:
-                    continue
-        
-        # If still failed, return error
-        return {
-            "error": "Failed to parse JSON from LLM response",
-            "raw_response": text[:500],
-            "suggestion": "The model might not be outputting valid JSON. Check model configuration."
-        }
+        from extractors.llm_client import parse_first_json
+        try:
+            return parse_first_json(text)
+        except ValueError:
+            return {
+                "error": "Failed to parse JSON from LLM response",
+                "raw_response": text[:500],
+                "suggestion": "The model might not be outputting valid JSON. Check model configuration."
+            }
 
 
 # Global DeepSeek client instance
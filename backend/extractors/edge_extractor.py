@@ -4,10 +4,18 @@ from one paper was adopted/used by another paper.
 Analyzes full paper text when available, falls back to abstracts.
 """
 import json
+import re
+import asyncio
+import hashlib
 import concurrent.futures
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Tuple
+from api import cache
 from graph.models import ResearchGraph, CitationEdge, PaperNode
-from extractors.llm_client import get_llm_client
+from extractors.llm_client import get_llm_client, truncate_to_tokens
+from logging_setup import get_logger
+
+logger = get_logger("edges")
 
 
 SYSTEM_PROMPT = """You are a research analysis expert. Given two papers where Paper A cites Paper B,
@@ -31,9 +39,66 @@ Return JSON:
   "full_insight": "One concise paragraph (3-5 sentences): what Paper A took from Paper B, how it was adapted, and what is different."
 }}"""
 
+BATCH_PROMPT_TEMPLATE = """Below are {count} citation pairs. In each pair, Paper A cites Paper B.
+For EACH pair, identify what specific idea, method, or result from Paper B
+Paper A uses or builds upon.
+
+Return JSON, one entry per pair keyed by its index:
+{{
+  "pairs": [
+    {{
+      "pair_index": 1,
+      "short_label": "max 8 words summarizing the adopted innovation",
+      "full_insight": "One concise paragraph (3-5 sentences): what Paper A took from Paper B, how it was adapted, and what is different."
+    }}
+  ]
+}}
+
+Output only the JSON.
+
+{pairs_block}"""
+
+# Bound once at import: skips the method lookup on every per-edge call
+_format_user_prompt = USER_PROMPT_TEMPLATE.format
+_format_batch_prompt = BATCH_PROMPT_TEMPLATE.format
+
+
+# Sections past these headings (references, acknowledgements) carry almost
+# no signal for innovation extraction but routinely eat most of the char
+# budget in parsed PDFs
+_BOILERPLATE_HEADING = re.compile(
+    r'\n\s*(?:references|bibliography|acknowledg(?:e)?ments)\s*\n', re.IGNORECASE
+)
+_WS_RUNS = re.compile(r'[ \t]{2,}')
+_NL_RUNS = re.compile(r'\n{3,}')
+
+
+def _compress_text(text: str) -> str:
+    """
+    Cheap prompt compression: cut the text at its references/bibliography
+    heading and collapse whitespace runs, so the truncation budget is spent
+    on body prose instead of citation lists and layout artifacts.
+    """
+    match = _BOILERPLATE_HEADING.search(text)
+    if match and match.start() > 1000:  # don't cut a paper that opens oddly
+        text = text[:match.start()]
+    text = _WS_RUNS.sub(' ', text)
+    return _NL_RUNS.sub('\n\n', text)
+
 
 def _build_paper_content(node: PaperNode, max_chars: int = 6000) -> str:
-    """Build the content section for a paper, preferring full text over abstract."""
+    """
+    Build the content section for a paper, preferring full text over abstract.
+    Memoized on the node per max_chars: hub papers appear in many edges, and
+    each repeat would otherwise re-slice kilobytes of text.
+    """
+    cache = getattr(node, "_content_cache", None)
+    if cache is None:
+        cache = node._content_cache = {}
+    cached = cache.get(max_chars)
+    if cached is not None:
+        return cached
+
     parts = []
 
     # Use full text if available
@@ -41,14 +106,46 @@ def _build_paper_content(node: PaperNode, max_chars: int = 6000) -> str:
     abstract = (node.abstract or "").strip()
 
     if full_text and len(full_text) > len(abstract) + 100:
-        # We have real full text (not just abstract copied into full_text)
-        parts.append(f"Full text (truncated):\n{full_text[:max_chars]}")
+        # We have real full text (not just abstract copied into full_text).
+        # Budget in tokens rather than a raw char slice, so dense text
+        # doesn't overshoot the model's context and sparse text isn't cut short
+        parts.append(
+            "Full text (truncated):\n"
+            + truncate_to_tokens(_compress_text(full_text), max_chars // 4)
+        )
     elif abstract:
-        parts.append(f"Abstract:\n{abstract[:2000]}")
+        parts.append(f"Abstract:\n{truncate_to_tokens(abstract, 500)}")
     else:
         parts.append("(no content available)")
 
-    return "\n".join(parts)
+    content = "\n".join(parts)
+    cache[max_chars] = content
+    return content
+
+
+# Returned for edges whose two papers carry the same source text (e.g. the
+# same arXiv abstract fetched for both sides) — the LLM cannot infer a
+# meaningful innovation flow from identical inputs
+_SHARED_TEXT_RESULT = {
+    "short_label": "shared-text citation",
+    "full_insight": "Source and target texts are effectively identical; "
+                    "no distinct innovation flow can be inferred.",
+}
+
+
+def _content_fingerprint(node: PaperNode) -> str:
+    """
+    Hash of the node's source text, memoized on the node. Edges whose two
+    endpoints carry identical text produce identical extractions, so the
+    fingerprint pair is a cheaper dedup key than the full prompt.
+    """
+    fp = getattr(node, "_content_fp", None)
+    if fp is None:
+        text = node.full_text or node.abstract or ""
+        fp = node._content_fp = hashlib.blake2b(
+            text.encode(), digest_size=16
+        ).hexdigest()
+    return fp
 
 
 class EdgeInnovationExtractor:
@@ -56,6 +153,9 @@ class EdgeInnovationExtractor:
 
     def __init__(self):
         self.llm_client = get_llm_client()
+        # Memo keyed by (from_id, to_id): the same pair shows up again on
+        # re-runs and partial extractions, and each repeat is a full LLM call
+        self._edge_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
 
     def extract_single(
         self,
@@ -74,6 +174,16 @@ class EdgeInnovationExtractor:
         Returns:
             Dict with 'short_label' and 'full_insight'
         """
+        cache_key = (from_node.id, to_node.id)
+        cached = self._edge_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        if (from_node.full_text or from_node.abstract) and (
+            _content_fingerprint(from_node) == _content_fingerprint(to_node)
+        ):
+            return dict(_SHARED_TEXT_RESULT)
+
         content_a = _build_paper_content(from_node)
         content_b = _build_paper_content(to_node)
 
@@ -83,7 +193,7 @@ class EdgeInnovationExtractor:
                 "full_insight": "Insufficient paper data to analyze the relationship.",
             }
 
-        prompt = USER_PROMPT_TEMPLATE.format(
+        prompt = _format_user_prompt(
             title_a=from_node.title,
             content_a=content_a,
             title_b=to_node.title,
@@ -103,15 +213,90 @@ class EdgeInnovationExtractor:
             if len(words) > 10:
                 short_label = " ".join(words[:10]) + "..."
 
-            return {"short_label": short_label, "full_insight": full_insight}
+            result = {"short_label": short_label, "full_insight": full_insight}
+            self._edge_cache[cache_key] = result  # only successes are cached
+            return result
 
         except Exception as e:
-            print(f"   Error extracting edge {from_node.title[:30]}... -> {to_node.title[:30]}...: {e}")
+            logger.error("   Error extracting edge %s... -> %s...: %s", from_node.title[:30], to_node.title[:30], e)
             return {
                 "short_label": "citation",
                 "full_insight": f"Extraction failed: {str(e)}",
             }
 
+    def extract_batch(
+        self,
+        items: List[Tuple[CitationEdge, PaperNode, PaperNode]],
+    ) -> List[Dict[str, str]]:
+        """
+        Extract innovation info for several edges with one LLM call.
+        Packing K pairs into one prompt amortizes the per-call HTTP and
+        token-setup cost; the per-pair content budget shrinks with K so the
+        total prompt stays bounded.
+
+        Args:
+            items: (edge, from_node, to_node) triples
+
+        Returns:
+            List of result dicts aligned with items
+        """
+        if not items:
+            return []
+        if len(items) == 1:
+            edge, from_node, to_node = items[0]
+            return [self.extract_single(edge, from_node, to_node)]
+
+        per_side_chars = max(1500, 12000 // (2 * len(items)))
+        blocks = []
+        for i, (edge, from_node, to_node) in enumerate(items):
+            blocks.append(
+                f"--- Pair {i + 1} ---\n"
+                f"Paper A (citing): {from_node.title}\n"
+                f"{_build_paper_content(from_node, max_chars=per_side_chars)}\n"
+                f"Paper B (cited): {to_node.title}\n"
+                f"{_build_paper_content(to_node, max_chars=per_side_chars)}"
+            )
+
+        prompt = _format_batch_prompt(
+            count=len(items), pairs_block="\n\n".join(blocks)
+        )
+
+        try:
+            result = self.llm_client.complete_json(
+                prompt, system_prompt=SYSTEM_PROMPT, max_tokens=512 * len(items)
+            )
+            by_index = {
+                p.get("pair_index"): p
+                for p in result.get("pairs", [])
+                if isinstance(p, dict)
+            }
+        except Exception as e:
+            logger.error("   Error extracting batch of %d edges: %s", len(items), e)
+            return [
+                {"short_label": "citation", "full_insight": f"Extraction failed: {str(e)}"}
+                for _ in items
+            ]
+
+        if not by_index:
+            # The model didn't return the expected pair array (parse failure
+            # or wrong shape) — fall back to one call per edge rather than
+            # stubbing the whole batch
+            return [self.extract_single(edge, from_node, to_node)
+                    for edge, from_node, to_node in items]
+
+        results = []
+        for i in range(len(items)):
+            entry = by_index.get(i + 1) or {}
+            short_label = entry.get("short_label", "citation")
+            words = short_label.split()
+            if len(words) > 10:
+                short_label = " ".join(words[:10]) + "..."
+            results.append({
+                "short_label": short_label,
+                "full_insight": entry.get("full_insight", ""),
+            })
+        return results
+
     def extract_single_by_id(
         self,
         graph: ResearchGraph,
@@ -127,87 +312,215 @@ class EdgeInnovationExtractor:
         Returns:
             Dict with 'short_label' and 'full_insight', or None if edge not found
         """
-        node_map: Dict[str, PaperNode] = {n.id: n for n in graph.nodes}
+        edge = graph.get_edge_by_id(edge_id)
+        if not edge:
+            return None
 
-        for edge in graph.edges:
-            if edge.id == edge_id:
-                from_node = node_map.get(edge.from_paper)
-                to_node = node_map.get(edge.to_paper)
-                if not from_node or not to_node:
-                    return None
+        node_map = graph.node_index
+        from_node = node_map.get(edge.from_paper)
+        to_node = node_map.get(edge.to_paper)
+        if not from_node or not to_node:
+            return None
+
+        logger.info("   Extracting single edge: %s... -> %s...", from_node.title[:40], to_node.title[:40])
+        result = self.extract_single(edge, from_node, to_node)
+
+        # Store on the edge object in-place
+        edge.context = result["short_label"]
+        edge.delta_description = result["full_insight"]
 
-                print(f"   Extracting single edge: {from_node.title[:40]}... -> {to_node.title[:40]}...")
-                result = self.extract_single(edge, from_node, to_node)
+        return result
 
-                # Store on the edge object in-place
+    def extract_batch_by_ids(
+        self,
+        graph: ResearchGraph,
+        edge_ids: List[str],
+        max_parallel: int = 5,
+        batch_size: int = 5,
+    ) -> Dict[str, Optional[Dict[str, str]]]:
+        """
+        Extract innovation info for several edges of one graph in one go.
+        The node/edge maps are built once for the whole batch, and edges
+        are packed into multi-pair prompts like extract_for_graph, so K
+        requested edges cost ~K/batch_size LLM calls instead of K.
+
+        Args:
+            graph: The research graph (edges are modified in-place)
+            edge_ids: Edge IDs to extract for
+            max_parallel: Max concurrent LLM calls
+            batch_size: Edges per LLM call
+
+        Returns:
+            Dict mapping edge_id -> result dict (None for unknown edges)
+        """
+        node_map = graph.node_index
+
+        results: Dict[str, Optional[Dict[str, str]]] = {}
+        work: List[Tuple[str, CitationEdge, PaperNode, PaperNode]] = []
+        for edge_id in edge_ids:
+            edge = graph.get_edge_by_id(edge_id)
+            from_node = node_map.get(edge.from_paper) if edge else None
+            to_node = node_map.get(edge.to_paper) if edge else None
+            if not edge or not from_node or not to_node:
+                results[edge_id] = None
+                continue
+            work.append((edge_id, edge, from_node, to_node))
+
+        def process_batch(chunk: List[Tuple[str, CitationEdge, PaperNode, PaperNode]]):
+            batch_results = self.extract_batch(
+                [(edge, from_node, to_node) for _, edge, from_node, to_node in chunk]
+            )
+            out = []
+            for (edge_id, edge, _, _), result in zip(chunk, batch_results):
                 edge.context = result["short_label"]
                 edge.delta_description = result["full_insight"]
+                out.append((edge_id, result))
+            return out
 
-                return result
+        if work:
+            chunks = [work[i:i + batch_size] for i in range(0, len(work), batch_size)]
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(max_parallel, len(chunks))
+            ) as executor:
+                for chunk_results in executor.map(process_batch, chunks):
+                    for edge_id, result in chunk_results:
+                        results[edge_id] = result
 
-        return None
+        return results
 
     def extract_for_graph(
         self,
         graph: ResearchGraph,
         max_parallel: int = 5,
+        batch_size: int = 5,
         on_progress: Optional[callable] = None,
     ) -> int:
         """
         Extract innovation info for all edges in a graph (in-place).
-        Uses thread pool for parallel LLM calls.
+        Edges are packed into multi-pair prompts and the batches run on a
+        thread pool, so E edges cost ~E/batch_size LLM calls.
 
         Args:
             graph: The research graph (edges are modified in-place)
             max_parallel: Max concurrent LLM calls
+            batch_size: Edges per LLM call
             on_progress: Optional callback(completed, total)
 
         Returns:
             Number of edges processed
         """
-        node_map: Dict[str, PaperNode] = {n.id: n for n in graph.nodes}
+        node_map = graph.node_index
 
         edges_to_process: List[Tuple[CitationEdge, PaperNode, PaperNode]] = []
+        skipped = 0
         for edge in graph.edges:
             from_node = node_map.get(edge.from_paper)
             to_node = node_map.get(edge.to_paper)
-            if from_node and to_node:
-                edges_to_process.append((edge, from_node, to_node))
+            if not from_node or not to_node:
+                continue
+            # Contentless pairs get their stub here rather than being
+            # queued on the pool just to return the same stub from a worker
+            if not (from_node.full_text or from_node.abstract) and not (
+                to_node.full_text or to_node.abstract
+            ):
+                edge.context = "citation"
+                edge.delta_description = "Insufficient paper data to analyze the relationship."
+                skipped += 1
+                continue
+            edges_to_process.append((edge, from_node, to_node))
+
+        if skipped:
+            logger.info("   Skipped %d edges with no paper content", skipped)
 
         total = len(edges_to_process)
         if total == 0:
             return 0
 
-        print(f"   Extracting innovations for {total} edges (max {max_parallel} parallel)...")
-
+        # Dedup by content fingerprint: shared-citation graphs and re-runs
+        # repeat identical (from, to) source text under fresh edge IDs, and
+        # each repeat would otherwise cost a full LLM call. One
+        # representative per pair is extracted; the result fans out below.
+        pair_edges: Dict[str, List[CitationEdge]] = {}
+        pair_results: Dict[str, Dict[str, str]] = {}
+        pending: List[Tuple[str, CitationEdge, PaperNode, PaperNode]] = []
+        for edge, from_node, to_node in edges_to_process:
+            fp_from = _content_fingerprint(from_node)
+            fp_to = _content_fingerprint(to_node)
+            if fp_from == fp_to:
+                # Identical source text on both sides — nothing to extract
+                edge.context = _SHARED_TEXT_RESULT["short_label"]
+                edge.delta_description = _SHARED_TEXT_RESULT["full_insight"]
+                continue
+            pair_key = fp_from + fp_to
+            edges_for_pair = pair_edges.setdefault(pair_key, [])
+            edges_for_pair.append(edge)
+            if len(edges_for_pair) > 1:
+                continue
+            cached = cache.get_json("llm:edge:" + pair_key)
+            if cached is not None:
+                pair_results[pair_key] = cached
+                continue
+            pending.append((pair_key, edge, from_node, to_node))
+
+        logger.info("   Extracting innovations for %d edges (%d unique uncached pairs, max %d parallel)...",
+                    total, len(pending), max_parallel)
+
+        def process_batch(
+            batch: List[Tuple[str, CitationEdge, PaperNode, PaperNode]]
+        ) -> List[Tuple[str, Dict[str, str]]]:
+            results = self.extract_batch([item[1:] for item in batch])
+            return [(item[0], result) for item, result in zip(batch, results)]
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+
+        # submit + as_completed instead of map: map hands results back in
+        # submission order, so one slow batch blocks the drain of everything
+        # queued behind it. Progress is counted here in the main thread, so
+        # on_progress sees a strictly increasing count with no worker races.
         completed = 0
-
-        def process_edge(item: Tuple[CitationEdge, PaperNode, PaperNode]) -> None:
-            nonlocal completed
-            edge, from_node, to_node = item
-            result = self.extract_single(edge, from_node, to_node)
-
-            edge.context = result["short_label"]
-            edge.delta_description = result["full_insight"]
-
-            completed += 1
-            if on_progress:
-                on_progress(completed, total)
-            print(f"   [{completed}/{total}] {from_node.title[:30]}... -> {to_node.title[:30]}...")
-
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_parallel) as executor:
-            list(executor.map(process_edge, edges_to_process))
-
-        return completed
+            futures = [executor.submit(process_batch, batch) for batch in batches]
+            for future in concurrent.futures.as_completed(futures):
+                for pair_key, result in future.result():
+                    pair_results[pair_key] = result
+                    if not result["full_insight"].startswith("Extraction failed"):
+                        cache.set_json("llm:edge:" + pair_key, result)
+                    completed += 1
+                if on_progress:
+                    on_progress(completed, len(pending))
+                logger.info("   [%d/%d] edge pairs extracted", completed, len(pending))
+
+        # Fan each pair's result out to every edge sharing that source text
+        for pair_key, edges in pair_edges.items():
+            result = pair_results.get(pair_key)
+            if result is None:
+                continue
+            for edge in edges:
+                edge.context = result["short_label"]
+                edge.delta_description = result["full_insight"]
 
+        return total
 
-# Global instance
-_edge_extractor = None
+    async def aextract_for_graph(
+        self,
+        graph: ResearchGraph,
+        max_parallel: int = 5,
+        batch_size: int = 5,
+        on_progress: Optional[callable] = None,
+    ) -> int:
+        """Async wrapper so endpoints can await extraction without blocking the event loop."""
+        return await asyncio.to_thread(
+            self.extract_for_graph,
+            graph,
+            max_parallel=max_parallel,
+            batch_size=batch_size,
+            on_progress=on_progress,
+        )
 
 
+# lru_cache makes the lazy init atomic under concurrent first access
+# (cache_clear() is the reset path for tests)
+@lru_cache(maxsize=1)
 def get_edge_extractor() -> EdgeInnovationExtractor:
     """Get or create global edge extractor instance."""
-    global _edge_extractor
-    if _edge_extractor is None:
-        _edge_extractor = EdgeInnovationExtractor()
-    return _edge_extractor
+    return EdgeInnovationExtractor()
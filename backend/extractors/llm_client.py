@@ -2,10 +2,75 @@
 LLM Client using AWS Bedrock - REAL IMPLEMENTATION
 """
 import json
+import time
+import random
+import orjson
+import hashlib
 import boto3
 from botocore.exceptions import ClientError
 from typing import Dict, Any, Optional
 from config import settings
+from api import cache
+from api.ratelimit import llm_limiter
+
+
+def parse_first_json(text: str) -> Any:
+    """
+    Extract and parse the first complete JSON value in text. Scans for the
+    first '{' or '[', tracks bracket depth with string/escape awareness, and
+    hands the balanced slice to orjson — tolerant of prose before or after
+    the JSON, and faster than the stdlib parser on large replies.
+    Raises ValueError when no balanced JSON value is found.
+    """
+    start = None
+    for i, ch in enumerate(text):
+        if ch in '{[':
+            start = i
+            break
+    if start is None:
+        raise ValueError("no JSON value found in response")
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            depth += 1
+        elif ch in '}]':
+            depth -= 1
+            if depth == 0:
+                return orjson.loads(text[start:i + 1])
+    raise ValueError("unbalanced JSON value in response")
+
+
+# English prose averages ~4 chars per token across the model families we
+# target (Llama, Claude, DeepSeek); a shared ratio keeps budgets comparable
+_CHARS_PER_TOKEN = 4
+
+
+def truncate_to_tokens(text: str, n_tokens: int) -> str:
+    """
+    Trim text to an approximate token budget, snapping to a word boundary.
+    Character slices under- or over-shoot the real token budget depending
+    on the text; budgeting in tokens keeps prompts predictable without
+    pulling in a per-model tokenizer.
+    """
+    limit = n_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(' ', 0, limit)
+    return text[:cut if cut > limit // 2 else limit]
 
 
 class BedrockLLMClient:
@@ -75,8 +140,15 @@ class BedrockLLMClient:
                     ]
                 }
                 if system_prompt:
-                    request_body["system"] = system_prompt
-                    
+                    # Mark the system prompt cacheable: it is byte-identical
+                    # across the O(edges)/O(nodes) extraction calls, so the
+                    # provider can reuse the prefix instead of re-billing it
+                    request_body["system"] = [{
+                        "type": "text",
+                        "text": system_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }]
+
             elif "meta" in model_id or "llama" in model_id:
                 # Meta Llama format
                 full_prompt = prompt
@@ -102,11 +174,11 @@ class BedrockLLMClient:
                 modelId=settings.bedrock_model_id,
                 contentType="application/json",
                 accept="application/json",
-                body=json.dumps(request_body)
+                body=orjson.dumps(request_body)
             )
             
             # Parse response
-            response_body = json.loads(response['body'].read())
+            response_body = orjson.loads(response['body'].read())
             
             print(f"✅ Got response!")
             
@@ -215,8 +287,8 @@ Start directly with { or [ and end with } or ]."""
         response_text = self._clean_json_response(response_text)
         
         try:
-            return json.loads(response_text)
-        except json.JSONDecodeError as e:
+            return orjson.loads(response_text)
+        except ValueError as e:
             print(f"❌ JSON decode error: {e}")
             print(f"Response was: {response_text[:500]}")
             return self._extract_json(response_text)
@@ -238,26 +310,14 @@ Start directly with { or [ and end with } or ]."""
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
         """Try to extract JSON from text that might contain other content"""
-        import re
-        
-        # Try to find JSON object or array
-        # Match { ... } or [ ... ]
-        json_pattern = r'(\{(?:[^{}]|(?:\{[^{}]*\}))*\}|\[(?:[^\[\]]|(?:\[[^\[\]]*\]))*\])'
-        matches = re.findall(json_pattern, text, re.DOTALL)
-        
-        if matches:
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except:
-                    continue
-        
-        # If still failed, return error
-        return {
-            "error": "Failed to parse JSON from LLM response",
-            "raw_response": text[:500],
-            "suggestion": "The model might not be outputting valid JSON. Check model configuration."
-        }
+        try:
+            return parse_first_json(text)
+        except ValueError:
+            return {
+                "error": "Failed to parse JSON from LLM response",
+                "raw_response": text[:500],
+                "suggestion": "The model might not be outputting valid JSON. Check model configuration."
+            }
     
     def _mock_response(self, prompt: str) -> str:
         """Mock response for development without AWS Bedrock"""
@@ -356,6 +416,103 @@ Start directly with { or [ and end with } or ]."""
             })
 
 
+def _is_throttle(error: Exception) -> bool:
+    """Heuristic for provider throttling across backends (Bedrock/DeepSeek)"""
+    text = str(error)
+    return (
+        "429" in text
+        or "503" in text
+        or "Throttling" in text
+        or "rate limit" in text.lower()
+    )
+
+
+class CachedLLMClient:
+    """
+    Cache-aside wrapper around an LLM client. Extraction prompts are
+    deterministic functions of their inputs (temperature is fixed low),
+    so re-runs over the same graph re-pay every token for identical
+    completions. Responses are keyed by a hash of (model, system prompt,
+    prompt, max_tokens) in the shared api.cache store — same Redis-or-
+    local backend as the S2 response cache — so repeats short-circuit
+    to stored output. Failures and mock-mode replies are never cached.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._model = getattr(client, "model", None) or settings.bedrock_model_id
+
+    def __getattr__(self, name):
+        # mock_mode, complete_streaming, etc. pass straight through
+        return getattr(self._client, name)
+
+    def _key(self, kind: str, system_prompt: Optional[str], prompt: str, max_tokens: int) -> str:
+        payload = "\x00".join((self._model, kind, system_prompt or "", prompt, str(max_tokens)))
+        return "llm:resp:" + hashlib.sha256(payload.encode()).hexdigest()
+
+    def _cacheable(self, result) -> bool:
+        if getattr(self._client, "mock_mode", False):
+            return False
+        # _extract_json signals a parse failure with an "error" key
+        return not (isinstance(result, dict) and "error" in result)
+
+    _MAX_RETRIES = 4
+
+    def _invoke(self, func, *args, **kwargs):
+        """
+        Gate every outbound LLM call on the shared token bucket and retry
+        provider throttling with capped exponential backoff + jitter.
+        Proactive pacing means concurrent extraction threads draw from one
+        quota instead of discovering the limit through 429s; when a 429
+        does land, the bucket halves its rate (AIMD) for everyone.
+        """
+        for attempt in range(self._MAX_RETRIES + 1):
+            if attempt:
+                wait_time = min(60.0, 2.0 * 2 ** attempt) + random.uniform(0, 1)
+                print(f"⚠️  LLM throttled, retry {attempt}/{self._MAX_RETRIES} in {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            llm_limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if _is_throttle(e) and attempt < self._MAX_RETRIES:
+                    llm_limiter.penalize()
+                    continue
+                raise
+            llm_limiter.reward()
+            return result
+
+    def complete(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> str:
+        key = self._key("text", system_prompt, prompt, max_tokens)
+        cached = cache.get_json(key)
+        if cached is not None:
+            return cached
+        result = self._invoke(self._client.complete, prompt, system_prompt, max_tokens=max_tokens)
+        if self._cacheable(result):
+            cache.set_json(key, result)
+        return result
+
+    def complete_json(self, prompt: str, system_prompt: Optional[str] = None, max_tokens: int = 4096) -> Dict[str, Any]:
+        key = self._key("json", system_prompt, prompt, max_tokens)
+        cached = cache.get_json(key)
+        if cached is not None:
+            return cached
+        result = self._invoke(self._client.complete_json, prompt, system_prompt, max_tokens=max_tokens)
+        if self._cacheable(result):
+            cache.set_json(key, result)
+        return result
+
+    def chat_completion(self, messages: list, max_tokens: int = 4096) -> str:
+        key = self._key("chat", None, orjson.dumps(messages, option=orjson.OPT_SORT_KEYS).decode(), max_tokens)
+        cached = cache.get_json(key)
+        if cached is not None:
+            return cached
+        result = self._invoke(self._client.chat_completion, messages, max_tokens=max_tokens)
+        if self._cacheable(result):
+            cache.set_json(key, result)
+        return result
+
+
 # Global LLM client instance
 _llm_client = None
 
@@ -366,11 +523,11 @@ def get_llm_client():
     if _llm_client is None:
         from config import settings
         from .deepseek_client import DeepSeekClient
-        
+
         if settings.llm_provider.lower() == "deepseek":
             print(f"🔧 Using DeepSeek LLM (provider={settings.llm_provider})")
-            _llm_client = DeepSeekClient(api_key=settings.deepseek_api_key)
+            _llm_client = CachedLLMClient(DeepSeekClient(api_key=settings.deepseek_api_key))
         else:
             print(f"🔧 Using Bedrock LLM (provider={settings.llm_provider})")
-            _llm_client = BedrockLLMClient()
+            _llm_client = CachedLLMClient(BedrockLLMClient())
     return _llm_client
@@ -4,9 +4,11 @@ Schema Generator & Dynamic Extractor
 Analyzes the topic of the review papers and generates 5-7 custom attribute schemas
 tailored to that specific research area, then extracts those attributes from each paper.
 """
+import concurrent.futures
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field, asdict
-from .llm_client import get_llm_client
+from .llm_client import get_llm_client, truncate_to_tokens
 from parsers.pdf_parser import ParsedPaper
 
 
@@ -36,6 +38,10 @@ class AttributeSchema:
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AttributeSchema":
+        return cls(**data)
+
 
 @dataclass
 class GeneratedSchema:
@@ -51,6 +57,14 @@ class GeneratedSchema:
             "attributes": [a.to_dict() for a in self.attributes],
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GeneratedSchema":
+        return cls(
+            topic=data.get("topic", ""),
+            topic_description=data.get("topic_description", ""),
+            attributes=[AttributeSchema.from_dict(a) for a in data.get("attributes", [])],
+        )
+
 
 class SchemaGenerator:
     """Generates a custom extraction schema based on the topic of the papers."""
@@ -157,7 +171,10 @@ Here are the papers:
 class DynamicExtractor:
     """Extract paper attributes according to a generated schema."""
 
-    EXTRACT_PROMPT = """You are an expert ML researcher. For the paper below, extract values for each of the listed attributes.
+    # The schema-dependent header is constant across every paper of a graph,
+    # so it lives in the system prompt: providers cache repeated prefixes,
+    # and only the per-paper suffix below varies call to call.
+    EXTRACT_SYSTEM_TEMPLATE = """You are an expert ML researcher. For the paper you are given, extract values for each of the listed attributes.
 
 Research topic: {topic}
 
@@ -165,26 +182,39 @@ Attributes to extract:
 {attributes_block}
 
 Rules:
-- For each attribute, pick ONE value from the suggested values, or use a short custom value if none fit.
-- If truly unknown / not applicable, use "Unknown".
-- Return ONLY a JSON object mapping attribute keys to chosen values.
+- For each attribute, answer with the NUMBER of the chosen suggested value.
+- Use -1 when no suggested value fits or the answer is unknown.
+- If -1 and a short custom value applies, add it under "o" keyed by the attribute key.
+- Return ONLY a JSON object mapping attribute keys to numbers.
 
 Example output format:
 {{
-{example_keys}
-}}
+{example_keys},
+  "o": {{"some_key": "short custom value, only for keys answered -1"}}
+}}"""
 
-Paper Title: {title}
+    EXTRACT_PROMPT = """Paper Title: {title}
 
 Paper Abstract:
 {abstract}
 
-Paper Content (first 10000 chars):
+Paper Content (truncated):
 {content}
 
 Output ONLY the JSON object.
 """
 
+    BATCH_EXTRACT_PROMPT = """Below are {count} papers. For EACH paper, extract the attribute values following the rules.
+
+Return ONLY a JSON object keyed by paper id:
+{{
+  "papers": {{
+    "<paper_id>": {{"<attribute_key>": 0, "o": {{}}}}
+  }}
+}}
+
+{papers_block}"""
+
     def __init__(self):
         self.llm = get_llm_client()
 
@@ -199,88 +229,237 @@ Output ONLY the JSON object.
         Returns:
             dict mapping attribute key -> extracted value
         """
-        # Build attribute description block
+        # Deterministic keyword pass first: attributes whose value literally
+        # appears in the text are dropped from the LLM request, and a paper
+        # that resolves completely costs no call at all
+        resolved = self._prefill_from_keywords(paper, schema)
+        remaining = [a for a in schema.attributes if a.key not in resolved]
+        if not remaining:
+            print(f"All {len(schema.attributes)} attributes resolved by keywords: {paper.title[:50]}...")
+            return resolved
+
+        system_prompt = self._build_system_prompt(schema, remaining)
+        prompt = self.EXTRACT_PROMPT.format(
+            title=paper.title,
+            abstract=paper.abstract or "",
+            content=truncate_to_tokens(paper.full_text or "", 2500),
+        )
+
+        print(f"Extracting {len(remaining)}/{len(schema.attributes)} attributes from: {paper.title[:50]}...")
+        response = self.llm.complete_json(prompt, system_prompt=system_prompt)
+        result = self._decode_values(response, schema, remaining)
+        result.update(resolved)
+        return result
+
+    # Values too generic to count as keyword evidence
+    _KEYWORD_STOPLIST = {"other", "unknown", "hybrid", "mixed", "none"}
+
+    def _prefill_from_keywords(
+        self, paper: ParsedPaper, schema: GeneratedSchema
+    ) -> Dict[str, str]:
+        """
+        Resolve attributes whose answer is literally present in the text:
+        when exactly one suggested value occurs (at least twice) and its
+        siblings don't, the LLM doesn't need to be asked about that
+        attribute. Deterministic, zero-token pre-pass.
+        """
+        text = (paper.full_text or paper.abstract or "").lower()
+        if not text:
+            return {}
+        resolved: Dict[str, str] = {}
+        for attr in schema.attributes:
+            hits = []
+            for value in attr.suggested_values:
+                lowered = value.lower()
+                if len(lowered) < 6 or lowered in self._KEYWORD_STOPLIST:
+                    continue
+                count = text.count(lowered)
+                if count:
+                    hits.append((value, count))
+            if len(hits) == 1 and hits[0][1] >= 2:
+                resolved[attr.key] = hits[0][0]
+        return resolved
+
+    def _build_system_prompt(
+        self,
+        schema: GeneratedSchema,
+        attributes: Optional[List[AttributeSchema]] = None,
+    ) -> str:
+        """
+        Render the schema-dependent system prompt. Values are enumerated so
+        the model can answer with a bare index — a handful of output tokens
+        per paper instead of restating every chosen value.
+        """
         attr_lines = []
         example_keys = []
-        for attr in schema.attributes:
-            values_str = ", ".join(attr.suggested_values)
+        for attr in (attributes if attributes is not None else schema.attributes):
+            values_str = ", ".join(
+                f"{i}={value}" for i, value in enumerate(attr.suggested_values)
+            )
             attr_lines.append(
                 f'- {attr.label} (key: "{attr.key}"): {attr.description}\n'
                 f'  Suggested values: [{values_str}]'
             )
-            example_keys.append(f'  "{attr.key}": "one of the suggested values"')
+            example_keys.append(f'  "{attr.key}": 0')
 
-        prompt = self.EXTRACT_PROMPT.format(
+        return self.EXTRACT_SYSTEM_TEMPLATE.format(
             topic=schema.topic,
             attributes_block="\n".join(attr_lines),
             example_keys=",\n".join(example_keys),
-            title=paper.title,
-            abstract=paper.abstract or "",
-            content=(paper.full_text or "")[:10000],
         )
 
-        print(f"Extracting {len(schema.attributes)} attributes from: {paper.title[:50]}...")
-        response = self.llm.complete_json(prompt)
-
-        # Normalise: make sure every schema key has a value
+    def _decode_values(
+        self,
+        response: Dict[str, Any],
+        schema: GeneratedSchema,
+        attributes: Optional[List[AttributeSchema]] = None,
+    ) -> Dict[str, str]:
+        """
+        Normalise a model reply: map indices back to values, make sure every
+        schema key has one, and tolerate models that answer with strings.
+        """
+        overrides = response.get("o") or {}
         result: Dict[str, str] = {}
-        for attr in schema.attributes:
-            val = response.get(attr.key, "Unknown")
+        for attr in (attributes if attributes is not None else schema.attributes):
+            val = response.get(attr.key, -1)
             if isinstance(val, list):
-                val = val[0] if val else "Unknown"
-            result[attr.key] = str(val)
+                val = val[0] if val else -1
+            if isinstance(val, str) and val.lstrip("-").isdigit():
+                val = int(val)
+            if isinstance(val, int):
+                if 0 <= val < len(attr.suggested_values):
+                    result[attr.key] = attr.suggested_values[val]
+                else:
+                    result[attr.key] = str(overrides.get(attr.key, "Unknown"))
+            else:
+                result[attr.key] = str(val) if val else "Unknown"
 
         return result
 
+    def extract_batch(
+        self,
+        papers: List[ParsedPaper],
+        schema: GeneratedSchema,
+        token_budget: int = 8000,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Extract attribute values for several papers with one LLM call.
+        The schema header (attributes, rules, examples) is paid once per
+        batch instead of once per paper; the per-paper content budget
+        shrinks with the batch size so the prompt stays bounded.
+
+        Returns:
+            dict mapping paper_id -> {attr_key: value}
+        """
+        if not papers:
+            return {}
+        if len(papers) == 1:
+            return {papers[0].paper_id: self.extract(papers[0], schema)}
+
+        system_prompt = self._build_system_prompt(schema)
+        per_paper_tokens = max(500, token_budget // len(papers))
+        blocks = []
+        for paper in papers:
+            blocks.append(
+                f"--- Paper {paper.paper_id} ---\n"
+                f"Title: {paper.title}\n"
+                f"Abstract:\n{truncate_to_tokens(paper.abstract or '', 300)}\n"
+                f"Content:\n{truncate_to_tokens(paper.full_text or '', per_paper_tokens)}"
+            )
+        prompt = self.BATCH_EXTRACT_PROMPT.format(
+            count=len(papers), papers_block="\n\n".join(blocks)
+        )
+
+        print(f"Extracting {len(schema.attributes)} attributes for {len(papers)} papers in one call...")
+        by_id = None
+        try:
+            response = self.llm.complete_json(
+                prompt, system_prompt=system_prompt, max_tokens=256 * len(papers)
+            )
+            by_id = response.get("papers")
+        except Exception as e:
+            print(f"⚠️  Batch attribute extraction failed ({e}), falling back to single calls")
+
+        results: Dict[str, Dict[str, str]] = {}
+        if not isinstance(by_id, dict):
+            by_id = {}
+        for paper in papers:
+            entry = by_id.get(paper.paper_id)
+            if isinstance(entry, dict):
+                values = self._decode_values(entry, schema)
+                # Keyword hits are deterministic evidence — they win over
+                # whatever the model guessed for those keys
+                values.update(self._prefill_from_keywords(paper, schema))
+                results[paper.paper_id] = values
+            else:
+                # This paper missing from the reply — re-ask individually
+                results[paper.paper_id] = self.extract(paper, schema)
+        return results
+
     def extract_for_graph(
         self,
         graph: "ResearchGraph",
         schema: GeneratedSchema,
+        max_parallel: int = 5,
+        batch_size: int = 4,
     ) -> Dict[str, Dict[str, str]]:
         """
-        Extract attributes for all nodes in a graph.
+        Extract attributes for all nodes in a graph. Nodes are packed into
+        multi-paper prompts and the batches run on a thread pool (mirroring
+        EdgeInnovationExtractor.extract_for_graph), so N nodes cost
+        ~N/batch_size LLM calls; results are written back in the
+        dispatching thread.
 
         Returns:
             dict mapping node_id -> {attr_key: value}
         """
         from graph.models import ResearchGraph  # avoid circular
         results: Dict[str, Dict[str, str]] = {}
+        if not graph.nodes:
+            return results
 
-        for node in graph.nodes:
-            paper = ParsedPaper(
+        node_by_id = graph.node_index
+        papers = [
+            ParsedPaper(
                 paper_id=node.id,
                 title=node.title,
                 authors=node.authors,
                 abstract=node.abstract,
                 full_text=node.full_text or "",
             )
-
-            values = self.extract(paper, schema)
-
-            # Store on the node's attributes dict
-            for key, val in values.items():
-                node.attributes[key] = val
-
-            results[node.id] = values
+            for node in graph.nodes
+        ]
+        batches = [papers[i:i + batch_size] for i in range(0, len(papers), batch_size)]
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(max_parallel, len(batches))
+        ) as executor:
+            futures = [
+                executor.submit(self.extract_batch, batch, schema) for batch in batches
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                # Node writes happen here, not in workers, so attribute
+                # dicts never see concurrent mutation
+                for node_id, values in future.result().items():
+                    node = node_by_id.get(node_id)
+                    if node is not None:
+                        for key, val in values.items():
+                            node.attributes[key] = val
+                    results[node_id] = values
 
         return results
 
 
 # ── Singleton helpers ────────────────────────────────────────────────────
-
-_schema_generator: Optional[SchemaGenerator] = None
-_dynamic_extractor: Optional[DynamicExtractor] = None
+# lru_cache makes the lazy init atomic under concurrent first access
+# (cache_clear() is the reset path for tests)
 
 
+@lru_cache(maxsize=1)
 def get_schema_generator() -> SchemaGenerator:
-    global _schema_generator
-    if _schema_generator is None:
-        _schema_generator = SchemaGenerator()
-    return _schema_generator
+    return SchemaGenerator()
 
 
+@lru_cache(maxsize=1)
 def get_dynamic_extractor() -> DynamicExtractor:
-    global _dynamic_extractor
-    if _dynamic_extractor is None:
-        _dynamic_extractor = DynamicExtractor()
-    return _dynamic_extractor
+    return DynamicExtractor()
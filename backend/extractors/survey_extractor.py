@@ -1,9 +1,78 @@
 """
 Survey Paper Extraction - Extract ground truth from survey/review papers
 """
+import re
+import unicodedata
+import concurrent.futures
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from extractors.llm_client import get_llm_client
+from extractors.llm_client import get_llm_client, parse_first_json
+from logging_setup import get_logger
+
+logger = get_logger("survey")
+
+
+def _canon_title(title: str) -> str:
+    """
+    Canonical form of a paper title for dedup: Unicode NFKD with diacritics
+    stripped, punctuation removed (smart quotes, trailing periods), lowercased,
+    whitespace collapsed. 'BERT: Pre-training…' and 'Bert, pre-training' map
+    to the same key.
+    """
+    t = unicodedata.normalize("NFKD", title)
+    t = "".join(c for c in t if not unicodedata.combining(c))
+    t = re.sub(r"[^\w\s]", "", t).lower()
+    return re.sub(r"\s+", " ", t).strip()
+
+
+def _shingles(text: str, n: int = 3) -> set:
+    """Character n-gram shingle set for near-duplicate comparison"""
+    return {text[i:i + n] for i in range(len(text) - n + 1)} or {text}
+
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9])')
+
+
+def _pack_chunks(text: str, n_tokens: int = 3500, overlap_tokens: int = 256) -> List[str]:
+    """
+    Split text into sentence-boundary chunks targeting a token budget
+    (~4 chars/token, same ratio as llm_client), with a small overlapping
+    tail carried between chunks. Fixed char slices cut mid-sentence and
+    mid-citation, so papers straddling a boundary were routinely missed.
+    """
+    limit = n_tokens * 4
+    overlap = overlap_tokens * 4
+
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for sentence in _SENTENCE_END.split(text):
+        if len(sentence) > limit:
+            # Pathological "sentence" (table, reference dump) — hard-split it
+            if current:
+                chunks.append(' '.join(current))
+                current, size = [], 0
+            chunks.extend(sentence[i:i + limit] for i in range(0, len(sentence), limit))
+            continue
+        if size + len(sentence) > limit and current:
+            chunks.append(' '.join(current))
+            # Carry a tail of recent sentences so mentions that straddle
+            # the boundary appear whole in the next chunk
+            tail: List[str] = []
+            tail_size = 0
+            for prev in reversed(current):
+                if tail_size + len(prev) > overlap:
+                    break
+                tail.append(prev)
+                tail_size += len(prev)
+            current = list(reversed(tail))
+            size = tail_size
+        current.append(sentence)
+        size += len(sentence)
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
 
 
 @dataclass
@@ -50,7 +119,7 @@ class SurveyExtractor:
         Returns:
             SurveyGroundTruth object with extracted data
         """
-        print(f"📚 Extracting ground truth from survey: {survey_title}")
+        logger.info("📚 Extracting ground truth from survey: %s", survey_title)
         
         # Step 1: Extract taxonomy/categories
         categories = self._extract_categories(survey_text)
@@ -101,29 +170,25 @@ Return ONLY the JSON array, no other text.
                 {"role": "user", "content": prompt}
             ])
             
-            import json
-            categories = json.loads(response)
-            print(f"✅ Extracted {len(categories)} categories")
+            # Tolerant of prose around the JSON — a stray preamble no longer
+            # costs the whole call
+            categories = parse_first_json(response)
+            logger.info("✅ Extracted %d categories", len(categories))
             return categories
             
         except Exception as e:
-            print(f"❌ Error extracting categories: {e}")
+            logger.error("❌ Error extracting categories: %s", e)
             return []
     
     def _extract_papers(self, survey_text: str, categories: List[Dict[str, Any]]) -> List[PaperInSurvey]:
         """Extract papers mentioned in survey with their contributions"""
         
-        # Split text into chunks for processing
-        chunk_size = 6000
-        chunks = [survey_text[i:i+chunk_size] for i in range(0, len(survey_text), chunk_size)]
-        
-        all_papers = []
+        # Split text into sentence-aligned, token-budgeted chunks
+        chunks = _pack_chunks(survey_text)
         
-        for i, chunk in enumerate(chunks[:10]):  # Limit to first 10 chunks
-            print(f"📄 Processing chunk {i+1}/{min(10, len(chunks))}...")
-            
-            category_names = [c["name"] for c in categories]
-            
+        category_names = [c["name"] for c in categories]
+
+        def process_chunk(chunk: str) -> List[PaperInSurvey]:
             prompt = f"""
 Analyze this section of a survey paper and extract all papers mentioned along with their contributions.
 
@@ -153,38 +218,68 @@ Return a JSON array:
 Return ONLY the JSON array, no other text. If no papers are mentioned, return [].
 """
             
-            try:
-                response = self.llm_client.chat_completion([
-                    {"role": "system", "content": "You are a helpful research assistant."},
-                    {"role": "user", "content": prompt}
-                ])
-                
-                import json
-                papers_in_chunk = json.loads(response)
-                
-                for paper_data in papers_in_chunk:
-                    paper = PaperInSurvey(
-                        title=paper_data.get("title", ""),
-                        authors=paper_data.get("authors", []),
-                        year=paper_data.get("year"),
-                        contribution=paper_data.get("contribution", ""),
-                        category=paper_data.get("category", "Uncategorized")
-                    )
-                    all_papers.append(paper)
-                
-            except Exception as e:
-                print(f"⚠️  Error extracting papers from chunk {i+1}: {e}")
-                continue
-        
-        # Deduplicate papers by title
-        unique_papers = {}
+            response = self.llm_client.chat_completion([
+                {"role": "system", "content": "You are a helpful research assistant."},
+                {"role": "user", "content": prompt}
+            ])
+
+            papers_in_chunk = parse_first_json(response)
+            return [
+                PaperInSurvey(
+                    title=paper_data.get("title", ""),
+                    authors=paper_data.get("authors", []),
+                    year=paper_data.get("year"),
+                    contribution=paper_data.get("contribution", ""),
+                    category=paper_data.get("category", "Uncategorized")
+                )
+                for paper_data in papers_in_chunk
+            ]
+
+        # Chunks are independent, so run them concurrently instead of one
+        # LLM round-trip at a time — this loop dominates survey ingestion
+        work = chunks[:10]  # Limit to first 10 chunks
+        all_papers = []
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(5, len(work))
+        ) as executor:
+            futures = {
+                executor.submit(process_chunk, chunk): i for i, chunk in enumerate(work)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                i = futures[future]
+                try:
+                    all_papers.extend(future.result())
+                    logger.info("📄 Processed chunk %d/%d", i + 1, len(work))
+                except Exception as e:
+                    logger.warning("⚠️  Error extracting papers from chunk %d: %s", i + 1, e)
+
+        # Deduplicate by canonical title first, then collapse near-duplicates
+        # (author suffixes, truncations) with a 3-gram Jaccard pass so the
+        # same paper doesn't flow into _extract_relationships twice. The
+        # longest title wins as the representative.
+        by_canon: Dict[str, PaperInSurvey] = {}
         for paper in all_papers:
-            title_key = paper.title.lower().strip()
-            if title_key and title_key not in unique_papers:
-                unique_papers[title_key] = paper
-        
-        papers_list = list(unique_papers.values())
-        print(f"✅ Extracted {len(papers_list)} unique papers")
+            key = _canon_title(paper.title)
+            if not key:
+                continue
+            existing = by_canon.get(key)
+            if existing is None or len(paper.title) > len(existing.title):
+                by_canon[key] = paper
+
+        papers_list: List[PaperInSurvey] = []
+        rep_shingles: List[set] = []
+        for key, paper in by_canon.items():
+            shingles = _shingles(key)
+            for idx, existing_shingles in enumerate(rep_shingles):
+                overlap = len(shingles & existing_shingles)
+                if overlap and overlap / len(shingles | existing_shingles) >= 0.85:
+                    if len(paper.title) > len(papers_list[idx].title):
+                        papers_list[idx] = paper
+                    break
+            else:
+                papers_list.append(paper)
+                rep_shingles.append(shingles)
+        logger.info("✅ Extracted %d unique papers", len(papers_list))
         
         return papers_list
     
@@ -234,13 +329,12 @@ Return ONLY the JSON array. If no clear relationships, return [].
                 {"role": "user", "content": prompt}
             ])
             
-            import json
-            relationships = json.loads(response)
-            print(f"✅ Extracted {len(relationships)} relationships")
+            relationships = parse_first_json(response)
+            logger.info("✅ Extracted %d relationships", len(relationships))
             return relationships
             
         except Exception as e:
-            print(f"❌ Error extracting relationships: {e}")
+            logger.error("❌ Error extracting relationships: %s", e)
             return []
     
     def convert_to_evaluation_format(self, ground_truth: SurveyGroundTruth) -> Dict[str, Any]:
@@ -286,13 +380,9 @@ Return ONLY the JSON array. If no clear relationships, return [].
         }
 
 
-# Global instance
-_survey_extractor = None
-
-
+# lru_cache makes the lazy init atomic under concurrent first access
+# (cache_clear() is the reset path for tests)
+@lru_cache(maxsize=1)
 def get_survey_extractor() -> SurveyExtractor:
     """Get or create global survey extractor instance"""
-    global _survey_extractor
-    if _survey_extractor is None:
-        _survey_extractor = SurveyExtractor()
-    return _survey_extractor
+    return SurveyExtractor()
@@ -2,9 +2,112 @@
 Graph Builder Service - Constructs citation networks from papers
 """
 from typing import List, Dict, Any, Optional
+import operator
+import re
 import networkx as nx
+import numpy as np
 from graph.models import ResearchGraph, PaperNode, CitationEdge
 from parsers.pdf_parser import ParsedPaper
+from logging_setup import get_logger
+
+logger = get_logger("builder")
+
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional — fall back to the pure-Python kernel
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _bfs_bidirectional_csr(indptr, indices, rindptr, rindices, src, dst):
+    """
+    Bidirectional BFS over forward + reverse CSR adjacency. Expands the
+    smaller frontier each round, so the search explores O(b^(d/2)) nodes
+    instead of O(b^d). Returns (prev, succ, meet): predecessors from the
+    source side, successors from the target side, and the meeting node
+    (-1 if unreachable).
+    """
+    n = indptr.shape[0] - 1
+    prev = np.full(n, -1, dtype=np.int64)
+    succ = np.full(n, -1, dtype=np.int64)
+    visited_f = np.zeros(n, dtype=np.bool_)
+    visited_b = np.zeros(n, dtype=np.bool_)
+
+    frontier_f = np.empty(n, dtype=np.int64)
+    frontier_b = np.empty(n, dtype=np.int64)
+    next_f = np.empty(n, dtype=np.int64)
+    next_b = np.empty(n, dtype=np.int64)
+    len_f = 1
+    len_b = 1
+    frontier_f[0] = src
+    frontier_b[0] = dst
+    visited_f[src] = True
+    visited_b[dst] = True
+
+    while len_f > 0 and len_b > 0:
+        if len_f <= len_b:
+            count = 0
+            for i in range(len_f):
+                u = frontier_f[i]
+                for k in range(indptr[u], indptr[u + 1]):
+                    v = indices[k]
+                    if not visited_f[v]:
+                        visited_f[v] = True
+                        prev[v] = u
+                        if visited_b[v]:
+                            return prev, succ, v
+                        next_f[count] = v
+                        count += 1
+            frontier_f, next_f = next_f, frontier_f
+            len_f = count
+        else:
+            count = 0
+            for i in range(len_b):
+                u = frontier_b[i]
+                for k in range(rindptr[u], rindptr[u + 1]):
+                    v = rindices[k]
+                    if not visited_b[v]:
+                        visited_b[v] = True
+                        succ[v] = u
+                        if visited_f[v]:
+                            return prev, succ, v
+                        next_b[count] = v
+                        count += 1
+            frontier_b, next_b = next_b, frontier_b
+            len_b = count
+
+    return prev, succ, -1
+
+
+# Inline citations like [1] or [Author, 2023] — compiled once at import
+_CITATION_RE = re.compile(r'\[([^\]]+)\]')
+
+# Citation-type keywords fused into one alternation; the group name of the
+# first match is the category, so classification is a single scan of the
+# context instead of one substring sweep per keyword
+_CITATION_TYPE_RE = re.compile(
+    r'(?P<baseline>baseline|compared to|versus)'
+    r'|(?P<foundation>builds on|extends|based on)'
+    r'|(?P<extension>improve|enhance|better than)'
+    r'|(?P<dataset>dataset|benchmark|evaluation)'
+    r'|(?P<critique>however|limitation|problem)',
+    re.IGNORECASE,
+)
+
+
+# NumPy comparison kernels for the vectorized filter fast path
+_VECTOR_OPS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
 
 
 class GraphBuilder:
@@ -31,14 +134,13 @@ class GraphBuilder:
             ResearchGraph object
         """
         graph = ResearchGraph()
-        
-        # Create nodes for all papers
-        paper_id_map = {}  # Map from title to paper ID
-        for paper in papers:
-            node = self._create_node_from_paper(paper)
-            graph.add_node(node)
-            paper_id_map[paper.title.lower()] = node.id
-        
+
+        # Create nodes for all papers. Comprehensions let CPython pre-size
+        # the containers instead of growing them add_node by add_node
+        nodes = [self._create_node_from_paper(paper) for paper in papers]
+        graph.nodes.extend(nodes)
+        graph.touch()
+
         # Note: This method doesn't create edges - use build_from_papers_with_citations for that
         
         # Update metadata
@@ -72,45 +174,51 @@ class GraphBuilder:
         graph = ResearchGraph()
         
         # Create title to paper mapping for input papers
-        title_to_paper = {p.title.lower().strip(): p for p in papers}
+        title_to_paper = {p.title_norm: p for p in papers}
         
         # Get S2 papers data
         s2_papers = citation_network.get("papers", {})
         input_paper_ids_s2 = citation_network.get("input_paper_ids", [])
         intermediate_paper_ids_s2 = citation_network.get("intermediate_paper_ids", [])
         
-        print(f"   DEBUG: s2_papers count: {len(s2_papers)}")
-        print(f"   DEBUG: input_paper_ids_s2: {input_paper_ids_s2}")
-        print(f"   DEBUG: First 5 s2_papers keys: {list(s2_papers.keys())[:5]}")
-        
+        # Lazy %s formatting: nothing is stringified unless DEBUG is emitted
+        logger.debug("s2_papers count: %d", len(s2_papers))
+        logger.debug("input_paper_ids_s2: %s", input_paper_ids_s2)
+        logger.debug("sample s2_papers key: %s", next(iter(s2_papers), None))
+
+
         s2_paper_id_to_node_id = {}  # Map S2 paper ID to our node ID
-        
+
+        # Index S2 input papers by normalized title once, so matching is
+        # O(1) per uploaded paper instead of rescanning (and re-normalizing)
+        # the whole input list for each one
+        s2_title_index = {
+            s2_papers[s2_id]["title"].lower().strip(): s2_id
+            for s2_id in input_paper_ids_s2
+            if s2_id in s2_papers
+        }
+
+        # Single upload with a single S2 input paper: the match is decided
+        # once here, so the loop below skips title lookup entirely
+        fast_single = None
+        if len(papers) == 1 and len(input_paper_ids_s2) == 1:
+            only_id = input_paper_ids_s2[0]
+            if only_id in s2_papers:
+                fast_single = (only_id, s2_papers[only_id])
+
         # Step 1: Create nodes for INPUT papers (uploaded by user)
-        print(f"📄 Creating nodes for {len(papers)} input papers...")
+        logger.info("📄 Creating nodes for %d input papers...", len(papers))
         for paper in papers:
-            title_lower = paper.title.lower().strip()
-            
-            # Find matching S2 paper BY ID (more reliable than title matching)
-            s2_paper = None
-            s2_paper_id = None
-            
-            # First, try to match by checking if this paper's title matches any input paper in S2
-            for s2_id in input_paper_ids_s2:
-                if s2_id in s2_papers:
-                    s2_data = s2_papers[s2_id]
-                    # Match by title (fuzzy) or just take the first input paper if we only have one
-                    if len(papers) == 1 and len(input_paper_ids_s2) == 1:
-                        # If we only have 1 input paper, just use it
-                        s2_paper = s2_data
-                        s2_paper_id = s2_id
-                        print(f"   📌 Matched input paper by position: {s2_id}")
-                        break
-                    elif s2_data["title"].lower().strip() == title_lower:
-                        s2_paper = s2_data
-                        s2_paper_id = s2_id
-                        print(f"   📌 Matched input paper by title: {s2_id}")
-                        break
-            
+            if fast_single is not None:
+                s2_paper_id, s2_paper = fast_single
+                logger.debug("📌 Matched input paper by position: %s", s2_paper_id)
+            else:
+                # Find matching S2 paper by normalized title
+                s2_paper_id = s2_title_index.get(paper.title_norm)
+                s2_paper = s2_papers.get(s2_paper_id) if s2_paper_id else None
+                if s2_paper:
+                    logger.debug("📌 Matched input paper by title: %s", s2_paper_id)
+
             node = self._create_node_from_paper(paper)
             
             # Add S2 metadata if available
@@ -130,7 +238,7 @@ class GraphBuilder:
         
         # Step 2: Create nodes for INTERMEDIATE papers (from Semantic Scholar)
         if include_intermediate:
-            print(f"🔗 Creating nodes for {len(intermediate_paper_ids_s2)} intermediate papers...")
+            logger.info("🔗 Creating nodes for %d intermediate papers...", len(intermediate_paper_ids_s2))
             for s2_id in intermediate_paper_ids_s2:
                 if s2_id not in s2_papers:
                     continue
@@ -163,38 +271,42 @@ class GraphBuilder:
                 
                 s2_paper_id_to_node_id[s2_id] = node.id
                 graph.add_node(node)
-                
-                print(f"   + {s2_paper['title'][:60]}...")
+
+                logger.debug("+ %.60s...", s2_paper["title"])
         
         # Step 3: Create edges from citation data
-        print(f"🔗 Creating edges from citation data...")
-        print(f"   citation_network keys: {list(citation_network.keys())}")
-        print(f"   citations in network: {len(citation_network.get('citations', []))}")
-        if len(citation_network.get('citations', [])) > 0:
-            print(f"   First citation: {citation_network.get('citations', [])[0]}")
-        
-        edges_created = 0
-        for citation in citation_network.get("citations", []):
-            from_s2_id = citation["from"]
-            to_s2_id = citation["to"]
-            
-            # Map to our node IDs
-            from_node_id = s2_paper_id_to_node_id.get(from_s2_id)
-            to_node_id = s2_paper_id_to_node_id.get(to_s2_id)
-            
+        citations = citation_network.get("citations", [])
+        logger.info("🔗 Creating edges from %d citations...", len(citations))
+        if citations:
+            logger.debug("first citation: %s", citations[0])
+
+        # Append straight onto the edge list: the graph is freshly built
+        # (no lazy indexes yet), so per-edge add_edge bookkeeping — index
+        # upkeep plus a version bump and timestamp per edge — is skipped
+        # in favor of one touch() at the end
+        known = s2_paper_id_to_node_id
+        append_edge = graph.edges.append
+        skips_logged = 0
+        for citation in citations:
+            from_node_id = known.get(citation["from"])
+            to_node_id = known.get(citation["to"])
+
             if from_node_id and to_node_id:
-                edge = CitationEdge(
+                append_edge(CitationEdge(
                     from_paper=from_node_id,
                     to_paper=to_node_id,
                     contribution_type="reference",
                     strength=0.5
+                ))
+            elif skips_logged < 3:  # Debug first few failures
+                skips_logged += 1
+                logger.debug(
+                    "SKIP edge: from_s2=%.20s... to_s2=%.20s... (from_node=%s, to_node=%s)",
+                    citation["from"], citation["to"], from_node_id, to_node_id,
                 )
-                graph.add_edge(edge)
-                edges_created += 1
-            elif edges_created < 3:  # Debug first few failures
-                print(f"     SKIP edge: from_s2={from_s2_id[:20]}... to_s2={to_s2_id[:20]}... (from_node={from_node_id}, to_node={to_node_id})")
-        
-        print(f"✅ Created {edges_created} edges")
+        graph.touch()
+
+        logger.info("✅ Created %d edges", len(graph.edges))
         
         # Update metadata
         graph.metadata = {
@@ -215,8 +327,8 @@ class GraphBuilder:
             authors=paper.authors,
             abstract=paper.abstract,
             full_text=paper.full_text,
-            arxiv_id=getattr(paper, 'arxiv_id', None),
-            publication_date=getattr(paper, 'publication_date', None)
+            arxiv_id=paper.arxiv_id,
+            publication_date=paper.publication_date
         )
     
     def _extract_citations_from_text(self, text: str) -> List[Dict[str, str]]:
@@ -225,16 +337,10 @@ class GraphBuilder:
         This is a simplified version - in production, use proper citation parsing
         """
         citations = []
-        
+
         # Simple pattern matching for citations [1], [Author 2023], etc.
         # In production, this should use a proper citation extraction library
-        import re
-        
-        # Pattern for inline citations like [1] or [Author, 2023]
-        citation_pattern = r'\[([^\]]+)\]'
-        matches = re.finditer(citation_pattern, text)
-        
-        for match in matches:
+        for match in _CITATION_RE.finditer(text):
             citation_text = match.group(1)
             # Extract context (surrounding sentences)
             start = max(0, match.start() - 200)
@@ -255,20 +361,8 @@ class GraphBuilder:
         Classify citation type based on context
         Simple keyword-based classification
         """
-        context_lower = context.lower()
-        
-        if any(word in context_lower for word in ["baseline", "compared to", "versus"]):
-            return "baseline"
-        elif any(word in context_lower for word in ["builds on", "extends", "based on"]):
-            return "foundation"
-        elif any(word in context_lower for word in ["improve", "enhance", "better than"]):
-            return "extension"
-        elif any(word in context_lower for word in ["dataset", "benchmark", "evaluation"]):
-            return "dataset"
-        elif any(word in context_lower for word in ["however", "limitation", "problem"]):
-            return "critique"
-        else:
-            return "related"
+        match = _CITATION_TYPE_RE.search(context)
+        return match.lastgroup if match else "related"
     
     def _titles_match(self, title1: str, title2: str, threshold: float = 0.8) -> bool:
         """
@@ -289,17 +383,17 @@ class GraphBuilder:
     
     def _compute_date_range(self, papers: List[ParsedPaper]) -> Dict[str, str]:
         """Compute date range of papers"""
-        dates = []
+        # Running min/max in one pass — no intermediate date list
+        start = end = None
         for paper in papers:
-            if hasattr(paper, 'publication_date') and paper.publication_date:
-                dates.append(paper.publication_date)
-        
-        if dates:
-            return {
-                "start": min(dates),
-                "end": max(dates)
-            }
-        return {"start": "", "end": ""}
+            date = getattr(paper, 'publication_date', None)
+            if not date:
+                continue
+            if start is None or date < start:
+                start = date
+            if end is None or date > end:
+                end = date
+        return {"start": start or "", "end": end or ""}
     
     def filter_graph(
         self,
@@ -321,59 +415,164 @@ class GraphBuilder:
             layout=graph.layout
         )
         
-        # Filter nodes
-        visible_node_ids = set()
-        for node in graph.nodes:
-            if self._node_matches_filters(node, filters):
-                filtered_graph.add_node(node)
-                visible_node_ids.add(node.id)
-        
-        # Filter edges (only include if both endpoints are visible)
-        for edge in graph.edges:
-            if edge.from_paper in visible_node_ids and edge.to_paper in visible_node_ids:
-                filtered_graph.add_edge(edge)
-        
+        # Filter nodes — vectorized fast path for all-numeric filters,
+        # falling back to the per-node check otherwise
+        mask = self._numeric_filter_mask(graph, filters)
+        if mask is not None:
+            matching_nodes = [node for node, keep in zip(graph.nodes, mask) if keep]
+        else:
+            matches = self._compile_filters(filters)
+            matching_nodes = [node for node in graph.nodes if matches(node)]
+
+        visible_node_ids = {node.id for node in matching_nodes}
+
+        # Filter edges (only include if both endpoints are visible). When
+        # the filter is selective, walk only the surviving nodes' outgoing
+        # edges via the graph's adjacency index instead of scanning every
+        # edge; for broad filters the flat scan is cheaper than the lookups.
+        if len(matching_nodes) * 4 <= len(graph.nodes):
+            kept_edges = [
+                edge
+                for node_id in visible_node_ids
+                for edge in graph.get_edges_for_node(node_id)
+                if edge.from_paper == node_id and edge.to_paper in visible_node_ids
+            ]
+        else:
+            kept_edges = [
+                edge for edge in graph.edges
+                if edge.from_paper in visible_node_ids and edge.to_paper in visible_node_ids
+            ]
+
+        # filtered_graph is freshly built (no lazy indexes yet), so bulk
+        # list assignment with a single touch() beats per-item add calls
+        filtered_graph.nodes.extend(matching_nodes)
+        filtered_graph.edges.extend(kept_edges)
+        filtered_graph.touch()
+
         return filtered_graph
     
-    def _node_matches_filters(self, node: PaperNode, filters: List[Dict[str, Any]]) -> bool:
-        """Check if node matches filter conditions"""
+    def _numeric_filter_mask(
+        self,
+        graph: ResearchGraph,
+        filters: List[Dict[str, Any]]
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate all-numeric filters as vectorized NumPy mask operations.
+
+        Builds one float column per filtered field (SoA layout, NaN for
+        missing/non-numeric values) and combines the comparisons into a
+        single boolean mask. Returns None when any filter is non-numeric,
+        so the caller falls back to the per-node path.
+        """
+        if not filters:
+            return None
+
+        for filter_cond in filters:
+            value = filter_cond.get("value")
+            if filter_cond.get("operator") not in _VECTOR_OPS:
+                return None
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+
+        mask = np.ones(len(graph.nodes), dtype=bool)
+
+        # Column-per-field (SoA) cache lives on the graph, keyed by its
+        # version, so repeated filters over an unchanged graph skip the
+        # node scan entirely; columns are still built lazily per field
+        cached = getattr(graph, "_column_cache", None)
+        if cached is not None and cached[0] == graph.version:
+            columns = cached[1]
+        else:
+            columns: Dict[str, np.ndarray] = {}
+            graph._column_cache = (graph.version, columns)
+
+        for filter_cond in filters:
+            field = filter_cond["field"]
+            column = columns.get(field)
+            if column is None:
+                values = []
+                for node in graph.nodes:
+                    if field in node.attributes:
+                        node_value = node.attributes[field]
+                    else:
+                        node_value = getattr(node, field, None)
+                    if isinstance(node_value, (int, float)) and not isinstance(node_value, bool):
+                        values.append(float(node_value))
+                    else:
+                        values.append(np.nan)  # missing/non-numeric; masked out below
+                column = np.array(values, dtype=np.float64)
+                columns[field] = column
+
+            with np.errstate(invalid="ignore"):
+                # Field presence is required for every operator, matching the
+                # per-node path. NaN only compares False under the ordering
+                # ops — np.not_equal(NaN, x) is True — so the NaN rows must
+                # be masked out explicitly rather than left to the compare.
+                mask &= ~np.isnan(column)
+                mask &= _VECTOR_OPS[filter_cond["operator"]](column, filter_cond["value"])
+
+        return mask
+
+    _FILTER_OPS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        ">": operator.gt,
+        ">=": operator.ge,
+        "<": operator.lt,
+        "<=": operator.le,
+    }
+
+    def _compile_filters(self, filters: List[Dict[str, Any]]):
+        """
+        Compile the filter list once into a list of predicate closures,
+        so the per-node work is one call per filter instead of
+        re-interpreting each filter dict for every node.
+        """
+        predicates = []
+
         for filter_cond in filters:
             field = filter_cond.get("field")
-            operator = filter_cond.get("operator")
+            op_name = filter_cond.get("operator")
             value = filter_cond.get("value")
-            
-            # Get field value from node
-            if field in node.attributes:
-                node_value = node.attributes[field]
-            elif hasattr(node, field):
-                node_value = getattr(node, field)
+
+            if op_name == "contains":
+                needle = value.lower()
+
+                def predicate(node, field=field, needle=needle):
+                    if field in node.attributes:
+                        node_value = node.attributes[field]
+                    elif hasattr(node, field):
+                        node_value = getattr(node, field)
+                    else:
+                        return False
+                    return needle in str(node_value).lower()
+
+            elif op_name in self._FILTER_OPS:
+                op = self._FILTER_OPS[op_name]
+
+                def predicate(node, field=field, op=op, value=value):
+                    if field in node.attributes:
+                        node_value = node.attributes[field]
+                    elif hasattr(node, field):
+                        node_value = getattr(node, field)
+                    else:
+                        return False
+                    return op(node_value, value)
+
             else:
-                return False
-            
-            # Apply operator
-            if operator == "==":
-                if node_value != value:
-                    return False
-            elif operator == "!=":
-                if node_value == value:
-                    return False
-            elif operator == ">":
-                if not (node_value > value):
-                    return False
-            elif operator == ">=":
-                if not (node_value >= value):
-                    return False
-            elif operator == "<":
-                if not (node_value < value):
-                    return False
-            elif operator == "<=":
-                if not (node_value <= value):
-                    return False
-            elif operator == "contains":
-                if value.lower() not in str(node_value).lower():
+                # Unknown operator: only the field's presence is required
+                def predicate(node, field=field):
+                    return field in node.attributes or hasattr(node, field)
+
+            predicates.append(predicate)
+
+        def matches(node: PaperNode) -> bool:
+            for predicate in predicates:
+                if not predicate(node):
                     return False
-        
-        return True
+            return True
+
+        return matches
     
     def compute_shortest_path(
         self,
@@ -383,20 +582,77 @@ class GraphBuilder:
     ) -> List[str]:
         """
         Compute shortest path between two papers
-        
+
         Returns:
             List of paper IDs forming the path
         """
-        # Build NetworkX graph
-        G = nx.DiGraph()
-        for edge in graph.edges:
-            G.add_edge(edge.from_paper, edge.to_paper)
-        
-        try:
-            path = nx.shortest_path(G, source_id, target_id)
-            return path
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
+        indptr, indices, rindptr, rindices, id_to_idx, node_ids = self._graph_csr(graph)
+
+        src = id_to_idx.get(source_id)
+        dst = id_to_idx.get(target_id)
+        if src is None or dst is None:
             return []
+        if src == dst:
+            return [source_id]
+
+        prev, succ, meet = _bfs_bidirectional_csr(indptr, indices, rindptr, rindices, src, dst)
+        if meet == -1:
+            return []
+
+        # Reconstruct: walk prev back to the source, then succ on to the target
+        path_idx = [meet]
+        while path_idx[-1] != src:
+            path_idx.append(int(prev[path_idx[-1]]))
+        path_idx.reverse()
+        while path_idx[-1] != dst:
+            path_idx.append(int(succ[path_idx[-1]]))
+        return [node_ids[i] for i in path_idx]
+
+    def _graph_csr(self, graph: ResearchGraph):
+        """
+        Build (and cache on the graph) forward + reverse CSR adjacency
+        arrays for BFS. Rebuilt lazily whenever the graph's node/edge
+        counts or updated_at stamp change.
+        """
+        stamp = (len(graph.nodes), len(graph.edges), graph.updated_at)
+        cached = getattr(graph, "_csr_cache", None)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        node_ids = [node.id for node in graph.nodes]
+        id_to_idx = {node_id: i for i, node_id in enumerate(node_ids)}
+        n = len(node_ids)
+
+        pairs = []
+        counts = np.zeros(n + 1, dtype=np.int64)
+        for edge in graph.edges:
+            u = id_to_idx.get(edge.from_paper)
+            v = id_to_idx.get(edge.to_paper)
+            if u is not None and v is not None:
+                pairs.append((u, v))
+                counts[u + 1] += 1
+
+        indptr = np.cumsum(counts)
+        indices = np.empty(len(pairs), dtype=np.int64)
+        fill = indptr[:-1].copy()
+        for u, v in pairs:
+            indices[fill[u]] = v
+            fill[u] += 1
+
+        # Reverse adjacency (who cites me) for the backward search frontier
+        rcounts = np.zeros(n + 1, dtype=np.int64)
+        for _, v in pairs:
+            rcounts[v + 1] += 1
+        rindptr = np.cumsum(rcounts)
+        rindices = np.empty(len(pairs), dtype=np.int64)
+        rfill = rindptr[:-1].copy()
+        for u, v in pairs:
+            rindices[rfill[v]] = u
+            rfill[v] += 1
+
+        result = (indptr, indices, rindptr, rindices, id_to_idx, node_ids)
+        graph._csr_cache = (stamp, result)
+        return result
     
     def apply_visual_encoding(
         self,
@@ -417,76 +673,76 @@ class GraphBuilder:
         Returns:
             Modified graph with visual encodings
         """
-        # Color encoding
-        if color_by:
-            color_map = self._generate_color_map(graph, color_by)
-            for node in graph.nodes:
+        # Build the requested maps up front, then apply all three encodings
+        # in one pass over the nodes instead of one traversal per encoding
+        color_map = self._generate_color_map(graph, color_by) if color_by else None
+        size_map = self._generate_size_map(graph, size_by) if size_by else None
+        shape_map = self._generate_shape_map(graph, shape_by) if shape_by else None
+
+        if color_map is None and size_map is None and shape_map is None:
+            return graph
+
+        for node in graph.nodes:
+            visual = node.visual
+            if color_map is not None:
                 value = node.attributes.get(color_by)
                 if value and value in color_map:
-                    node.visual["color"] = color_map[value]
-        
-        # Size encoding
-        if size_by:
-            sizes = self._generate_size_map(graph, size_by)
-            for i, node in enumerate(graph.nodes):
-                node.visual["size"] = sizes.get(node.id, 20)
-        
-        # Shape encoding
-        if shape_by:
-            shape_map = self._generate_shape_map(graph, shape_by)
-            for node in graph.nodes:
+                    visual["color"] = color_map[value]
+            if size_map is not None:
+                visual["size"] = size_map.get(node.id, 20)
+            if shape_map is not None:
                 value = node.attributes.get(shape_by)
                 if value and value in shape_map:
-                    node.visual["shape"] = shape_map[value]
-        
+                    visual["shape"] = shape_map[value]
+
         return graph
     
     def _generate_color_map(self, graph: ResearchGraph, attribute: str) -> Dict[str, str]:
         """Generate color mapping for categorical attribute"""
-        # Collect unique values
-        values = set()
+        # Collect unique values in first-seen order; node order is stable
+        # for a given graph, so this stays deterministic without a sort
+        seen = {}
         for node in graph.nodes:
             value = node.attributes.get(attribute)
             if value:
-                values.add(value)
-        
+                seen[value] = None
+
         # Assign colors
         colors = [
             "#FF6B6B", "#4ECDC4", "#95E1D3", "#F38181",
             "#45B7D1", "#FFA07A", "#98D8C8", "#F7DC6F"
         ]
-        
+
         color_map = {}
-        for i, value in enumerate(sorted(values)):
+        for i, value in enumerate(seen):
             color_map[value] = colors[i % len(colors)]
-        
+
         return color_map
     
     def _generate_size_map(self, graph: ResearchGraph, attribute: str) -> Dict[str, float]:
         """Generate size mapping for numeric attribute"""
-        # Collect values
-        values = {}
+        # Collect values once, then normalize to [10, 50] in a single
+        # vectorized pass instead of per-node Python arithmetic
+        node_ids = []
+        raw = []
         for node in graph.nodes:
             value = node.attributes.get(attribute)
             if value is not None and isinstance(value, (int, float)):
-                values[node.id] = float(value)
-        
-        if not values:
+                node_ids.append(node.id)
+                raw.append(float(value))
+
+        if not node_ids:
             return {}
-        
-        # Normalize to size range [10, 50]
-        min_val = min(values.values())
-        max_val = max(values.values())
-        
+
+        values = np.array(raw, dtype=np.float64)
+        min_val = values.min()
+        max_val = values.max()
+
         if max_val == min_val:
-            return {node_id: 20 for node_id in values.keys()}
-        
-        size_map = {}
-        for node_id, value in values.items():
-            normalized = (value - min_val) / (max_val - min_val)
-            size_map[node_id] = 10 + normalized * 40
-        
-        return size_map
+            return {node_id: 20 for node_id in node_ids}
+
+        sizes = 10.0 + (values - min_val) * (40.0 / (max_val - min_val))
+        return dict(zip(node_ids, sizes.tolist()))
     
     def _generate_shape_map(self, graph: ResearchGraph, attribute: str) -> Dict[str, str]:
         """Generate shape mapping for categorical attribute"""
@@ -498,18 +754,18 @@ class GraphBuilder:
             "default": "ellipse"
         }
         
-        # Collect unique values
-        values = set()
+        # Collect unique values in first-seen order (see _generate_color_map)
+        seen = {}
         for node in graph.nodes:
             value = node.attributes.get(attribute)
             if value:
-                values.add(value)
-        
+                seen[value] = None
+
         # Assign shapes
         shape_map = {}
         available_shapes = ["ellipse", "round-rectangle", "triangle", "diamond", "pentagon"]
-        
-        for i, value in enumerate(sorted(values)):
+
+        for i, value in enumerate(seen):
             shape_map[value] = available_shapes[i % len(available_shapes)]
-        
+
         return shape_map
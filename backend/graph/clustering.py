@@ -3,11 +3,20 @@ Clustering algorithms for grouping papers by similarity
 """
 from typing import List, Dict, Any, Optional
 import networkx as nx
-from sklearn.cluster import KMeans, AgglomerativeClustering
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.cluster import KMeans, MiniBatchKMeans, AgglomerativeClustering
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import (
+    HashingVectorizer,
+    TfidfTransformer,
+    TfidfVectorizer,
+)
+from sklearn.preprocessing import normalize
 import numpy as np
+from scipy import sparse
 from graph.models import ResearchGraph, PaperNode
+from logging_setup import get_logger
+
+logger = get_logger("clustering")
 
 
 class PaperClusterer:
@@ -16,6 +25,7 @@ class PaperClusterer:
     def __init__(self):
         self.vectorizer = None
         self.embeddings = None
+        self._feature_names = None
     
     def cluster_by_content(
         self,
@@ -34,7 +44,7 @@ class PaperClusterer:
         Returns:
             Graph with cluster assignments added to node attributes
         """
-        print(f"🔍 Clustering {len(graph.nodes)} papers by content...")
+        logger.info("🔍 Clustering %d papers by content...", len(graph.nodes))
         
         # Prepare texts for clustering
         texts = []
@@ -46,7 +56,7 @@ class PaperClusterer:
             node_ids.append(node.id)
         
         if len(texts) < n_clusters:
-            print(f"⚠️  Too few papers ({len(texts)}) for {n_clusters} clusters")
+            logger.warning("⚠️  Too few papers (%d) for %d clusters", len(texts), n_clusters)
             n_clusters = max(2, len(texts) // 2)
         
         # Create TF-IDF embeddings
@@ -57,27 +67,30 @@ class PaperClusterer:
         )
         
         self.embeddings = self.vectorizer.fit_transform(texts)
+        # Snapshot the vocabulary once; get_feature_names_out() rebuilds
+        # an object array of 500 strings on every call otherwise
+        self._feature_names = self.vectorizer.get_feature_names_out()
         
-        # Cluster
+        # Cluster — KMeans has a sparse code path, so the TF-IDF matrix
+        # stays CSR; only hierarchical needs the dense copy
         if method == "kmeans":
             clusterer = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+            features = self.embeddings
         else:  # hierarchical
             clusterer = AgglomerativeClustering(n_clusters=n_clusters)
+            features = self.embeddings.toarray()
+
+        labels = clusterer.fit_predict(features)
         
-        labels = clusterer.fit_predict(self.embeddings.toarray())
-        
-        # Assign cluster IDs to nodes
-        cluster_assignments = {}
-        for node_id, cluster_id in zip(node_ids, labels):
-            cluster_assignments[node_id] = int(cluster_id)
-        
-        # Update graph nodes
-        cluster_sizes = {}
-        for node in graph.nodes:
-            cluster_id = cluster_assignments.get(node.id, 0)
+        # Assign cluster IDs to nodes (labels follow graph.nodes order)
+        # and tally sizes in one vectorized bincount pass
+        for node, label in zip(graph.nodes, labels):
+            cluster_id = int(label)
             node.cluster_id = cluster_id
             node.attributes["cluster_id"] = cluster_id
-            cluster_sizes[cluster_id] = cluster_sizes.get(cluster_id, 0) + 1
+
+        counts = np.bincount(np.asarray(labels, dtype=np.int64))
+        cluster_sizes = {int(i): int(c) for i, c in enumerate(counts) if c}
         
         # Add cluster metadata to graph
         graph.metadata["clusters"] = {
@@ -86,9 +99,9 @@ class PaperClusterer:
             "cluster_sizes": cluster_sizes
         }
         
-        print(f"✅ Created {n_clusters} clusters:")
+        logger.info("✅ Created %d clusters", n_clusters)
         for cluster_id, size in sorted(cluster_sizes.items()):
-            print(f"   Cluster {cluster_id}: {size} papers")
+            logger.debug("Cluster %d: %d papers", cluster_id, size)
         
         return graph
     
@@ -109,7 +122,7 @@ class PaperClusterer:
         Returns:
             Graph with cluster assignments
         """
-        print(f"🔍 Clustering papers by citation network ({method})...")
+        logger.info("🔍 Clustering papers by citation network (%s)...", method)
         
         # Build NetworkX graph
         G = nx.DiGraph()
@@ -125,14 +138,28 @@ class PaperClusterer:
         # Convert to undirected for community detection
         G_undirected = G.to_undirected()
         
-        # Detect communities
+        # Detect communities. Louvain tries NetworKit's parallel PLM first
+        # (orders of magnitude faster on large graphs), then the pure-Python
+        # python-louvain, then label propagation — whichever is installed.
         if method == "louvain":
             try:
-                import community.community_louvain as community_louvain
-                partition = community_louvain.best_partition(G_undirected)
+                import networkit as nk
+                node_list = list(G_undirected.nodes())
+                index = {node_id: i for i, node_id in enumerate(node_list)}
+                nk_graph = nk.Graph(len(node_list), weighted=False, directed=False)
+                for u, v in G_undirected.edges():
+                    nk_graph.addEdge(index[u], index[v])
+                plm = nk.community.PLM(nk_graph, refine=True)
+                plm.run()
+                nk_partition = plm.getPartition()
+                partition = {node_id: nk_partition[index[node_id]] for node_id in node_list}
             except ImportError:
-                print("⚠️  python-louvain not installed, falling back to label propagation")
-                method = "label_propagation"
+                try:
+                    import community.community_louvain as community_louvain
+                    partition = community_louvain.best_partition(G_undirected)
+                except ImportError:
+                    logger.warning("⚠️  python-louvain not installed, falling back to label propagation")
+                    method = "label_propagation"
         
         if method == "label_propagation":
             # Use NetworkX's label propagation
@@ -142,13 +169,18 @@ class PaperClusterer:
                 for node_id in community:
                     partition[node_id] = cluster_id
         
-        # Assign cluster IDs to nodes
-        cluster_sizes = {}
-        for node in graph.nodes:
-            cluster_id = partition.get(node.id, 0)
+        # Assign cluster IDs to nodes; sizes come from one bincount over
+        # the label array instead of per-node dict get/increment
+        labels_arr = np.fromiter(
+            (partition.get(node.id, 0) for node in graph.nodes),
+            dtype=np.int64, count=len(graph.nodes),
+        )
+        for node, cluster_id in zip(graph.nodes, labels_arr.tolist()):
             node.cluster_id = cluster_id
             node.attributes["cluster_id"] = cluster_id
-            cluster_sizes[cluster_id] = cluster_sizes.get(cluster_id, 0) + 1
+
+        counts = np.bincount(labels_arr) if len(labels_arr) else np.zeros(0, dtype=np.int64)
+        cluster_sizes = {int(i): int(c) for i, c in enumerate(counts) if c}
         
         # Add cluster metadata
         graph.metadata["clusters"] = {
@@ -157,9 +189,9 @@ class PaperClusterer:
             "cluster_sizes": cluster_sizes
         }
         
-        print(f"✅ Detected {len(cluster_sizes)} clusters:")
+        logger.info("✅ Detected %d clusters", len(cluster_sizes))
         for cluster_id, size in sorted(cluster_sizes.items()):
-            print(f"   Cluster {cluster_id}: {size} papers")
+            logger.debug("Cluster %d: %d papers", cluster_id, size)
         
         return graph
     
@@ -182,7 +214,7 @@ class PaperClusterer:
         Returns:
             Graph with cluster assignments
         """
-        print(f"🔍 Hybrid clustering (content: {content_weight}, citations: {citation_weight})...")
+        logger.info("🔍 Hybrid clustering (content: %s, citations: %s)...", content_weight, citation_weight)
         
         # Get content embeddings
         texts = []
@@ -195,63 +227,91 @@ class PaperClusterer:
             node_ids.append(node.id)
             node_id_to_idx[node.id] = idx
         
-        # TF-IDF embeddings
-        vectorizer = TfidfVectorizer(max_features=500, stop_words='english')
-        content_matrix = vectorizer.fit_transform(texts).toarray()
+        # Hashed TF-IDF (kept sparse; cosine similarity below is just the
+        # gram matrix of the L2-normalized rows). Hashing skips the
+        # vocabulary-building pass — fine here because, unlike
+        # cluster_by_content, nothing downstream needs term names
+        hasher = HashingVectorizer(
+            n_features=16384,
+            stop_words='english',
+            alternate_sign=False,
+            norm=None,
+        )
+        content_matrix = TfidfTransformer(sublinear_tf=True).fit_transform(
+            hasher.transform(texts)
+        )
         
-        # Build citation similarity matrix
         n = len(node_ids)
-        citation_matrix = np.zeros((n, n))
-        
-        # Create adjacency matrix
-        G = nx.DiGraph()
-        for node in graph.nodes:
-            G.add_node(node.id)
-        for edge in graph.edges:
-            G.add_edge(edge.from_paper, edge.to_paper)
-        
-        # Compute citation-based similarity (using common neighbors)
-        for i, node_id_i in enumerate(node_ids):
-            for j, node_id_j in enumerate(node_ids):
-                if i != j:
-                    # Count common neighbors (both in and out)
-                    neighbors_i = set(G.predecessors(node_id_i)) | set(G.successors(node_id_i))
-                    neighbors_j = set(G.predecessors(node_id_j)) | set(G.successors(node_id_j))
-                    
-                    if neighbors_i or neighbors_j:
-                        jaccard = len(neighbors_i & neighbors_j) / len(neighbors_i | neighbors_j)
-                        citation_matrix[i, j] = jaccard
-        
-        # Normalize content similarity
-        content_sim = cosine_similarity(content_matrix)
-        
-        # Combine similarities
-        combined_sim = content_weight * content_sim + citation_weight * citation_matrix
-        
-        # Convert similarity to distance
-        distance_matrix = 1 - combined_sim
-        
-        # Cluster using hierarchical clustering
         if n < n_clusters:
             n_clusters = max(2, n // 2)
-        
-        clusterer = AgglomerativeClustering(
-            n_clusters=n_clusters,
-            metric='precomputed',
-            linkage='average'
-        )
-        labels = clusterer.fit_predict(distance_matrix)
-        
-        # Assign clusters
-        cluster_sizes = {}
-        for node_id, label in zip(node_ids, labels):
+
+        # Symmetrized binary adjacency from the edge list
+        rows = []
+        cols = []
+        for edge in graph.edges:
+            u = node_id_to_idx.get(edge.from_paper)
+            v = node_id_to_idx.get(edge.to_paper)
+            if u is not None and v is not None and u != v:
+                rows.append(u)
+                cols.append(v)
+                rows.append(v)
+                cols.append(u)
+
+        adjacency = None
+        if rows:
+            adjacency = sparse.csr_matrix(
+                (np.ones(len(rows)), (rows, cols)), shape=(n, n)
+            )
+            adjacency.data[:] = 1.0  # binarize duplicate edges
+
+        if n > 1000:
+            # Large graphs: the n×n similarity/distance matrices below are
+            # O(n²) memory, so cluster on stacked features instead
+            labels = self._hybrid_labels_large(
+                content_matrix, adjacency, n_clusters,
+                content_weight, citation_weight,
+            )
+        else:
+            # Citation similarity: Jaccard over shared neighbors (in and
+            # out) as one sparse matrix product. For symmetric binary A,
+            # (A @ A)[i, j] is |N(i) ∩ N(j)| and degrees give union sizes.
+            citation_matrix = np.zeros((n, n))
+            if adjacency is not None:
+                intersection = (adjacency @ adjacency).toarray()
+                degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+                union = degrees[:, None] + degrees[None, :] - intersection
+                np.divide(intersection, union, out=citation_matrix, where=union > 0)
+                np.fill_diagonal(citation_matrix, 0.0)
+
+            # Cosine similarity on the sparse rows, then fuse the weighted
+            # combine and similarity-to-distance steps into one preallocated
+            # float32 buffer instead of materializing four n×n float64 arrays
+            normalized = normalize(content_matrix, norm='l2', copy=False)
+            content_sim = (normalized @ normalized.T).toarray()
+
+            distance_matrix = np.empty((n, n), dtype=np.float32)
+            np.multiply(content_sim, content_weight, out=distance_matrix)
+            citation_matrix *= citation_weight
+            distance_matrix += citation_matrix
+            np.subtract(1.0, distance_matrix, out=distance_matrix)
+
+            # Cluster using hierarchical clustering
+            clusterer = AgglomerativeClustering(
+                n_clusters=n_clusters,
+                metric='precomputed',
+                linkage='average'
+            )
+            labels = clusterer.fit_predict(distance_matrix)
+        
+        # Assign clusters — labels follow graph.nodes iteration order, so
+        # write them back positionally; sizes come from one bincount
+        for node, label in zip(graph.nodes, labels):
             cluster_id = int(label)
-            for node in graph.nodes:
-                if node.id == node_id:
-                    node.cluster_id = cluster_id
-                    node.attributes["cluster_id"] = cluster_id
-                    break
-            cluster_sizes[cluster_id] = cluster_sizes.get(cluster_id, 0) + 1
+            node.cluster_id = cluster_id
+            node.attributes["cluster_id"] = cluster_id
+
+        counts = np.bincount(np.asarray(labels, dtype=np.int64))
+        cluster_sizes = {int(i): int(c) for i, c in enumerate(counts) if c}
         
         graph.metadata["clusters"] = {
             "method": "hybrid",
@@ -261,12 +321,44 @@ class PaperClusterer:
             "cluster_sizes": cluster_sizes
         }
         
-        print(f"✅ Created {n_clusters} hybrid clusters:")
+        logger.info("✅ Created %d hybrid clusters", n_clusters)
         for cluster_id, size in sorted(cluster_sizes.items()):
-            print(f"   Cluster {cluster_id}: {size} papers")
+            logger.debug("Cluster %d: %d papers", cluster_id, size)
         
         return graph
-    
+
+    def _hybrid_labels_large(
+        self,
+        content_matrix,
+        adjacency,
+        n_clusters: int,
+        content_weight: float,
+        citation_weight: float,
+    ) -> np.ndarray:
+        """
+        Scalable hybrid path for large graphs: stack the L2-normalized
+        sparse content block with a low-rank SVD embedding of the citation
+        adjacency, each scaled by the square root of its weight (cosine on
+        the stack then equals the weighted sum of per-block cosines), and
+        run MiniBatchKMeans — no pairwise matrix is ever materialized.
+        """
+        blocks = [normalize(content_matrix) * np.sqrt(content_weight)]
+
+        if adjacency is not None:
+            n_components = min(32, adjacency.shape[0] - 1)
+            if n_components >= 2:
+                svd = TruncatedSVD(n_components=n_components, random_state=42)
+                citation_embedding = normalize(svd.fit_transform(adjacency))
+                blocks.append(sparse.csr_matrix(
+                    citation_embedding * np.sqrt(citation_weight)
+                ))
+
+        features = sparse.hstack(blocks, format="csr")
+        clusterer = MiniBatchKMeans(
+            n_clusters=n_clusters, batch_size=256, random_state=42, n_init=3
+        )
+        return clusterer.fit_predict(features)
+
     def get_cluster_summaries(
         self,
         graph: ResearchGraph,
@@ -283,7 +375,7 @@ class PaperClusterer:
             Dictionary mapping cluster ID to summary info
         """
         if self.vectorizer is None or self.embeddings is None:
-            print("⚠️  No clustering performed yet")
+            logger.warning("⚠️  No clustering performed yet")
             return {}
         
         summaries = {}
@@ -296,20 +388,36 @@ class PaperClusterer:
                 clusters[cluster_id] = []
             clusters[cluster_id].append(node)
         
-        # Get feature names from vectorizer
-        feature_names = self.vectorizer.get_feature_names_out()
-        
+        # Feature names cached at fit time (lazily recovered if the
+        # clusterer was restored without one)
+        feature_names = self._feature_names
+        if feature_names is None:
+            feature_names = self._feature_names = self.vectorizer.get_feature_names_out()
+
+        # Embedding rows follow graph.nodes order — build the id -> row
+        # map once instead of rescanning the node list per cluster
+        id_to_idx = {node.id: i for i, node in enumerate(graph.nodes)}
+
+        # All cluster centroids in one sparse product: a membership matrix
+        # with one 1/|cluster| entry per paper, times the embeddings
+        cluster_items = list(clusters.items())
+        rows, cols, data = [], [], []
+        for row, (cluster_id, nodes) in enumerate(cluster_items):
+            weight = 1.0 / len(nodes)
+            for node in nodes:
+                rows.append(row)
+                cols.append(id_to_idx[node.id])
+                data.append(weight)
+        membership = sparse.csr_matrix(
+            (data, (rows, cols)),
+            shape=(len(cluster_items), self.embeddings.shape[0]),
+        )
+        centroids = np.asarray((membership @ self.embeddings).toarray())
+
         # Summarize each cluster
-        for cluster_id, nodes in clusters.items():
-            # Get node indices
-            node_indices = []
-            for i, node_id in enumerate([n.id for n in graph.nodes]):
-                if any(n.id == node_id for n in nodes):
-                    node_indices.append(i)
-            
-            # Get average TF-IDF vector for cluster
-            cluster_vector = self.embeddings[node_indices].mean(axis=0).A1
-            
+        for row, (cluster_id, nodes) in enumerate(cluster_items):
+            cluster_vector = centroids[row]
+
             # Get top terms
             top_indices = cluster_vector.argsort()[-top_terms:][::-1]
             top_terms_list = [feature_names[i] for i in top_indices]
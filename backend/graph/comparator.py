@@ -1,10 +1,14 @@
 """
 Paper Comparison Service - Analyze differences between papers
 """
+import concurrent.futures
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from graph.models import ResearchGraph, PaperNode
 from extractors.llm_client import get_llm_client
+from logging_setup import get_logger
+
+logger = get_logger("compare")
 
 
 @dataclass
@@ -47,9 +51,9 @@ class PaperComparator:
         Returns:
             PaperComparison object
         """
-        print(f"🔍 Comparing papers:")
-        print(f"   1. {paper1.title[:60]}...")
-        print(f"   2. {paper2.title[:60]}...")
+        # %.60s keeps the title slices lazy — nothing is formatted
+        # unless DEBUG is actually emitted
+        logger.debug("🔍 Comparing papers: %.60s... vs %.60s...", paper1.title, paper2.title)
         
         # Create comparison prompt
         prompt = f"""
@@ -106,15 +110,17 @@ Return ONLY the JSON, no other text.
                 method_diff=comparison_data.get("method_diff")
             )
             
-            print(f"✅ Comparison complete:")
-            print(f"   - Relationship: {comparison.relationship_type}")
-            print(f"   - Similarities: {len(comparison.similarities)}")
-            print(f"   - Differences: {len(comparison.differences)}")
+            logger.debug(
+                "✅ Comparison complete: %s (%d similarities, %d differences)",
+                comparison.relationship_type,
+                len(comparison.similarities),
+                len(comparison.differences),
+            )
             
             return comparison
             
         except Exception as e:
-            print(f"❌ Error comparing papers: {e}")
+            logger.error("❌ Error comparing papers: %s", e)
             # Return default comparison
             return PaperComparison(
                 paper1_id=paper1.id,
@@ -148,31 +154,38 @@ Return ONLY the JSON, no other text.
         ]
         
         if len(cluster_papers) < 2:
-            print(f"⚠️  Cluster {cluster_id} has fewer than 2 papers")
+            logger.info("⚠️  Cluster %s has fewer than 2 papers", cluster_id)
             return []
         
-        print(f"🔍 Comparing {len(cluster_papers)} papers in cluster {cluster_id}...")
+        logger.info("🔍 Comparing %d papers in cluster %s...", len(cluster_papers), cluster_id)
         
-        comparisons = []
-        
-        # Compare each paper with others (limit to avoid too many comparisons)
+        # Collect the pairs first (limit to avoid too many comparisons)
         max_comparisons = min(20, len(cluster_papers) * 2)
-        comparison_count = 0
-        
+        pairs = []
         for i, paper1 in enumerate(cluster_papers):
-            if comparison_count >= max_comparisons:
-                break
-            
-            # Compare with next few papers
             for paper2 in cluster_papers[i+1:i+4]:
-                if comparison_count >= max_comparisons:
+                pairs.append((paper1, paper2))
+                if len(pairs) >= max_comparisons:
                     break
-                
-                comparison = self.compare_papers(paper1, paper2, detailed=False)
-                comparisons.append(comparison)
-                comparison_count += 1
-        
-        print(f"✅ Completed {len(comparisons)} comparisons")
+            if len(pairs) >= max_comparisons:
+                break
+
+        # Each comparison is an independent LLM round-trip, so issue them
+        # concurrently; wall time drops from the sum of RTTs to roughly
+        # the slowest batch. Results keep the original pair order.
+        results: List[Optional[PaperComparison]] = [None] * len(pairs)
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(8, len(pairs))
+        ) as executor:
+            futures = {
+                executor.submit(self.compare_papers, paper1, paper2, False): idx
+                for idx, (paper1, paper2) in enumerate(pairs)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                results[futures[future]] = future.result()
+
+        comparisons = [comparison for comparison in results if comparison is not None]
+        logger.info("✅ Completed %d comparisons", len(comparisons))
         return comparisons
     
     def add_edge_labels_to_graph(
@@ -190,38 +203,38 @@ Return ONLY the JSON, no other text.
         Returns:
             Updated graph
         """
-        # Find edge between the two papers
-        for edge in graph.edges:
-            if ((edge.from_paper == comparison.paper1_id and edge.to_paper == comparison.paper2_id) or
-                (edge.from_paper == comparison.paper2_id and edge.to_paper == comparison.paper1_id)):
-                
-                # Update edge with comparison data
-                edge.contribution_type = comparison.relationship_type
-                edge.context = f"Similarities: {'; '.join(comparison.similarities[:2])}. Differences: {'; '.join(comparison.differences[:2])}"
-                edge.attributes["comparison"] = {
-                    "similarities": comparison.similarities,
-                    "differences": comparison.differences,
-                    "architecture_diff": comparison.architecture_diff,
-                    "contribution_diff": comparison.contribution_diff,
-                    "method_diff": comparison.method_diff
-                }
-                
-                # Update visual based on relationship type
-                if comparison.relationship_type == "extends":
-                    edge.visual["color"] = "#10b981"  # green
-                    edge.visual["thickness"] = 3
-                elif comparison.relationship_type == "compares":
-                    edge.visual["color"] = "#f59e0b"  # orange
-                    edge.visual["thickness"] = 2
-                elif comparison.relationship_type == "builds_on":
-                    edge.visual["color"] = "#3b82f6"  # blue
-                    edge.visual["thickness"] = 3
-                elif comparison.relationship_type == "similar":
-                    edge.visual["color"] = "#8b5cf6"  # purple
-                    edge.visual["thickness"] = 2
-                
-                break
-        
+        # Find edge between the two papers — O(1) through the graph's
+        # (from, to) edge index, checked in both directions
+        edge = (graph.get_edge(comparison.paper1_id, comparison.paper2_id)
+                or graph.get_edge(comparison.paper2_id, comparison.paper1_id))
+        if edge is None:
+            return graph
+
+        # Update edge with comparison data
+        edge.contribution_type = comparison.relationship_type
+        edge.context = f"Similarities: {'; '.join(comparison.similarities[:2])}. Differences: {'; '.join(comparison.differences[:2])}"
+        edge.attributes["comparison"] = {
+            "similarities": comparison.similarities,
+            "differences": comparison.differences,
+            "architecture_diff": comparison.architecture_diff,
+            "contribution_diff": comparison.contribution_diff,
+            "method_diff": comparison.method_diff
+        }
+
+        # Update visual based on relationship type
+        if comparison.relationship_type == "extends":
+            edge.visual["color"] = "#10b981"  # green
+            edge.visual["thickness"] = 3
+        elif comparison.relationship_type == "compares":
+            edge.visual["color"] = "#f59e0b"  # orange
+            edge.visual["thickness"] = 2
+        elif comparison.relationship_type == "builds_on":
+            edge.visual["color"] = "#3b82f6"  # blue
+            edge.visual["thickness"] = 3
+        elif comparison.relationship_type == "similar":
+            edge.visual["color"] = "#8b5cf6"  # purple
+            edge.visual["thickness"] = 2
+
         return graph
 
 
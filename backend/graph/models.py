@@ -2,12 +2,34 @@
 Data models for the Citation Graph Visualizer
 """
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields as dataclass_fields
 from datetime import datetime
 import uuid
 
 
-@dataclass
+def _shallow_dict(obj) -> Dict[str, Any]:
+    """
+    Serialize a dataclass to a dict without asdict()'s recursive deep copy —
+    serialization only reads the values, so copying every nested container
+    per node/edge on every response is pure overhead. Field names are
+    computed once per class.
+    """
+    cls = type(obj)
+    names = cls.__dict__.get("_field_names")
+    if names is None:
+        # Underscore fields are internal caches, not part of the payload
+        names = tuple(f.name for f in dataclass_fields(cls) if not f.name.startswith("_"))
+        cls._field_names = names
+    return {name: getattr(obj, name) for name in names}
+
+
+def _from_dict(cls, data: Dict[str, Any]):
+    """Rebuild a dataclass from a to_dict() payload, ignoring unknown keys"""
+    known = {f.name for f in dataclass_fields(cls) if not f.name.startswith("_")}
+    return cls(**{key: value for key, value in data.items() if key in known})
+
+
+@dataclass(slots=True)
 class PaperNode:
     """Represents a paper as a node in the citation graph"""
     # Identity
@@ -45,13 +67,23 @@ class PaperNode:
         "border_color": "#2C3E50",
         "border_width": 2
     })
-    
+
+    # Internal caches (slots must declare them): truncated prompt content
+    # keyed by budget, and the content fingerprint for edge-pair dedup
+    _content_cache: Optional[Dict[int, str]] = field(default=None, repr=False, compare=False)
+    _content_fp: Optional[str] = field(default=None, repr=False, compare=False)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self)
+        return _shallow_dict(self)
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PaperNode":
+        """Rebuild a node from its to_dict() payload"""
+        return _from_dict(cls, data)
 
-@dataclass
+
+@dataclass(slots=True)
 class CitationEdge:
     """Represents a citation relationship as an edge in the graph"""
     # Identity
@@ -72,6 +104,9 @@ class CitationEdge:
     # Delta (what changed)
     delta_description: Optional[str] = None
     novelty_score: Optional[float] = None
+
+    # Extracted attributes (dynamic), e.g. comparison payloads
+    attributes: Dict[str, Any] = field(default_factory=dict)
     
     # Visual encoding
     visual: Dict[str, Any] = field(default_factory=lambda: {
@@ -83,7 +118,12 @@ class CitationEdge:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self)
+        return _shallow_dict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CitationEdge":
+        """Rebuild an edge from its to_dict() payload"""
+        return _from_dict(cls, data)
 
 
 @dataclass
@@ -94,7 +134,8 @@ class ResearchGraph:
     name: str = "Untitled Graph"
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    
+    version: int = 0  # bumped on every mutation; keys the to_dict() cache
+
     # Structure
     nodes: List[PaperNode] = field(default_factory=list)
     edges: List[CitationEdge] = field(default_factory=list)
@@ -115,12 +156,21 @@ class ResearchGraph:
     clusters: Optional[List[Dict[str, Any]]] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary with serialized nodes and edges"""
-        return {
+        """
+        Convert to dictionary with serialized nodes and edges.
+        Memoized per version, so repeated serialization of an unchanged
+        graph (dashboard polls, re-visualizations) is a cache lookup.
+        """
+        cached = getattr(self, "_dict_cache", None)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        data = {
             "id": self.id,
             "name": self.name,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
+            "version": self.version,
             "nodes": [node.to_dict() for node in self.nodes],
             "edges": [edge.to_dict() for edge in self.edges],
             "metadata": self.metadata,
@@ -128,27 +178,81 @@ class ResearchGraph:
             "layout": self.layout,
             "clusters": self.clusters
         }
-    
+        self._dict_cache = (self.version, data)
+        return data
+
+    def touch(self) -> None:
+        """Mark the graph as mutated (bumps version and updated_at)"""
+        self.version += 1
+        self.updated_at = datetime.now().isoformat()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ResearchGraph":
+        """Rebuild a graph (including nodes and edges) from its to_dict() payload"""
+        data = dict(data)
+        data["nodes"] = [PaperNode.from_dict(node) for node in data.get("nodes", [])]
+        data["edges"] = [CitationEdge.from_dict(edge) for edge in data.get("edges", [])]
+        return _from_dict(cls, data)
+
     def add_node(self, node: PaperNode) -> None:
         """Add a node to the graph"""
         self.nodes.append(node)
-        self.updated_at = datetime.now().isoformat()
+        index = getattr(self, "_node_index", None)
+        if index is not None:
+            index[node.id] = node
+        self.touch()
     
     def add_edge(self, edge: CitationEdge) -> None:
         """Add an edge to the graph"""
         self.edges.append(edge)
-        self.updated_at = datetime.now().isoformat()
+        index = getattr(self, "_edge_index", None)
+        if index is not None:
+            index[(edge.from_paper, edge.to_paper)] = edge
+        id_index = getattr(self, "_edge_id_index", None)
+        if id_index is not None:
+            id_index[edge.id] = edge
+        adjacency = getattr(self, "_adjacency_index", None)
+        if adjacency is not None:
+            adjacency.setdefault(edge.from_paper, []).append(edge)
+            adjacency.setdefault(edge.to_paper, []).append(edge)
+        self.touch()
+
+    def get_edge(self, from_id: str, to_id: str) -> Optional[CitationEdge]:
+        """Get the edge from one paper to another (O(1) via lazy index)"""
+        index = getattr(self, "_edge_index", None)
+        if index is None:
+            index = {(e.from_paper, e.to_paper): e for e in self.edges}
+            self._edge_index = index
+        return index.get((from_id, to_id))
+
+    def get_edge_by_id(self, edge_id: str) -> Optional[CitationEdge]:
+        """Get edge by ID (O(1) via lazy index, kept current by add_edge)"""
+        index = getattr(self, "_edge_id_index", None)
+        if index is None:
+            index = {edge.id: edge for edge in self.edges}
+            self._edge_id_index = index
+        return index.get(edge_id)
     
+    @property
+    def node_index(self) -> Dict[str, PaperNode]:
+        """id -> node map (O(1) lookups via lazy index, kept current by add_node)"""
+        index = getattr(self, "_node_index", None)
+        if index is None:
+            index = {node.id: node for node in self.nodes}
+            self._node_index = index
+        return index
+
     def get_node_by_id(self, node_id: str) -> Optional[PaperNode]:
         """Get node by ID"""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self.node_index.get(node_id)
     
     def get_edges_for_node(self, node_id: str) -> List[CitationEdge]:
-        """Get all edges connected to a node"""
-        return [
-            edge for edge in self.edges
-            if edge.from_paper == node_id or edge.to_paper == node_id
-        ]
+        """Get all edges connected to a node (O(1) via lazy adjacency index)"""
+        adjacency = getattr(self, "_adjacency_index", None)
+        if adjacency is None:
+            adjacency = {}
+            for edge in self.edges:
+                adjacency.setdefault(edge.from_paper, []).append(edge)
+                adjacency.setdefault(edge.to_paper, []).append(edge)
+            self._adjacency_index = adjacency
+        return list(adjacency.get(node_id, []))
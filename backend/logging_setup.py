@@ -0,0 +1,44 @@
+"""
+Logging setup for the Citation Graph Visualizer backend
+
+Log records are pushed onto a queue and written by a background
+QueueListener thread, so hot request paths never block on stdout
+flushes. Use %s-style placeholders (not f-strings) in log calls so
+formatting is skipped when the level is disabled.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+
+_listener = None
+
+
+def setup_logging() -> None:
+    """Configure the shared 'citegraph' logger (idempotent)"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s")
+    )
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger("citegraph")
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a child logger under the 'citegraph' namespace"""
+    return logging.getLogger(f"citegraph.{name}")
@@ -4,9 +4,11 @@ PDF Parser - Extract text and structure from research papers
 import fitz  # PyMuPDF
 from pathlib import Path
 from typing import Optional, List
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 import re
 
+from config import settings
+
 
 @dataclass
 class Section:
@@ -30,18 +32,44 @@ class ParsedPaper:
     sections: List[Section] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
     num_pages: int = 0
+    arxiv_id: Optional[str] = None
+    publication_date: Optional[str] = None
+
+    @property
+    def title_norm(self) -> str:
+        """
+        Lowercased, stripped title — normalized once per paper so matching
+        code doesn't re-allocate the same lowered string in its loops
+        """
+        cached = getattr(self, "_title_norm", None)
+        if cached is None:
+            cached = self.title.lower().strip()
+            self._title_norm = cached
+        return cached
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary (sections included)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ParsedPaper":
+        """Rebuild from a to_dict() payload, e.g. a cached parse"""
+        data = dict(data)
+        data["sections"] = [Section(**s) for s in data.get("sections", [])]
+        return cls(**data)
 
 
 class PaperParser:
     """Extract text and structure from PDF research papers"""
     
-    def parse_pdf(self, pdf_path: str, paper_id: str) -> ParsedPaper:
+    def parse_pdf(self, pdf_path: str, paper_id: str, max_pages: Optional[int] = None) -> ParsedPaper:
         """
         Parse a PDF file and extract structured content
         
         Args:
             pdf_path: Path to PDF file
             paper_id: Unique identifier for the paper
+            max_pages: Page budget (defaults to settings.max_parse_pages, 0 = all)
             
         Returns:
             ParsedPaper object with extracted content
@@ -49,22 +77,42 @@ class PaperParser:
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
-        
-        # Extract full text
-        full_text, num_pages = self._extract_text(pdf_path)
-        
+
+        doc = fitz.open(pdf_path)
+        return self._parse_document(doc, paper_id, source=str(pdf_path), max_pages=max_pages)
+
+    def parse_bytes(self, data: bytes, paper_id: str, max_pages: Optional[int] = None) -> ParsedPaper:
+        """
+        Parse a PDF directly from bytes (e.g. an upload) without touching disk
+
+        Args:
+            data: Raw PDF bytes
+            paper_id: Unique identifier for the paper
+            max_pages: Page budget (defaults to settings.max_parse_pages, 0 = all)
+
+        Returns:
+            ParsedPaper object with extracted content
+        """
+        doc = fitz.open(stream=data, filetype="pdf")
+        return self._parse_document(doc, paper_id, source="<memory>", max_pages=max_pages)
+
+    def _parse_document(self, doc, paper_id: str, source: str, max_pages: Optional[int] = None) -> ParsedPaper:
+        """Extract structured content from an open PyMuPDF document"""
+        # Extract full text (PyMuPDF loads pages lazily, so skipped pages cost nothing)
+        full_text, num_pages = self._extract_text(doc, max_pages=max_pages)
+
         # Extract title (first significant text)
         title = self._extract_title(full_text)
-        
+
         # Extract abstract
         abstract = self._extract_abstract(full_text)
-        
+
         # Extract authors (heuristic)
         authors = self._extract_authors(full_text)
-        
+
         # Extract sections
         sections = self._extract_sections(full_text)
-        
+
         return ParsedPaper(
             paper_id=paper_id,
             title=title,
@@ -73,20 +121,23 @@ class PaperParser:
             full_text=full_text,
             sections=sections,
             num_pages=num_pages,
-            metadata={"source": str(pdf_path)}
+            metadata={"source": source}
         )
-    
-    def _extract_text(self, pdf_path: Path) -> tuple[str, int]:
-        """Extract all text from PDF"""
-        doc = fitz.open(pdf_path)
-        text_parts = []
-        
-        for page in doc:
-            text_parts.append(page.get_text())
-        
+
+    def _extract_text(self, doc, max_pages: Optional[int] = None) -> tuple[str, int]:
+        """Extract text from an open PDF document, up to the page budget"""
+        if max_pages is None:
+            max_pages = settings.max_parse_pages
+
         num_pages = len(doc)
+        last_page = num_pages if max_pages <= 0 else min(num_pages, max_pages)
+
+        text_parts = []
+        for page_number in range(last_page):
+            text_parts.append(doc.load_page(page_number).get_text())
+
         doc.close()
-        
+
         return "\n".join(text_parts), num_pages
     
     def _extract_title(self, text: str) -> str:
@@ -0,0 +1,53 @@
+"""
+SmartScheduler - picks concurrency and batch configuration by workload size
+"""
+import os
+from typing import Dict, Any, Optional
+
+# Tuning tiers, smallest first. Kept in code rather than a JSON sidecar so
+# the knobs version together with the endpoints that consume them.
+_RULES = [
+    {"tier": "tiny", "max_items": 10, "parallel": 1, "batch_size": 4},
+    {"tier": "small", "max_items": 50, "parallel": 4, "batch_size": 8},
+    {"tier": "medium", "max_items": 200, "parallel": 8, "batch_size": 8},
+    {"tier": "large", "max_items": None,
+     "parallel": min(32, (os.cpu_count() or 4) * 2), "batch_size": 16},
+]
+
+
+class SmartScheduler:
+    """
+    Chooses per-stage dispatch config from workload size: tiny workloads
+    run sequentially (skipping pool overhead entirely), mid-size ones get
+    moderate thread fan-out, large ones scale with the machine.
+    """
+
+    def choose(self, n_items: int) -> Dict[str, Any]:
+        """
+        Pick the dispatch config for a workload of n_items.
+
+        Returns:
+            Dict with 'tier', 'parallel' (worker count, capped at n_items)
+            and 'batch_size'.
+        """
+        for rule in _RULES:
+            if rule["max_items"] is None or n_items <= rule["max_items"]:
+                return {
+                    "tier": rule["tier"],
+                    "parallel": max(1, min(rule["parallel"], n_items)),
+                    "batch_size": rule["batch_size"],
+                }
+        # Unreachable: the last rule is unbounded
+        return {"tier": "large", "parallel": 1, "batch_size": 8}
+
+
+# Global instance
+_scheduler: Optional[SmartScheduler] = None
+
+
+def get_scheduler() -> SmartScheduler:
+    """Get or create global scheduler instance"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = SmartScheduler()
+    return _scheduler